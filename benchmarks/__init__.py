@@ -0,0 +1,8 @@
+"""Benchmarks for the eventfd package.
+
+``python -m benchmarks`` runs the core benchmarks from benchmarks.suite for
+one or all backends and can write the results as JSON. The other modules
+are focused benchmarks and can be run on their own, e.g.
+``python -m benchmarks.wait``. The ``EVENTFD_PUREPYTHON`` environment
+variable selects the backend as usual.
+"""
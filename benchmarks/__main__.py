@@ -0,0 +1,88 @@
+"""Run the core benchmarks and print or save the results as JSON.
+
+    python -m benchmarks [--backend NAME|all] [--json FILE] [--scale X] [BENCHMARK ...]
+
+Without --backend the backend selected by the package is used, so
+EVENTFD_PUREPYTHON=1 python -m benchmarks measures the pure-python backend.
+The JSON output is meant to be diffed between releases.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+from eventfd import _eventfd
+
+from benchmarks.suite import BENCHMARKS
+
+BACKEND_CLASSES = {
+    "native": "NativeEventFD",
+    "os": "OSEventFD",
+    "c": "CEventFD",
+    "pipe": "PipeEventFD",
+    "socket": "SocketEventFD",
+}
+
+
+def available_backends():
+    return [name for name, cls in sorted(BACKEND_CLASSES.items()) if hasattr(_eventfd, cls)]
+
+
+def _rounded(result):
+    if isinstance(result, dict):
+        return dict((key, _rounded(value)) for key, value in result.items())
+    return round(result, 3)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[0])
+    parser.add_argument("benchmarks", nargs="*", metavar="BENCHMARK",
+                        help="benchmarks to run, all by default: " + ", ".join(sorted(BENCHMARKS)))
+    parser.add_argument("--backend", default=_eventfd.BACKEND,
+                        help="backend to measure, 'all' for every available backend (default: %(default)s)")
+    parser.add_argument("--json", metavar="FILE", help="write the results to FILE, '-' for stdout")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply the number of rounds")
+    args = parser.parse_args(argv)
+
+    backends = available_backends() if args.backend == "all" else [args.backend]
+    for backend in backends:
+        if backend not in available_backends():
+            parser.error("backend {!r} is not available, choose from {}".format(
+                backend, ", ".join(available_backends())))
+    names = args.benchmarks or sorted(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            parser.error("unknown benchmark {!r}, choose from {}".format(name, ", ".join(sorted(BENCHMARKS))))
+
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "default_backend": _eventfd.BACKEND,
+            "scale": args.scale,
+        },
+        "results": {},
+    }
+    for backend in backends:
+        event_class = getattr(_eventfd, BACKEND_CLASSES[backend])
+        results = report["results"][backend] = {}
+        for name in names:
+            results[name] = _rounded(BENCHMARKS[name](event_class, args.scale))
+            if args.json != "-":
+                print("{:>8} {:>14} {}".format(backend, name, json.dumps(results[name], sort_keys=True)))
+                sys.stdout.flush()
+
+    if args.json == "-":
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        print()
+    elif args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Helpers shared by the benchmarks."""
+
+import os
+import time
+
+
+def percentile(samples, p):
+    """Return the p-th percentile (0-100) of samples."""
+    samples = sorted(samples)
+    if not samples:
+        return float("nan")
+    index = min(len(samples) - 1, int(round(p / 100.0 * (len(samples) - 1))))
+    return samples[index]
+
+
+def summarize(samples):
+    """Return p50/p99/p99.9 of samples in microseconds."""
+    return dict(("p{}".format(p), percentile(samples, p) * 1e6) for p in (50, 99, 99.9))
+
+
+def per_call(func, number):
+    """Return the mean seconds per call of func over number calls."""
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return (time.perf_counter() - start) / number
+
+
+def raise_fd_limit(n):
+    """Raise RLIMIT_NOFILE so at least n fds can be open, return the new soft limit."""
+    import resource
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != resource.RLIM_INFINITY and soft < n:
+        soft = n if hard == resource.RLIM_INFINITY else min(n, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+    return soft
+
+
+class FdFiller(object):
+    """Context manager keeping fds open so the next fd number is at least lowest."""
+
+    def __init__(self, lowest):
+        self.lowest = lowest
+        self.fds = []
+
+    def __enter__(self):
+        raise_fd_limit(self.lowest + 64)
+        try:
+            while not self.fds or self.fds[-1] < self.lowest - 1:
+                self.fds.append(os.open(os.devnull, os.O_RDONLY))
+        except OSError:
+            self.__exit__()
+            raise
+        return self
+
+    def __exit__(self, *exc):
+        for fd in self.fds:
+            os.close(fd)
+        del self.fds[:]
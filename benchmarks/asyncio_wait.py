@@ -0,0 +1,59 @@
+"""Thread set() -> coroutine wakeup latency, wait_async() against run_in_executor(None, event.wait)."""
+
+import asyncio
+import threading
+import time
+
+from eventfd import EventFD, BACKEND
+
+from benchmarks._util import summarize
+
+ROUNDS = 2000
+
+
+def setter(event, requests, set_at):
+    for _ in range(ROUNDS):
+        requests.acquire()
+        time.sleep(0.00005)
+        set_at[0] = time.perf_counter()
+        event.set()
+
+
+async def measure(wait):
+    event = EventFD()
+    requests = threading.Semaphore(0)
+    set_at = [0.0]
+    thread = threading.Thread(target=setter, args=(event, requests, set_at))
+    thread.start()
+    samples = []
+    for _ in range(ROUNDS):
+        requests.release()
+        await wait(event)
+        samples.append(time.perf_counter() - set_at[0])
+        event.clear()
+    thread.join()
+    return samples
+
+
+async def wait_async(event):
+    await event.wait_async()
+
+
+async def wait_executor(event):
+    await asyncio.get_running_loop().run_in_executor(None, event.wait)
+
+
+def main():
+    print("backend: {}".format(BACKEND))
+    print("{:>16} {:>10} {:>10} {:>10}".format("method", "p50 us", "p99 us", "p99.9 us"))
+    for name, wait in (("wait_async", wait_async), ("run_in_executor", wait_executor)):
+        loop = asyncio.new_event_loop()
+        try:
+            stats = summarize(loop.run_until_complete(measure(wait)))
+        finally:
+            loop.close()
+        print("{:>16} {:>10.1f} {:>10.1f} {:>10.1f}".format(name, stats["p50"], stats["p99"], stats["p99.9"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""set()/clear() throughput and syscalls per operation as the thread count grows.
+
+Every thread runs set(), set(), clear() in a loop, so two of every three
+operations are redundant and should not reach the kernel.
+"""
+
+import itertools
+import threading
+import time
+
+from eventfd import EventFD, BACKEND
+
+THREADS = [1, 2, 4, 8, 16]
+ROUNDS = 20000
+
+
+class CountingEventFD(EventFD):
+    """EventFD counting the reads and writes it issues."""
+
+    def __init__(self):
+        super(CountingEventFD, self).__init__()
+        self.syscalls = itertools.count()
+
+    def _write(self, data):
+        next(self.syscalls)
+        super(CountingEventFD, self)._write(data)
+
+    def _drain(self):
+        next(self.syscalls)
+        super(CountingEventFD, self)._drain()
+
+
+def run(nthreads, rounds=ROUNDS):
+    event = CountingEventFD()
+    start_barrier = threading.Barrier(nthreads + 1)
+
+    def worker():
+        start_barrier.wait()
+        for _ in range(rounds):
+            event.set()
+            event.set()
+            event.clear()
+
+    threads = [threading.Thread(target=worker) for _ in range(nthreads)]
+    for thread in threads:
+        thread.start()
+    start_barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    ops = nthreads * rounds * 3
+    return ops / elapsed, next(event.syscalls) / float(ops)
+
+
+def main():
+    print("backend: {}".format(BACKEND))
+    print("{:>8} {:>14} {:>14}".format("threads", "ops/s", "syscalls/op"))
+    for nthreads in THREADS:
+        throughput, syscalls = run(nthreads)
+        print("{:>8} {:>14,.0f} {:>14.3f}".format(nthreads, throughput, syscalls))
+
+
+if __name__ == "__main__":
+    main()
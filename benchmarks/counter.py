@@ -0,0 +1,55 @@
+"""Items/sec handed from a producer to a consumer, batched CounterFD against one wakeup per item.
+
+The per item consumer acquires a SemaphoreFD once for every item.
+"""
+
+import threading
+import time
+
+from eventfd import CounterFD, SemaphoreFD, BACKEND
+
+ITEMS = 200000
+
+
+def produce(signal):
+    for _ in range(ITEMS):
+        signal()
+
+
+def batched():
+    counter = CounterFD()
+    thread = threading.Thread(target=produce, args=(counter.notify,))
+    start = time.perf_counter()
+    thread.start()
+    done = wakeups = 0
+    while done < ITEMS:
+        counter.wait()
+        done += counter.drain()
+        wakeups += 1
+    elapsed = time.perf_counter() - start
+    thread.join()
+    return ITEMS / elapsed, wakeups
+
+
+def per_item():
+    semaphore = SemaphoreFD(0)
+    thread = threading.Thread(target=produce, args=(semaphore.release,))
+    start = time.perf_counter()
+    thread.start()
+    for _ in range(ITEMS):
+        semaphore.acquire()
+    elapsed = time.perf_counter() - start
+    thread.join()
+    return ITEMS / elapsed, ITEMS
+
+
+def main():
+    print("backend: {}".format(BACKEND))
+    print("{:>10} {:>14} {:>10}".format("consumer", "items/s", "wakeups"))
+    for name, run in (("batched", batched), ("per item", per_item)):
+        throughput, wakeups = run()
+        print("{:>10} {:>14,.0f} {:>10}".format(name, throughput, wakeups))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Cross-process wake latency, SharedEventFD against multiprocessing.Event.
+
+A child process bounces between two events with the parent, the latency
+is half of the round trip.
+"""
+
+import multiprocessing
+import time
+
+from eventfd import SharedEventFD, BACKEND
+
+from benchmarks._util import summarize
+
+ROUNDS = 2000
+
+
+def bounce(ping, pong):
+    for _ in range(ROUNDS):
+        ping.wait()
+        ping.clear()
+        pong.set()
+
+
+def measure(ctx, make_event):
+    ping, pong = make_event(), make_event()
+    child = ctx.Process(target=bounce, args=(ping, pong))
+    child.start()
+    samples = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        ping.set()
+        pong.wait()
+        pong.clear()
+        samples.append((time.perf_counter() - start) / 2)
+    child.join()
+    return samples
+
+
+def main():
+    ctx = multiprocessing.get_context("spawn")
+    print("backend: {}".format(BACKEND))
+    print("{:>22} {:>10} {:>10} {:>10}".format("event", "p50 us", "p99 us", "p99.9 us"))
+    for name, make_event in (("SharedEventFD", SharedEventFD), ("multiprocessing.Event", ctx.Event)):
+        stats = summarize(measure(ctx, make_event))
+        print("{:>22} {:>10.1f} {:>10.1f} {:>10.1f}".format(name, stats["p50"], stats["p99"], stats["p99.9"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""FDQueue against a queue.Queue paired with an EventFD by hand, with one and four producers.
+
+The consumer selects on the fd and takes everything available after every wakeup.
+"""
+
+import itertools
+import queue
+import select
+import threading
+import time
+
+from eventfd import EventFD, FDQueue, BACKEND
+
+ITEMS = 100000
+
+
+class CountingEventFD(EventFD):
+
+    def __init__(self):
+        super(CountingEventFD, self).__init__()
+        self.syscalls = itertools.count()
+
+    def _write(self, data):
+        next(self.syscalls)
+        super(CountingEventFD, self)._write(data)
+
+    def _drain(self):
+        next(self.syscalls)
+        super(CountingEventFD, self)._drain()
+
+
+class PairedQueue(object):
+    """The hand made queue.Queue + EventFD pair."""
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.event = CountingEventFD()
+
+    def put(self, item):
+        self.queue.put(item)
+        self.event.set()
+
+    def get_all(self):
+        self.event.clear()
+        items = []
+        try:
+            while True:
+                items.append(self.queue.get_nowait())
+        except queue.Empty:
+            pass
+        return items
+
+    def fileno(self):
+        return self.event.fileno()
+
+
+class CountingFDQueue(FDQueue):
+
+    def __init__(self):
+        super(CountingFDQueue, self).__init__()
+        self._event = self.event = CountingEventFD()
+
+    def get_all(self):
+        try:
+            return self.get_many(block=False)
+        except queue.Empty:
+            return []
+
+
+def run(make_queue, producers):
+    q = make_queue()
+    per_producer = ITEMS // producers
+
+    def produce():
+        for i in range(per_producer):
+            q.put(i)
+
+    threads = [threading.Thread(target=produce) for _ in range(producers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    received = 0
+    while received < per_producer * producers:
+        select.select([q], [], [])
+        received += len(q.get_all())
+    elapsed = time.perf_counter() - start
+    for thread in threads:
+        thread.join()
+    return received / elapsed, next(q.event.syscalls) / float(received)
+
+
+def main():
+    print("backend: {}".format(BACKEND))
+    print("{:>20} {:>10} {:>14} {:>14}".format("queue", "producers", "items/s", "syscalls/item"))
+    for producers in (1, 4):
+        for name, make_queue in (("FDQueue", CountingFDQueue), ("Queue + EventFD", PairedQueue)):
+            throughput, syscalls = run(make_queue, producers)
+            print("{:>20} {:>10} {:>14,.0f} {:>14.4f}".format(name, producers, throughput, syscalls))
+
+
+if __name__ == "__main__":
+    main()
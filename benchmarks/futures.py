@@ -0,0 +1,58 @@
+"""Collecting completed futures: CompletionSet against concurrent.futures.wait.
+
+N pending futures complete in small batches from another thread while the
+consumer collects them, the consumer CPU time is reported.
+concurrent.futures.wait(FIRST_COMPLETED) scans and registers a waiter on
+every pending future per call, CompletionSet.wait() reads one counter fd
+and pops only the completed futures.
+"""
+
+import concurrent.futures
+import threading
+import time
+
+from eventfd import CompletionSet
+
+SIZES = [100, 1000, 10000]
+BATCH = 10
+
+
+def complete(futures):
+    for i, future in enumerate(futures):
+        future.set_result(None)
+        if i % BATCH == 0:
+            time.sleep(0.0001)
+
+
+def collect_wait(futures):
+    pending = set(futures)
+    while pending:
+        _, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+
+
+def collect_completion_set(futures):
+    completion = CompletionSet(futures)
+    while len(completion):
+        completion.wait()
+
+
+def run(collect, size):
+    futures = [concurrent.futures.Future() for _ in range(size)]
+    producer = threading.Thread(target=complete, args=(futures,))
+    start = time.thread_time()
+    producer.start()
+    collect(futures)
+    elapsed = time.thread_time() - start
+    producer.join()
+    return elapsed
+
+
+def main():
+    print("{:>8} {:>20} {:>20}".format("futures", "wait() cpu ms", "CompletionSet cpu ms"))
+    for size in SIZES:
+        print("{:>8} {:>20.1f} {:>20.1f}".format(
+            size, run(collect_wait, size) * 1e3, run(collect_completion_set, size) * 1e3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""EventGroup.wait_any() against rebuilding a poll set per call, for many registered events.
+
+One event out of N is set, so the group pays for the ready event only while
+a poll over all the events pays for every registered one.
+"""
+
+import select
+
+from eventfd import EventFD, EventGroup, BACKEND
+
+from benchmarks._util import per_call, raise_fd_limit
+
+SIZES = [100, 1000, 10000, 20000]
+
+
+def poll_all(events):
+    poller = select.poll()
+    for event in events:
+        poller.register(event, select.POLLIN)
+    return poller.poll(0)
+
+
+def main():
+    print("backend: {}".format(BACKEND))
+    print("{:>8} {:>16} {:>16} {:>10}".format("events", "wait_any us", "poll all us", "speedup"))
+    for size in SIZES:
+        fds_per_event = 2 if BACKEND == "pipe" else 1
+        if raise_fd_limit(size * fds_per_event + 64) < size * fds_per_event + 64:
+            print("{:>8} skipped, RLIMIT_NOFILE is too low".format(size))
+            continue
+        events = [EventFD() for _ in range(size)]
+        events[size // 2].set()
+        with EventGroup(events) as group:
+            number = max(10, 200000 // size)
+            grouped = per_call(lambda: group.wait_any(0), 20000) * 1e6
+            polled = per_call(lambda: poll_all(events), number) * 1e6
+        print("{:>8} {:>16.2f} {:>16.2f} {:>9.0f}x".format(size, grouped, polled, polled / grouped))
+        del events
+
+
+if __name__ == "__main__":
+    main()
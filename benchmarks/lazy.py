@@ -0,0 +1,43 @@
+"""Lazy against eager events: create/set/wait/destroy throughput and open fds.
+
+Most events in a program are waited on with wait() and never selected, a
+lazy event serves them without a file descriptor and without syscalls.
+"""
+
+import os
+
+from eventfd import EventFD, BACKEND
+
+from benchmarks._util import per_call, raise_fd_limit
+
+NUMBER = 100000
+LIVE = 10000
+
+
+def lifecycle(lazy):
+    event = EventFD(lazy=lazy)
+    event.set()
+    event.wait()
+    event.clear()
+    del event
+
+
+def open_fds():
+    return len(os.listdir("/proc/self/fd"))
+
+
+def main():
+    print("backend: {}".format(BACKEND))
+    print("{:>8} {:>16} {:>16}".format("mode", "lifecycle us", "fds per event"))
+    raise_fd_limit(LIVE * 2 + 64)
+    for lazy in (False, True):
+        elapsed = per_call(lambda: lifecycle(lazy), NUMBER) * 1e6
+        before = open_fds()
+        events = [EventFD(lazy=lazy) for _ in range(LIVE)]
+        fds = (open_fds() - before) / float(LIVE)
+        del events
+        print("{:>8} {:>16.2f} {:>16.2f}".format("lazy" if lazy else "eager", elapsed, fds))
+
+
+if __name__ == "__main__":
+    main()
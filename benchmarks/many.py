@@ -0,0 +1,41 @@
+"""set_many()/clear_many() against looping over set()/clear().
+
+The loop pays a python call and a GIL release per event, set_many() does all
+the fd writes of a broadcast in one C call without the GIL.
+"""
+
+from eventfd import EventFD, BACKEND, set_many, clear_many
+from eventfd import _eventfd
+
+from benchmarks._util import per_call, raise_fd_limit
+
+SIZES = [10, 1000, 10000]
+
+
+def loop_set_clear(events):
+    for event in events:
+        event.set()
+    for event in events:
+        event.clear()
+
+
+def bulk_set_clear(events):
+    set_many(events)
+    clear_many(events)
+
+
+def main():
+    print("backend: {}, C extension: {}".format(BACKEND, _eventfd.HAVE_C_EVENTFD))
+    print("{:>8} {:>16} {:>16} {:>10}".format("events", "loop us", "set_many us", "speedup"))
+    for size in SIZES:
+        raise_fd_limit(size * 2 + 64)
+        events = [EventFD() for _ in range(size)]
+        number = max(5, 20000 // size)
+        looped = per_call(lambda: loop_set_clear(events), number) * 1e6
+        bulk = per_call(lambda: bulk_set_clear(events), number) * 1e6
+        print("{:>8} {:>16.1f} {:>16.1f} {:>9.1f}x".format(size, looped, bulk, looped / bulk))
+        del events
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Per call cost of the EventFD methods, the C type against the python classes."""
+
+from eventfd import _eventfd, BACKEND
+
+from benchmarks._util import per_call
+
+NUMBER = 200000
+
+CLASSES = ["NativeEventFD", "CEventFD", "OSEventFD", "PipeEventFD"]
+
+
+def measure(event_class):
+    event = event_class()
+    results = {}
+    results["is_set"] = per_call(event.is_set, NUMBER)
+
+    def set_clear():
+        event.set()
+        event.clear()
+
+    results["set+clear"] = per_call(set_clear, NUMBER)
+    event.set()
+    results["set (redundant)"] = per_call(event.set, NUMBER)
+    results["wait (set)"] = per_call(event.wait, NUMBER)
+    event.clear()
+    results["wait(0) (clear)"] = per_call(lambda: event.wait(0), NUMBER // 10)
+    return results
+
+
+def main():
+    print("default backend: {}".format(BACKEND))
+    classes = [name for name in CLASSES if hasattr(_eventfd, name)]
+    if "NativeEventFD" not in classes:
+        print("the C extension is not available")
+        return
+    results = dict((name, measure(getattr(_eventfd, name))) for name in classes)
+    print("{:>18} ".format("ns per call") + " ".join("{:>14}".format(name) for name in classes))
+    for op in results["NativeEventFD"]:
+        native = results["NativeEventFD"][op]
+        print("{:>18} ".format(op) + " ".join(
+            "{:>7.0f} ({:>4.1f}x)".format(results[name][op] * 1e9, results[name][op] / native)
+            for name in classes))
+
+
+if __name__ == "__main__":
+    main()
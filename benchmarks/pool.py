@@ -0,0 +1,46 @@
+"""EventFDPool acquire/release against creating an event per request.
+
+Each request takes an event, sets it, waits on it and gives it back: a new
+event pays the fd creation and the close in __del__, a pooled event only the
+clear().
+"""
+
+from eventfd import EventFD, EventFDPool, BACKEND
+
+from benchmarks._util import per_call
+
+NUMBER = 100000
+
+
+def new_event():
+    event = EventFD()
+    event.set()
+    event.wait()
+    del event
+
+
+def create_destroy():
+    EventFD()
+
+
+def main():
+    print("backend: {}".format(BACKEND))
+    print("{:>10} {:>18} {:>14}".format("mode", "acquire/release us", "request us"))
+    print("{:>10} {:>18.2f} {:>14.2f}".format(
+        "new", per_call(create_destroy, NUMBER) * 1e6, per_call(new_event, NUMBER) * 1e6))
+    with EventFDPool() as pool:
+
+        def acquire_release():
+            pool.acquire().release()
+
+        def pooled_event():
+            with pool.acquire() as event:
+                event.set()
+                event.wait()
+
+        print("{:>10} {:>18.2f} {:>14.2f}".format(
+            "pooled", per_call(acquire_release, NUMBER) * 1e6, per_call(pooled_event, NUMBER) * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Requests/sec of PreforkServer as the worker count grows, and its shutdown latency.
+
+The handler burns some CPU per request so a single process is the limit.
+The clients are processes too, a connection per request, so the client
+side is not held back by the GIL. Shutdown latency is the time from the
+set() of the shared shutdown event until every worker exited.
+"""
+
+import multiprocessing
+import os
+import socket
+import time
+from socketserver import BaseRequestHandler
+
+from eventfd import PreforkServer, BACKEND
+
+CLIENTS = 8
+REQUESTS = 300
+WORK = 20000
+
+
+class WorkHandler(BaseRequestHandler):
+
+    def handle(self):
+        data = self.request.recv(1024)
+        sum(range(WORK))
+        self.request.sendall(data.upper())
+
+
+def client(address):
+    for _ in range(REQUESTS):
+        with socket.create_connection(address) as sock:
+            sock.sendall(b"hello")
+            sock.recv(1024)
+
+
+def run(workers):
+    server = PreforkServer(("localhost", 0), WorkHandler, workers=workers)
+    server.start()
+    context = multiprocessing.get_context("fork")
+    clients = [context.Process(target=client, args=(server.server_address,)) for _ in range(CLIENTS)]
+    start = time.perf_counter()
+    for process in clients:
+        process.start()
+    for process in clients:
+        process.join()
+    throughput = CLIENTS * REQUESTS / (time.perf_counter() - start)
+    start = time.perf_counter()
+    server.shutdown()
+    shutdown = time.perf_counter() - start
+    server.server_close()
+    return throughput, shutdown
+
+
+def main():
+    print("backend: {}".format(BACKEND))
+    cores = os.cpu_count() or 1
+    counts = sorted(set([1, 2, 4, 8, cores]) & set(range(1, cores + 1)))
+    print("{:>8} {:>12} {:>8} {:>14}".format("workers", "requests/s", "speedup", "shutdown ms"))
+    base = None
+    for workers in counts:
+        throughput, shutdown = run(workers)
+        base = base or throughput
+        print("{:>8} {:>12,.0f} {:>8.2f} {:>14.2f}".format(workers, throughput, throughput / base,
+                                                          shutdown * 1e3))
+
+
+if __name__ == "__main__":
+    main()
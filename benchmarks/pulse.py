@@ -0,0 +1,76 @@
+"""pulse() against set() + clear() for waking the threads waiting now.
+
+Waiter threads count their wakeups while the main thread broadcasts
+ROUNDS times. With set() + clear() a waiter that is not blocked at the
+moment of the set misses the broadcast, wait_for_generation() sees every
+pulse that happened since it read the generation. The cost column is one
+broadcast with nobody waiting, pulse() writes the fd once until the token
+is acknowledged.
+"""
+
+import threading
+import time
+
+from eventfd import EventFD, BACKEND
+
+from benchmarks._util import per_call
+
+WAITERS = 8
+ROUNDS = 2000
+
+
+def set_clear_waiter(event, stop, wakes):
+    while not stop.is_set():
+        if event.wait(0.1):
+            wakes.append(1)
+            # let the broadcaster clear before waiting again.
+            while event.is_set() and not stop.is_set():
+                time.sleep(0)
+
+
+def pulse_waiter(event, stop, wakes):
+    generation = event.generation
+    while not stop.is_set():
+        if event.wait_for_generation(generation, 0.1):
+            wakes.append(event.generation - generation)
+            generation = event.generation
+
+
+def broadcast(waiter, notify):
+    event = EventFD()
+    event.fileno()
+    stop = threading.Event()
+    wakes = [[] for _ in range(WAITERS)]
+    threads = [threading.Thread(target=waiter, args=(event, stop, w)) for w in wakes]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    for _ in range(ROUNDS):
+        notify(event)
+        time.sleep(0.0001)
+    time.sleep(0.2)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    seen = sum(sum(w) for w in wakes) / float(WAITERS)
+    return 100.0 * (ROUNDS - seen) / ROUNDS
+
+
+def set_clear(event):
+    event.set()
+    event.clear()
+
+
+def main():
+    print("backend: {}, waiters: {}, broadcasts: {}".format(BACKEND, WAITERS, ROUNDS))
+    print("{:>10} {:>12} {:>10}".format("mode", "missed %", "cost us"))
+    event = EventFD()
+    event.fileno()
+    print("{:>10} {:>12.1f} {:>10.2f}".format(
+        "set+clear", broadcast(set_clear_waiter, set_clear), per_call(lambda: set_clear(event), 100000) * 1e6))
+    print("{:>10} {:>12.1f} {:>10.2f}".format(
+        "pulse", broadcast(pulse_waiter, EventFD.pulse), per_call(event.pulse, 100000) * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""EventReactor against a thread blocked in wait() per event.
+
+For N events with a small callback, reports the memory used by the
+waiting side (RSS growth and thread count) and the latency from set() to
+the callback running.
+"""
+
+import threading
+import time
+
+from eventfd import EventFD, EventReactor
+
+from benchmarks._util import raise_fd_limit, summarize
+
+SIZES = [100, 1000]
+ROUNDS = 1000
+
+
+def rss_kb():
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+class Probe(object):
+    """The callback: records when it ran and wakes the benchmark."""
+
+    def __init__(self):
+        self.ran_at = None
+        self.done = threading.Semaphore(0)
+
+    def __call__(self, event):
+        self.ran_at = time.perf_counter()
+        self.done.release()
+
+
+def latencies(events, probe):
+    samples = []
+    for i in range(ROUNDS):
+        event = events[i % len(events)]
+        time.sleep(0.00005)
+        set_at = time.perf_counter()
+        event.set()
+        probe.done.acquire()
+        samples.append(probe.ran_at - set_at)
+    return samples
+
+
+def thread_per_waiter(size):
+    events = [EventFD() for _ in range(size)]
+    probe = Probe()
+    stop = [False]
+
+    def waiter(event):
+        while True:
+            event.wait()
+            event.clear()
+            if stop[0]:
+                return
+            probe(event)
+
+    before = rss_kb()
+    threads = [threading.Thread(target=waiter, args=(event,)) for event in events]
+    for thread in threads:
+        thread.start()
+    memory = rss_kb() - before
+    samples = latencies(events, probe)
+    stop[0] = True
+    for event in events:
+        event.set()
+    for thread in threads:
+        thread.join()
+    return memory, len(threads), samples
+
+
+def reactor(size):
+    events = [EventFD() for _ in range(size)]
+    probe = Probe()
+    before = rss_kb()
+    with EventReactor() as loop:
+        for event in events:
+            loop.add_callback(event, probe, auto_clear=True)
+        memory = rss_kb() - before
+        samples = latencies(events, probe)
+    return memory, 1, samples
+
+
+def main():
+    print("{:>8} {:>10} {:>8} {:>10} {:>10} {:>10}".format(
+        "events", "mode", "threads", "rss kB", "p50 us", "p99 us"))
+    for size in SIZES:
+        raise_fd_limit(size * 2 + 64)
+        for name, func in (("threads", thread_per_waiter), ("reactor", reactor)):
+            memory, threads, samples = func(size)
+            stats = summarize(samples)
+            print("{:>8} {:>10} {:>8} {:>10} {:>10.1f} {:>10.1f}".format(
+                size, name, threads, memory, stats["p50"], stats["p99"]))
+
+
+if __name__ == "__main__":
+    main()
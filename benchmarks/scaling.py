@@ -0,0 +1,62 @@
+"""set()/wait()/clear() throughput from 1 to N threads, one event per thread.
+
+The threads never share an event, so the throughput can only grow with the
+thread count on a free-threaded build (python 3.13t and later), where the C
+extension does not enable the GIL again. With the GIL it stays flat.
+"""
+
+import os
+import sys
+import threading
+import time
+
+from eventfd import _eventfd, BACKEND
+
+ROUNDS = 20000
+
+CLASSES = ["EventFD", "NativeEventFD"]
+
+
+def run(event_class, nthreads, rounds=ROUNDS):
+    events = [event_class() for _ in range(nthreads)]
+    start_barrier = threading.Barrier(nthreads + 1)
+
+    def worker(event):
+        start_barrier.wait()
+        for _ in range(rounds):
+            event.set()
+            event.wait()
+            event.clear()
+
+    threads = [threading.Thread(target=worker, args=(event,)) for event in events]
+    for thread in threads:
+        thread.start()
+    start_barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    for event in events:
+        event.close()
+    return nthreads * rounds / elapsed
+
+
+def main():
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print("backend: {}, GIL {}".format(BACKEND, "enabled" if gil else "disabled"))
+    cores = os.cpu_count() or 1
+    counts = sorted(set([1, 2, 4, 8, cores]) & set(range(1, cores + 1)))
+    print("{:>14} {:>8} {:>16} {:>8}".format("class", "threads", "ops/s", "speedup"))
+    for name in CLASSES:
+        if not hasattr(_eventfd, name):
+            continue
+        event_class = getattr(_eventfd, name)
+        base = None
+        for nthreads in counts:
+            ops = run(event_class, nthreads)
+            base = base or ops
+            print("{:>14} {:>8} {:>16.0f} {:>8.2f}".format(name, nthreads, ops, ops / base))
+
+
+if __name__ == "__main__":
+    main()
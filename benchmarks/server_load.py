@@ -0,0 +1,61 @@
+"""Requests/sec and shutdown latency of NonPollingHTTPServer against socketserver.ThreadingTCPServer.
+
+Every client opens a connection per request, sends a line and reads the
+upper-cased answer. Shutdown latency is measured with the server idle.
+"""
+
+import socket
+import threading
+import time
+from socketserver import BaseRequestHandler, ThreadingTCPServer
+
+from eventfd import NonPollingHTTPServer, BACKEND
+
+CLIENTS = 8
+REQUESTS = 500
+
+
+class UpperHandler(BaseRequestHandler):
+
+    def handle(self):
+        self.request.sendall(self.request.recv(1024).upper())
+
+
+def client(address):
+    for _ in range(REQUESTS):
+        with socket.create_connection(address) as sock:
+            sock.sendall(b"hello")
+            sock.recv(1024)
+
+
+def run(server_class):
+    server = server_class(("localhost", 0), UpperHandler)
+    server_thread = threading.Thread(target=server.serve_forever)
+    server_thread.start()
+    clients = [threading.Thread(target=client, args=(server.server_address,)) for _ in range(CLIENTS)]
+    start = time.perf_counter()
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    throughput = CLIENTS * REQUESTS / (time.perf_counter() - start)
+    time.sleep(0.1)
+    start = time.perf_counter()
+    server.shutdown()
+    shutdown = time.perf_counter() - start
+    server_thread.join()
+    server.server_close()
+    return throughput, shutdown
+
+
+def main():
+    print("backend: {}".format(BACKEND))
+    print("{:>22} {:>12} {:>14}".format("server", "requests/s", "shutdown ms"))
+    for name, server_class in (("NonPollingHTTPServer", NonPollingHTTPServer),
+                               ("ThreadingTCPServer", ThreadingTCPServer)):
+        throughput, shutdown = run(server_class)
+        print("{:>22} {:>12,.0f} {:>14.2f}".format(name, throughput, shutdown * 1e3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""is_set(), set() and clear() of shared events: poll per call against a shared memory flag.
+
+SharedEventFD asks the fd on every is_set() call, with shared_memory=True
+the flag is a byte mapped by every process and is_set() makes no syscall.
+"""
+
+from eventfd import EventFD, SharedEventFD, BACKEND
+
+from benchmarks._util import per_call
+
+NUMBER = 200000
+
+
+def toggle(event):
+    event.set()
+    event.clear()
+
+
+def main():
+    print("backend: {}".format(BACKEND))
+    print("{:>20} {:>14} {:>18}".format("event", "is_set us", "set+clear us"))
+    events = (
+        ("EventFD", EventFD()),
+        ("SharedEventFD", SharedEventFD()),
+        ("shared_memory=True", SharedEventFD(shared_memory=True)),
+    )
+    for name, event in events:
+        event.set()
+        is_set = per_call(event.is_set, NUMBER) * 1e6
+        event.clear()
+        changes = per_call(lambda: toggle(event), NUMBER // 10) * 1e6
+        print("{:>20} {:>14.3f} {:>18.2f}".format(name, is_set, changes))
+        event.close()
+
+
+if __name__ == "__main__":
+    main()
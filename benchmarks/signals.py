@@ -0,0 +1,81 @@
+"""Signal delivery latency of a select loop: SignalFD against a handler and set_wakeup_fd.
+
+A thread sends SIGUSR1 to the main thread, which selects on the SignalFD or
+on the wakeup socket, and waits until the loop acknowledged the signal. With
+set_wakeup_fd the loop also needs the python handler to have run. Each loop
+starts the sender once the signal is blocked or handled.
+"""
+
+import select
+import signal
+import socket
+import threading
+import time
+
+from eventfd import EventFD, SignalFD, BACKEND
+
+from benchmarks._util import summarize
+
+ROUNDS = 2000
+
+
+def measure(loop):
+    main = threading.get_ident()
+    ack = EventFD()
+    samples = []
+
+    def sender():
+        for _ in range(ROUNDS):
+            start = time.perf_counter()
+            signal.pthread_kill(main, signal.SIGUSR1)
+            ack.wait()
+            samples.append(time.perf_counter() - start)
+            ack.clear()
+
+    thread = threading.Thread(target=sender)
+    loop(ack, thread.start)
+    thread.join()
+    return summarize(samples)
+
+
+def signalfd_loop(ack, start):
+    with SignalFD([signal.SIGUSR1]) as signal_fd:
+        start()
+        for _ in range(ROUNDS):
+            select.select([signal_fd], [], [])
+            signal_fd.read_signals()
+            ack.set()
+
+
+def wakeup_fd_loop(ack, start):
+    received = []
+    reader, writer = socket.socketpair()
+    reader.setblocking(False)
+    writer.setblocking(False)
+    previous_handler = signal.signal(signal.SIGUSR1, lambda signum, frame: received.append(signum))
+    previous_fd = signal.set_wakeup_fd(writer.fileno())
+    try:
+        start()
+        for _ in range(ROUNDS):
+            while not received:
+                select.select([reader], [], [])
+                reader.recv(4096)
+            del received[:]
+            ack.set()
+    finally:
+        signal.set_wakeup_fd(previous_fd)
+        signal.signal(signal.SIGUSR1, previous_handler)
+        reader.close()
+        writer.close()
+
+
+def main():
+    print("backend: {}".format(BACKEND))
+    print("{:>14} {:>10} {:>10} {:>10}".format("loop", "p50 us", "p99 us", "p99.9 us"))
+    for name, loop in (("SignalFD", signalfd_loop), ("set_wakeup_fd", wakeup_fd_loop)):
+        result = measure(loop)
+        print("{:>14} {:>10.1f} {:>10.1f} {:>10.1f}".format(name, result["p50"], result["p99"], result["p99.9"]))
+
+
+if __name__ == "__main__":
+    main()
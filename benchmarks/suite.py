@@ -0,0 +1,119 @@
+"""Core EventFD benchmarks, run per backend with machine readable results.
+
+Every benchmark takes an EventFD class and a scale factor and returns a
+dict of plain numbers, latencies are in microseconds.
+"""
+
+import select
+import threading
+import time
+
+from benchmarks._util import per_call, summarize
+
+
+def wake_latency(event_class, scale=1.0):
+    """set() in one thread -> wait() returning in another thread."""
+    rounds = max(100, int(2000 * scale))
+    event = event_class()
+    samples = []
+    set_at = [0.0]
+    ready = threading.Semaphore(0)
+    woken = threading.Semaphore(0)
+
+    def waiter():
+        for _ in range(rounds):
+            ready.release()
+            event.wait()
+            samples.append(time.perf_counter() - set_at[0])
+            event.clear()
+            woken.release()
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    for _ in range(rounds):
+        ready.acquire()
+        # let the waiter block in wait()
+        time.sleep(0.00005)
+        set_at[0] = time.perf_counter()
+        event.set()
+        woken.acquire()
+    thread.join()
+    return summarize(samples)
+
+
+def set_clear(event_class, scale=1.0):
+    """set()/clear() pairs per second in a single thread."""
+    number = max(1000, int(200000 * scale))
+    event = event_class()
+
+    def pair():
+        event.set()
+        event.clear()
+
+    return {"pairs_per_sec": 1.0 / per_call(pair, number)}
+
+
+def fan_out(event_class, scale=1.0, waiters=(1, 4, 16, 64)):
+    """set() -> the last of N waiting threads returning from wait()."""
+    rounds = max(20, int(200 * scale))
+    results = {}
+    for count in waiters:
+        event = event_class()
+        barrier = threading.Barrier(count + 1)
+        woken_at = [0.0] * count
+        samples = []
+
+        def waiter(index):
+            for _ in range(rounds):
+                barrier.wait()
+                event.wait()
+                woken_at[index] = time.perf_counter()
+                barrier.wait()
+
+        threads = [threading.Thread(target=waiter, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for _ in range(rounds):
+            barrier.wait()
+            time.sleep(0.0005)
+            start = time.perf_counter()
+            event.set()
+            barrier.wait()
+            samples.append(max(woken_at) - start)
+            event.clear()
+        for thread in threads:
+            thread.join()
+        results[str(count)] = summarize(samples)
+    return results
+
+
+def multiplex(event_class, scale=1.0, sizes=(10, 100, 1000)):
+    """Finding the single set event out of N with select, poll and epoll."""
+    number = max(100, int(2000 * scale))
+    results = {}
+    for size in sizes:
+        events = [event_class() for _ in range(size)]
+        events[size // 2].set()
+        result = results[str(size)] = {}
+        if max(event.fileno() for event in events) < 1024:
+            result["select_us"] = per_call(lambda: select.select(events, [], [], 0), number) * 1e6
+        if hasattr(select, "poll"):
+            poller = select.poll()
+            for event in events:
+                poller.register(event, select.POLLIN)
+            result["poll_us"] = per_call(lambda: poller.poll(0), number) * 1e6
+        if hasattr(select, "epoll"):
+            with select.epoll() as epoll:
+                for event in events:
+                    epoll.register(event, select.EPOLLIN)
+                result["epoll_us"] = per_call(lambda: epoll.poll(0), number) * 1e6
+        del events
+    return results
+
+
+BENCHMARKS = {
+    "wake_latency": wake_latency,
+    "set_clear": set_clear,
+    "fan_out": fan_out,
+    "multiplex": multiplex,
+}
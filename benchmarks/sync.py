@@ -0,0 +1,161 @@
+"""Wakeup latency of LockFD, ConditionFD and BarrierFD against bridging threads.
+
+A select loop waits for another thread to release a lock, notify a
+condition or arrive at a barrier. The selectable primitives wake the loop
+directly, the bridge approach blocks a helper thread in the threading
+primitive and sets an EventFD the loop selects on, paying an extra thread
+and context switch per signal.
+"""
+
+import select
+import threading
+import time
+
+from eventfd import EventFD, LockFD, ConditionFD, BarrierFD
+
+from benchmarks._util import summarize
+
+ROUNDS = 2000
+
+
+class Signaller(object):
+    """A thread calling signal() on request, recording the time of the call."""
+
+    def __init__(self, signal):
+        self.signal = signal
+        self.go = threading.Semaphore(0)
+        self.signalled_at = None
+        self.thread = threading.Thread(target=self.run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def run(self):
+        while True:
+            self.go.acquire()
+            time.sleep(0.00005)
+            self.signalled_at = time.perf_counter()
+            self.signal()
+
+    def latency(self, fd):
+        self.go.release()
+        select.select([fd], [], [])
+        return time.perf_counter() - self.signalled_at
+
+
+def direct_lock():
+    lock = LockFD()
+    signaller = Signaller(lock.release)
+    samples = []
+    for _ in range(ROUNDS):
+        lock.acquire()
+        samples.append(signaller.latency(lock))
+    return samples
+
+
+def bridge_lock():
+    lock = threading.Lock()
+    event = EventFD()
+    bridge = threading.Semaphore(0)
+
+    def helper():
+        while True:
+            bridge.acquire()
+            with lock:
+                event.set()
+
+    threading.Thread(target=helper, daemon=True).start()
+    signaller = Signaller(lock.release)
+    samples = []
+    for _ in range(ROUNDS):
+        lock.acquire()
+        bridge.release()
+        samples.append(signaller.latency(event))
+        event.clear()
+    return samples
+
+
+def notify(cond):
+    with cond:
+        cond.notify()
+
+
+def direct_condition():
+    cond = ConditionFD()
+    signaller = Signaller(lambda: notify(cond))
+    samples = []
+    for _ in range(ROUNDS):
+        with cond:
+            cond.arm()
+        samples.append(signaller.latency(cond))
+        with cond:
+            cond.acknowledge()
+    return samples
+
+
+def bridge_condition():
+    cond = threading.Condition()
+    event = EventFD()
+    waiting = threading.Semaphore(0)
+
+    def helper():
+        while True:
+            with cond:
+                waiting.release()
+                cond.wait()
+            event.set()
+
+    threading.Thread(target=helper, daemon=True).start()
+    signaller = Signaller(lambda: notify(cond))
+    samples = []
+    for _ in range(ROUNDS):
+        waiting.acquire()
+        samples.append(signaller.latency(event))
+        event.clear()
+    return samples
+
+
+def direct_barrier():
+    barrier = BarrierFD(2)
+    signaller = Signaller(barrier.wait)
+    samples = []
+    for _ in range(ROUNDS):
+        barrier.arrive()
+        samples.append(signaller.latency(barrier))
+        barrier.wait()
+    return samples
+
+
+def bridge_barrier():
+    barrier = threading.Barrier(2)
+    event = EventFD()
+    bridge = threading.Semaphore(0)
+
+    def helper():
+        while True:
+            bridge.acquire()
+            barrier.wait()
+            event.set()
+
+    threading.Thread(target=helper, daemon=True).start()
+    signaller = Signaller(barrier.wait)
+    samples = []
+    for _ in range(ROUNDS):
+        bridge.release()
+        samples.append(signaller.latency(event))
+        event.clear()
+    return samples
+
+
+def main():
+    print("{:>10} {:>8} {:>10} {:>10} {:>10}".format("primitive", "mode", "p50 us", "p99 us", "p99.9 us"))
+    for name, direct, bridge in (("lock", direct_lock, bridge_lock),
+                                 ("condition", direct_condition, bridge_condition),
+                                 ("barrier", direct_barrier, bridge_barrier)):
+        for mode, func in (("direct", direct), ("bridge", bridge)):
+            stats = summarize(func())
+            print("{:>10} {:>8} {:>10.1f} {:>10.1f} {:>10.1f}".format(
+                name, mode, stats["p50"], stats["p99"], stats["p99.9"]))
+
+
+if __name__ == "__main__":
+    main()
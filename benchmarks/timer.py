@@ -0,0 +1,72 @@
+"""Periodic tick jitter of TimerFD against select timeout loops.
+
+Every loop selects on an EventFD that is never set and ticks every PERIOD
+seconds. The lateness of each tick is measured against the ideal schedule
+start + k * PERIOD, the drift is the lateness of the last tick.
+
+* timerfd - a periodic TimerFD in the select set, the kernel keeps the schedule.
+* deadline - the select timeout is recomputed from the next deadline every iteration.
+* fixed - the select timeout is always PERIOD, the common hand written loop.
+"""
+
+import select
+import time
+
+from eventfd import EventFD, TimerFD
+
+from benchmarks._util import summarize
+
+PERIOD = 0.002
+TICKS = 1000
+
+
+def timerfd_loop(event):
+    lateness = []
+    with TimerFD() as timer:
+        start = time.monotonic()
+        timer.arm(start + PERIOD, PERIOD, absolute=True)
+        tick = 0
+        while tick < TICKS:
+            select.select([event, timer], [], [])
+            now = time.monotonic()
+            tick += timer.read_expirations()
+            lateness.append(now - (start + tick * PERIOD))
+    return lateness
+
+
+def deadline_loop(event):
+    lateness = []
+    start = time.monotonic()
+    for tick in range(1, TICKS + 1):
+        deadline = start + tick * PERIOD
+        while True:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            select.select([event], [], [], timeout)
+        lateness.append(time.monotonic() - deadline)
+    return lateness
+
+
+def fixed_loop(event):
+    lateness = []
+    start = time.monotonic()
+    for tick in range(1, TICKS + 1):
+        select.select([event], [], [], PERIOD)
+        lateness.append(time.monotonic() - (start + tick * PERIOD))
+    return lateness
+
+
+def main():
+    event = EventFD()
+    print("period: {} ms, ticks: {}".format(PERIOD * 1e3, TICKS))
+    print("{:>10} {:>10} {:>10} {:>10} {:>12}".format("loop", "p50 us", "p99 us", "p99.9 us", "drift us"))
+    for name, loop in (("timerfd", timerfd_loop), ("deadline", deadline_loop), ("fixed", fixed_loop)):
+        lateness = loop(event)
+        stats = summarize(lateness)
+        print("{:>10} {:>10.1f} {:>10.1f} {:>10.1f} {:>12.1f}".format(
+            name, stats["p50"], stats["p99"], stats["p99.9"], lateness[-1] * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Wait latency of EventFD.wait() for low and high fd numbers.
+
+select.select can not handle fds above FD_SETSIZE (1024), wait() uses poll.
+"""
+
+import select
+import threading
+import time
+
+from eventfd import EventFD, BACKEND
+
+from benchmarks._util import FdFiller, per_call, summarize
+
+FD_NUMBERS = [10, 1000, 5000, 50000]
+
+
+def wake_latencies(event, rounds=2000):
+    """Return the set() -> wait() return latencies, in seconds."""
+    samples = []
+    ready = threading.Event()
+    done = threading.Event()
+
+    def waiter():
+        for _ in range(rounds):
+            ready.set()
+            event.wait()
+            samples.append(time.perf_counter() - set_at[0])
+            event.clear()
+            done.set()
+
+    set_at = [0.0]
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    for _ in range(rounds):
+        ready.wait()
+        ready.clear()
+        time.sleep(0.00005)
+        set_at[0] = time.perf_counter()
+        event.set()
+        done.wait()
+        done.clear()
+    thread.join()
+    return samples
+
+
+def select_works(event):
+    try:
+        select.select([event], [], [], 0)
+    except ValueError:
+        return False
+    return True
+
+
+def main():
+    print("backend: {}".format(BACKEND))
+    print("{:>8} {:>14} {:>10} {:>10} {:>10} {:>8}".format(
+        "fd", "wait(0) us", "wake p50", "wake p99", "wake p99.9", "select"))
+    for lowest in FD_NUMBERS:
+        try:
+            filler = FdFiller(lowest).__enter__()
+        except (OSError, ValueError):
+            print("{:>8} skipped, RLIMIT_NOFILE is too low".format(lowest))
+            continue
+        with filler:
+            event = EventFD()
+            wait0 = per_call(lambda: event.wait(0), 20000) * 1e6
+            wake = summarize(wake_latencies(event))
+            print("{:>8} {:>14.2f} {:>10.1f} {:>10.1f} {:>10.1f} {:>8}".format(
+                event.fileno(), wait0, wake["p50"], wake["p99"], wake["p99.9"],
+                "ok" if select_works(event) else "fails"))
+            del event
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,59 @@
-from eventfd._eventfd import EventFD
\ No newline at end of file
+import importlib
+import os
+import sys
+
+from eventfd._eventfd import EventFD, BACKEND, set_many, clear_many
+from eventfd._pool import EventFDPool
+from eventfd._instrument import enable_instrumentation, disable_instrumentation, instrumentation_enabled, \
+    dump_stats
+
+if os.name != "nt":
+    from eventfd._eventfd import SharedEventFD, SemaphoreFD, CounterFD
+    try:
+        from eventfd._eventfd import NativeEventFD
+    except ImportError:  # the C extension is not available
+        pass
+    try:
+        from eventfd._timerfd import TimerFD
+    except ImportError:  # neither os.timerfd_create nor the C extension is available
+        pass
+    try:
+        from eventfd._signalfd import SignalFD, SignalInfo
+    except ImportError:  # the C extension is not available
+        pass
+
+# the integrations import asyncio, concurrent.futures, socketserver or multiprocessing,
+# which costs far more than the events themselves: they are imported on first use.
+_LAZY = {
+    "AsyncEventFD": "eventfd._asyncio",
+    "SelectableFuture": "eventfd._futures",
+    "SelectableExecutor": "eventfd._futures",
+    "EventGroup": "eventfd._group",
+    "FDQueue": "eventfd._queue",
+    "EventReactor": "eventfd._reactor",
+    "NonPollingMixIn": "eventfd._server",
+    "NonPollingHTTPServer": "eventfd._server",
+}
+if os.name != "nt":
+    _LAZY.update({
+        "CompletionSet": "eventfd._futures",
+        "LockFD": "eventfd._sync",
+        "ConditionFD": "eventfd._sync",
+        "BarrierFD": "eventfd._sync",
+        "PreforkServer": "eventfd._prefork",
+    })
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        if name not in _LAZY:
+            raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+        value = globals()[name] = getattr(importlib.import_module(_LAZY[name]), name)
+        return value
+
+    def __dir__():
+        return sorted(set(globals()) | set(_LAZY))
+elif sys.version_info >= (3, 5):
+    # no module __getattr__ before python 3.7.
+    for _name, _module in _LAZY.items():
+        globals()[_name] = getattr(importlib.import_module(_module), _name)
+    del _name, _module
@@ -0,0 +1,103 @@
+"""asyncio support, waiting on an EventFD from the event loop with add_reader."""
+
+import asyncio
+
+from eventfd._eventfd import EventFD
+
+
+__all__ = ["AsyncEventFD", "wait_async"]
+
+# (loop, event) -> set of futures waiting for the event to become readable.
+_waiters = {}
+
+try:
+    _get_running_loop = asyncio.get_running_loop
+except AttributeError:  # python < 3.7
+    _get_running_loop = asyncio.get_event_loop
+
+
+def _wake(loop, key):
+    event = key[1]
+    if getattr(event, "_pulse_pending", False) and not event.is_set():
+        # a pulse token, wait_async() waits for set().
+        event.acknowledge()
+        return
+    futures = _waiters.pop(key)
+    loop.remove_reader(key[1].fileno())
+    for fut in futures:
+        if not fut.done():
+            fut.set_result(True)
+
+
+def _timeout(fut):
+    if not fut.done():
+        fut.set_result(False)
+
+
+async def wait_async(event, timeout=None):
+    """Wait for event without blocking the event loop.
+
+    All the coroutines waiting on the same event in a loop share one
+    add_reader registration. The loop must support add_reader, the windows
+    ProactorEventLoop does not.
+
+    Return True once the event is set and False if the timeout occurred.
+    """
+    if event.is_set():
+        return True
+    loop = _get_running_loop()
+    key = (loop, event)
+    futures = _waiters.get(key)
+    if futures is None:
+        futures = _waiters[key] = set()
+        loop.add_reader(event.fileno(), _wake, loop, key)
+    fut = loop.create_future()
+    futures.add(fut)
+    handle = None if timeout is None else loop.call_later(timeout, _timeout, fut)
+    try:
+        return await fut
+    finally:
+        if handle is not None:
+            handle.cancel()
+        futures.discard(fut)
+        if not futures and _waiters.get(key) is futures:
+            del _waiters[key]
+            loop.remove_reader(event.fileno())
+
+
+class AsyncEventFD(object):
+    """asyncio.Event compatible class backed by an EventFD.
+
+    Unlike :py:class:`asyncio.Event`, set() and clear() can be called from any
+    thread, and the object can still be passed to select/poll.
+    """
+
+    def __init__(self, event=None):
+        self._event = EventFD() if event is None else event
+
+    @property
+    def event(self):
+        """The underlying EventFD."""
+        return self._event
+
+    def is_set(self):
+        """Return True if and only if the internal flag is true."""
+        return self._event.is_set()
+
+    def set(self):
+        """Set the internal flag to true, waking all the waiting coroutines."""
+        self._event.set()
+
+    def clear(self):
+        """Reset the internal flag to false."""
+        self._event.clear()
+
+    async def wait(self):
+        """Block until the internal flag is true, then return True."""
+        while not await wait_async(self._event):
+            pass
+        return True
+
+    def fileno(self):
+        """Return a file descriptor that can be selected."""
+        return self._event.fileno()
@@ -1,12 +1,31 @@
 #include <Python.h>
 #include <sys/eventfd.h>
+#include <sys/signalfd.h>
+#include <sys/timerfd.h>
+#include <errno.h>
+#include <limits.h>
+#include <math.h>
+#include <poll.h>
+#include <stddef.h>
+#include <pthread.h>
+#include <signal.h>
+#include <stdint.h>
+#include <time.h>
+#include <unistd.h>
 
 
-static PyObject * _eventfd(PyObject *self) {
+static PyObject * _eventfd(PyObject *self, PyObject *args) {
+    unsigned int initval = 0;
+    int flags = 0;
     int result;
 
+    if (!PyArg_ParseTuple(args, "|Ii:eventfd", &initval, &flags))
+    {
+        return NULL;
+    }
+
     Py_BEGIN_ALLOW_THREADS
-    result = eventfd(0, 0);
+    result = eventfd(initval, flags);
     Py_END_ALLOW_THREADS
     if (result == -1)
     {
@@ -16,12 +35,637 @@ static PyObject * _eventfd(PyObject *self) {
     return PyLong_FromLong(result);
 };
 
+
+/* Bulk fd writes and drains for set_many() and clear_many(): the fds are
+   converted with the GIL held, then all the syscalls run in one GIL release. */
+
+static int *fds_from_sequence(PyObject *seq, Py_ssize_t *count) {
+    PyObject *fast;
+    Py_ssize_t i;
+    int *fds;
+
+    /* a tuple copy, a list could be resized by another thread without the GIL. */
+    fast = PySequence_Tuple(seq);
+    if (fast == NULL)
+    {
+        return NULL;
+    }
+    *count = PyTuple_GET_SIZE(fast);
+    fds = PyMem_Malloc((*count > 0 ? *count : 1) * sizeof(int));
+    if (fds == NULL)
+    {
+        Py_DECREF(fast);
+        PyErr_NoMemory();
+        return NULL;
+    }
+    for (i = 0; i < *count; i++)
+    {
+        fds[i] = (int)PyLong_AsLong(PyTuple_GET_ITEM(fast, i));
+        if (fds[i] == -1 && PyErr_Occurred())
+        {
+            PyMem_Free(fds);
+            Py_DECREF(fast);
+            return NULL;
+        }
+    }
+    Py_DECREF(fast);
+    return fds;
+}
+
+static PyObject * _write_many(PyObject *self, PyObject *args) {
+    PyObject *seq;
+    Py_buffer data;
+    Py_ssize_t count, i;
+    int *fds;
+    int err = 0;
+
+    if (!PyArg_ParseTuple(args, "Os*:write_many", &seq, &data))
+    {
+        return NULL;
+    }
+    fds = fds_from_sequence(seq, &count);
+    if (fds == NULL)
+    {
+        PyBuffer_Release(&data);
+        return NULL;
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+    for (i = 0; i < count; i++)
+    {
+        /* a full pipe is readable already, the token is not needed. */
+        if (write(fds[i], data.buf, data.len) == -1 && errno != EAGAIN)
+        {
+            err = errno;
+            break;
+        }
+    }
+    Py_END_ALLOW_THREADS
+
+    PyMem_Free(fds);
+    PyBuffer_Release(&data);
+    return Py_BuildValue("(ni)", i, err);
+}
+
+static PyObject * _drain_many(PyObject *self, PyObject *args) {
+    PyObject *seq;
+    Py_ssize_t count, i;
+    ssize_t n;
+    int *fds;
+    int err = 0;
+    char buffer[4096];
+
+    if (!PyArg_ParseTuple(args, "O:drain_many", &seq))
+    {
+        return NULL;
+    }
+    fds = fds_from_sequence(seq, &count);
+    if (fds == NULL)
+    {
+        return NULL;
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+    for (i = 0; i < count; i++)
+    {
+        /* eventfd resets on one read, a pipe is empty after a short read. */
+        do
+        {
+            n = read(fds[i], buffer, sizeof(buffer));
+        } while (n == sizeof(buffer));
+        if (n == -1 && errno != EAGAIN)
+        {
+            err = errno;
+            break;
+        }
+    }
+    Py_END_ALLOW_THREADS
+
+    PyMem_Free(fds);
+    return Py_BuildValue("(ni)", i, err);
+}
+
+
+/* timerfd wrappers, the same interface as os.timerfd_* of python 3.13. */
+
+static void seconds_to_timespec(double seconds, struct timespec *ts) {
+    if (seconds < 0)
+    {
+        seconds = 0;
+    }
+    ts->tv_sec = (time_t)seconds;
+    ts->tv_nsec = (long)((seconds - (double)ts->tv_sec) * 1e9);
+    if (ts->tv_nsec >= 1000000000L)
+    {
+        ts->tv_sec += 1;
+        ts->tv_nsec -= 1000000000L;
+    }
+}
+
+static PyObject * itimerspec_to_tuple(struct itimerspec *spec) {
+    return Py_BuildValue("(dd)",
+                         spec->it_value.tv_sec + spec->it_value.tv_nsec * 1e-9,
+                         spec->it_interval.tv_sec + spec->it_interval.tv_nsec * 1e-9);
+}
+
+static PyObject * _timerfd_create(PyObject *self, PyObject *args) {
+    int clockid;
+    int flags = 0;
+    int result;
+
+    if (!PyArg_ParseTuple(args, "i|i:timerfd_create", &clockid, &flags))
+    {
+        return NULL;
+    }
+
+    result = timerfd_create(clockid, flags);
+    if (result == -1)
+    {
+        return PyErr_SetFromErrno(PyExc_OSError);
+    }
+
+    return PyLong_FromLong(result);
+}
+
+static PyObject * _timerfd_settime(PyObject *self, PyObject *args) {
+    int fd;
+    int flags = 0;
+    double initial = 0, interval = 0;
+    struct itimerspec new_value, old_value;
+
+    if (!PyArg_ParseTuple(args, "i|idd:timerfd_settime", &fd, &flags, &initial, &interval))
+    {
+        return NULL;
+    }
+
+    seconds_to_timespec(initial, &new_value.it_value);
+    seconds_to_timespec(interval, &new_value.it_interval);
+    if (timerfd_settime(fd, flags, &new_value, &old_value) == -1)
+    {
+        return PyErr_SetFromErrno(PyExc_OSError);
+    }
+
+    return itimerspec_to_tuple(&old_value);
+}
+
+static PyObject * _timerfd_gettime(PyObject *self, PyObject *args) {
+    int fd;
+    struct itimerspec value;
+
+    if (!PyArg_ParseTuple(args, "i:timerfd_gettime", &fd))
+    {
+        return NULL;
+    }
+
+    if (timerfd_gettime(fd, &value) == -1)
+    {
+        return PyErr_SetFromErrno(PyExc_OSError);
+    }
+
+    return itimerspec_to_tuple(&value);
+}
+
+
+/* signalfd wrapper, the signals are given as an iterable of numbers. */
+
+static PyObject * _signalfd(PyObject *self, PyObject *args) {
+    int fd;
+    int flags = 0;
+    int result;
+    long signum;
+    PyObject *signals, *iterator, *item;
+    sigset_t mask;
+
+    if (!PyArg_ParseTuple(args, "iO|i:signalfd", &fd, &signals, &flags))
+    {
+        return NULL;
+    }
+
+    sigemptyset(&mask);
+    iterator = PyObject_GetIter(signals);
+    if (iterator == NULL)
+    {
+        return NULL;
+    }
+    while ((item = PyIter_Next(iterator)) != NULL)
+    {
+        signum = PyLong_AsLong(item);
+        Py_DECREF(item);
+        if (signum == -1 && PyErr_Occurred())
+        {
+            break;
+        }
+        if (signum < 1 || signum >= NSIG || sigaddset(&mask, (int)signum) == -1)
+        {
+            PyErr_Format(PyExc_ValueError, "signal number %ld out of range", signum);
+            break;
+        }
+    }
+    Py_DECREF(iterator);
+    if (PyErr_Occurred())
+    {
+        return NULL;
+    }
+
+    result = signalfd(fd, &mask, flags);
+    if (result == -1)
+    {
+        return PyErr_SetFromErrno(PyExc_OSError);
+    }
+
+    return PyLong_FromLong(result);
+}
+
+
+/* EventFD type: the flag, the fd and the lock live in C.
+
+   The flag and the fd are changed with the mutex held, their unlocked reads
+   are atomic so the fast paths stay correct on free-threaded builds where
+   other threads run without the GIL. */
+
+#define LOAD(field) __atomic_load_n(&(field), __ATOMIC_ACQUIRE)
+#define STORE(field, value) __atomic_store_n(&(field), (value), __ATOMIC_RELEASE)
+
+typedef struct {
+    PyObject_HEAD
+    int fd;
+    int flag;
+    pthread_mutex_t lock;
+    PyObject *weakreflist;
+} EventFDObject;
+
+static double monotonic_now(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return ts.tv_sec + ts.tv_nsec * 1e-9;
+}
+
+static PyObject * EventFD_new(PyTypeObject *type, PyObject *args, PyObject *kwds) {
+    static char *kwlist[] = {NULL};
+    EventFDObject *self;
+    int fd;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, ":EventFD", kwlist))
+    {
+        return NULL;
+    }
+
+    fd = eventfd(0, EFD_CLOEXEC | EFD_NONBLOCK);
+    if (fd == -1)
+    {
+        return PyErr_SetFromErrno(PyExc_OSError);
+    }
+
+    self = (EventFDObject *)type->tp_alloc(type, 0);
+    if (self == NULL)
+    {
+        close(fd);
+        return NULL;
+    }
+    self->fd = fd;
+    self->flag = 0;
+    self->weakreflist = NULL;
+    pthread_mutex_init(&self->lock, NULL);
+    return (PyObject *)self;
+}
+
+static void EventFD_dealloc(EventFDObject *self) {
+    if (self->weakreflist != NULL)
+    {
+        PyObject_ClearWeakRefs((PyObject *)self);
+    }
+    if (self->fd != -1)
+    {
+        close(self->fd);
+    }
+    pthread_mutex_destroy(&self->lock);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+static int check_open(EventFDObject *self) {
+    if (LOAD(self->fd) == -1)
+    {
+        PyErr_SetString(PyExc_ValueError, "I/O operation on closed EventFD");
+        return -1;
+    }
+    return 0;
+}
+
+static PyObject * EventFD_is_set(EventFDObject *self) {
+    return PyBool_FromLong(LOAD(self->flag));
+}
+
+static PyObject * EventFD_set(EventFDObject *self) {
+    uint64_t one = 1;
+    int err = 0;
+    int closed = 0;
+
+    if (LOAD(self->flag))
+    {
+        Py_RETURN_NONE;
+    }
+    if (check_open(self) < 0)
+    {
+        return NULL;
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+    pthread_mutex_lock(&self->lock);
+    if (!self->flag)
+    {
+        /* raise the flag first, a selector woken by the write must see it set. */
+        STORE(self->flag, 1);
+        if (self->fd == -1)
+        {
+            /* closed by another thread since check_open. */
+            closed = 1;
+            STORE(self->flag, 0);
+        }
+        else if (write(self->fd, &one, sizeof(one)) != sizeof(one))
+        {
+            err = errno;
+            STORE(self->flag, 0);
+        }
+    }
+    pthread_mutex_unlock(&self->lock);
+    Py_END_ALLOW_THREADS
+
+    if (closed)
+    {
+        PyErr_SetString(PyExc_ValueError, "I/O operation on closed EventFD");
+        return NULL;
+    }
+    if (err)
+    {
+        errno = err;
+        return PyErr_SetFromErrno(PyExc_OSError);
+    }
+    Py_RETURN_NONE;
+}
+
+static PyObject * EventFD_clear(EventFDObject *self) {
+    uint64_t value;
+    int err = 0;
+    int closed = 0;
+
+    if (!LOAD(self->flag))
+    {
+        Py_RETURN_NONE;
+    }
+    if (check_open(self) < 0)
+    {
+        return NULL;
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+    pthread_mutex_lock(&self->lock);
+    if (self->flag)
+    {
+        STORE(self->flag, 0);
+        if (self->fd == -1)
+        {
+            closed = 1;
+        }
+        else if (read(self->fd, &value, sizeof(value)) == -1 && errno != EAGAIN)
+        {
+            err = errno;
+        }
+    }
+    pthread_mutex_unlock(&self->lock);
+    Py_END_ALLOW_THREADS
+
+    if (closed)
+    {
+        PyErr_SetString(PyExc_ValueError, "I/O operation on closed EventFD");
+        return NULL;
+    }
+
+    if (err)
+    {
+        errno = err;
+        return PyErr_SetFromErrno(PyExc_OSError);
+    }
+    Py_RETURN_NONE;
+}
+
+static PyObject * EventFD_wait(EventFDObject *self, PyObject *args, PyObject *kwds) {
+    static char *kwlist[] = {"timeout", NULL};
+    PyObject *timeout_obj = Py_None;
+    double timeout = -1, deadline = 0;
+    struct pollfd pfd;
+    int result, ms;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|O:wait", kwlist, &timeout_obj))
+    {
+        return NULL;
+    }
+    if (LOAD(self->flag))
+    {
+        Py_RETURN_TRUE;
+    }
+    if (check_open(self) < 0)
+    {
+        return NULL;
+    }
+    if (timeout_obj != Py_None)
+    {
+        timeout = PyFloat_AsDouble(timeout_obj);
+        if (timeout == -1 && PyErr_Occurred())
+        {
+            return NULL;
+        }
+        if (timeout < 0)
+        {
+            timeout = 0;
+        }
+        deadline = monotonic_now() + timeout;
+    }
+
+    pfd.fd = LOAD(self->fd);
+    pfd.events = POLLIN;
+    while (1)
+    {
+        if (timeout < 0)
+        {
+            ms = -1;
+        }
+        else if (!(timeout * 1000 < INT_MAX))
+        {
+            /* beyond the int range of poll (about 24.8 days), wait in steps. */
+            ms = INT_MAX;
+        }
+        else
+        {
+            /* round up so we never return before the timeout expires. */
+            ms = (int)ceil(timeout * 1000);
+        }
+        Py_BEGIN_ALLOW_THREADS
+        result = poll(&pfd, 1, ms);
+        Py_END_ALLOW_THREADS
+        if (result == -1)
+        {
+            if (errno != EINTR)
+            {
+                return PyErr_SetFromErrno(PyExc_OSError);
+            }
+            if (PyErr_CheckSignals() < 0)
+            {
+                return NULL;
+            }
+        }
+        else if (result > 0 || ms != INT_MAX)
+        {
+            break;
+        }
+        if (timeout >= 0)
+        {
+            timeout = deadline - monotonic_now();
+            if (timeout < 0)
+            {
+                timeout = 0;
+            }
+        }
+    }
+    return PyBool_FromLong(LOAD(self->flag));
+}
+
+static PyObject * EventFD_fileno(EventFDObject *self) {
+    if (check_open(self) < 0)
+    {
+        return NULL;
+    }
+    return PyLong_FromLong(LOAD(self->fd));
+}
+
+static PyObject * EventFD_close(EventFDObject *self) {
+    int fd;
+
+    /* under the mutex, set() and clear() never use a closed fd. */
+    Py_BEGIN_ALLOW_THREADS
+    pthread_mutex_lock(&self->lock);
+    fd = self->fd;
+    STORE(self->fd, -1);
+    pthread_mutex_unlock(&self->lock);
+    Py_END_ALLOW_THREADS
+    if (fd != -1 && close(fd) == -1)
+    {
+        return PyErr_SetFromErrno(PyExc_OSError);
+    }
+    Py_RETURN_NONE;
+}
+
+static PyMethodDef EventFD_methods[] =
+{
+    {"is_set", (PyCFunction)EventFD_is_set, METH_NOARGS,
+     "Return true if and only if the internal flag is true."},
+    {"set", (PyCFunction)EventFD_set, METH_NOARGS,
+     "Set the internal flag to true, waking all the waiters."},
+    {"clear", (PyCFunction)EventFD_clear, METH_NOARGS,
+     "Reset the internal flag to false."},
+    {"wait", (PyCFunction)EventFD_wait, METH_VARARGS | METH_KEYWORDS,
+     "wait(timeout=None) -> bool\n\nBlock until the internal flag is true or the timeout occurs, return the flag."},
+    {"fileno", (PyCFunction)EventFD_fileno, METH_NOARGS,
+     "Return a file descriptor that can be selected."},
+    {"close", (PyCFunction)EventFD_close, METH_NOARGS,
+     "Close the file descriptor."},
+    {NULL, NULL, 0, NULL}
+};
+
+static PyTypeObject EventFDType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    "eventfd._eventfd_c.EventFD",               /* tp_name */
+    sizeof(EventFDObject),                      /* tp_basicsize */
+    0,                                          /* tp_itemsize */
+    (destructor)EventFD_dealloc,                /* tp_dealloc */
+    0,                                          /* tp_print / tp_vectorcall_offset */
+    0,                                          /* tp_getattr */
+    0,                                          /* tp_setattr */
+    0,                                          /* tp_compare / tp_as_async */
+    0,                                          /* tp_repr */
+    0,                                          /* tp_as_number */
+    0,                                          /* tp_as_sequence */
+    0,                                          /* tp_as_mapping */
+    0,                                          /* tp_hash */
+    0,                                          /* tp_call */
+    0,                                          /* tp_str */
+    0,                                          /* tp_getattro */
+    0,                                          /* tp_setattro */
+    0,                                          /* tp_as_buffer */
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE,   /* tp_flags */
+    "EventFD implemented in C, the flag is kept in C and the syscalls run without the GIL.",
+    0,                                          /* tp_traverse */
+    0,                                          /* tp_clear */
+    0,                                          /* tp_richcompare */
+    offsetof(EventFDObject, weakreflist),       /* tp_weaklistoffset */
+    0,                                          /* tp_iter */
+    0,                                          /* tp_iternext */
+    EventFD_methods,                            /* tp_methods */
+    0,                                          /* tp_members */
+    0,                                          /* tp_getset */
+    0,                                          /* tp_base */
+    0,                                          /* tp_dict */
+    0,                                          /* tp_descr_get */
+    0,                                          /* tp_descr_set */
+    0,                                          /* tp_dictoffset */
+    0,                                          /* tp_init */
+    0,                                          /* tp_alloc */
+    EventFD_new,                                /* tp_new */
+};
+
 static PyMethodDef EventFDMethods[] =
 {
-     {"eventfd", _eventfd, METH_NOARGS, "return new eventfd"},
+     {"eventfd", _eventfd, METH_VARARGS,
+      "eventfd(initval=0, flags=0) -> fd\n\nreturn new eventfd"},
+     {"write_many", _write_many, METH_VARARGS,
+      "write_many(fds, data) -> (count, errno)\n\n"
+      "write data to every fd without the GIL, stop at the first error.\n"
+      "Return the number of fds written and the errno of the failure, 0 on success."},
+     {"drain_many", _drain_many, METH_VARARGS,
+      "drain_many(fds) -> (count, errno)\n\n"
+      "read every non-blocking fd until it is empty without the GIL, stop at the first error.\n"
+      "Return the number of fds drained and the errno of the failure, 0 on success."},
+     {"timerfd_create", _timerfd_create, METH_VARARGS,
+      "timerfd_create(clockid, flags=0) -> fd\n\nreturn new timerfd"},
+     {"timerfd_settime", _timerfd_settime, METH_VARARGS,
+      "timerfd_settime(fd, flags=0, initial=0.0, interval=0.0) -> (initial, interval)\n\n"
+      "arm or disarm the timer, return the old setting"},
+     {"timerfd_gettime", _timerfd_gettime, METH_VARARGS,
+      "timerfd_gettime(fd) -> (initial, interval)\n\nreturn the time until the next expiration and the interval"},
+     {"signalfd", _signalfd, METH_VARARGS,
+      "signalfd(fd, signals, flags=0) -> fd\n\n"
+      "return new signalfd for signals if fd is -1, or change the signals of fd"},
      {NULL, NULL, 0, NULL}
 };
 
+static int init_module(PyObject *module) {
+    if (module == NULL)
+    {
+        return -1;
+    }
+    if (PyModule_AddIntConstant(module, "EFD_CLOEXEC", EFD_CLOEXEC) ||
+        PyModule_AddIntConstant(module, "EFD_NONBLOCK", EFD_NONBLOCK) ||
+        PyModule_AddIntConstant(module, "EFD_SEMAPHORE", EFD_SEMAPHORE) ||
+        PyModule_AddIntConstant(module, "TFD_CLOEXEC", TFD_CLOEXEC) ||
+        PyModule_AddIntConstant(module, "TFD_NONBLOCK", TFD_NONBLOCK) ||
+        PyModule_AddIntConstant(module, "TFD_TIMER_ABSTIME", TFD_TIMER_ABSTIME) ||
+        PyModule_AddIntConstant(module, "SFD_CLOEXEC", SFD_CLOEXEC) ||
+        PyModule_AddIntConstant(module, "SFD_NONBLOCK", SFD_NONBLOCK))
+    {
+        return -1;
+    }
+    if (PyType_Ready(&EventFDType) < 0)
+    {
+        return -1;
+    }
+    Py_INCREF(&EventFDType);
+    if (PyModule_AddObject(module, "EventFD", (PyObject *)&EventFDType) < 0)
+    {
+        Py_DECREF(&EventFDType);
+        return -1;
+    }
+    return 0;
+}
+
 #if PY_MAJOR_VERSION >= 3
 static struct PyModuleDef eventfdmodule = {
    PyModuleDef_HEAD_INIT,
@@ -39,9 +683,25 @@ PyInit__eventfd_c(void)
 PyMODINIT_FUNC init_eventfd_c(void)
 #endif
 {
+    PyObject *module;
 #if PY_MAJOR_VERSION >= 3
-    return PyModule_Create(&eventfdmodule);
+    module = PyModule_Create(&eventfdmodule);
+    if (init_module(module) < 0)
+    {
+        Py_XDECREF(module);
+        return NULL;
+    }
+#ifdef Py_GIL_DISABLED
+    /* the module keeps no state that needs the GIL, importing it must not enable the GIL again. */
+    if (PyUnstable_Module_SetGIL(module, Py_MOD_GIL_NOT_USED) < 0)
+    {
+        Py_DECREF(module);
+        return NULL;
+    }
+#endif
+    return module;
 #else
-    Py_InitModule("_eventfd_c",EventFDMethods);
+    module = Py_InitModule("_eventfd_c", EventFDMethods);
+    init_module(module);
 #endif
 }
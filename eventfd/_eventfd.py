@@ -1,18 +1,68 @@
+import errno
+import math
 import os
 import select
+import struct
+import threading
 
+try:
+    from time import monotonic
+except ImportError:  # python 2
+    from time import time as monotonic
 
-__all__ = ["EventFD"]
+
+__all__ = ["EventFD", "BACKEND", "NativeEventFD", "SharedEventFD", "SemaphoreFD", "CounterFD", "set_many",
+           "clear_many"]
 
 if os.environ.get('EVENTFD_PUREPYTHON') or os.name == "nt":
     HAVE_C_EVENTFD = False
 else:
     try:
-        from eventfd._eventfd_c import eventfd
+        from eventfd import _eventfd_c
+        from eventfd._eventfd_c import eventfd, write_many, drain_many, EFD_CLOEXEC, EFD_NONBLOCK, EFD_SEMAPHORE
         HAVE_C_EVENTFD = True
     except ImportError:
         HAVE_C_EVENTFD = False
 
+# os.eventfd is available in python 3.10+ on linux and does not need the C extension.
+HAVE_OS_EVENTFD = os.name != "nt" and hasattr(os, "eventfd")
+
+# errno values of a read from an empty non-blocking fd.
+_WOULD_BLOCK = frozenset(getattr(errno, name) for name in ("EAGAIN", "EWOULDBLOCK", "WSAEWOULDBLOCK")
+                         if hasattr(errno, name))
+
+# eventfd counter values are native uint64.
+_COUNTER = struct.Struct("=Q")
+
+
+def _set_nonblocking(fd):
+    import fcntl
+    flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+    fcntl.fcntl(fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+
+
+if hasattr(select, "poll"):
+
+    def _wait_readable(fd, timeout):
+        """Block until fd is readable or timeout seconds passed, return True if readable.
+
+        poll is used so fd numbers above FD_SETSIZE work.
+        """
+        poller = select.poll()
+        poller.register(fd, select.POLLIN)
+        if timeout is not None:
+            # round up so we never return before the timeout expires.
+            timeout = max(0, int(math.ceil(timeout * 1000)))
+        return bool(poller.poll(timeout))
+
+else:  # windows
+
+    def _wait_readable(fd, timeout):
+        """Block until fd is readable or timeout seconds passed, return True if readable."""
+        if timeout is not None:
+            timeout = max(0, timeout)
+        return bool(select.select([fd], [], [], timeout)[0])
+
 
 class BaseEventFD(object):
     """Class implementing event objects that has a fd that can be selected.
@@ -20,21 +70,70 @@ class BaseEventFD(object):
     This EventFD class implements the same functions as a regular Event but it
     has a file descriptor. The file descriptor can be accessed using the fileno function.
     This event can be passed to select, poll and it will block until the event will be set.
+
+    A lazy event does not create its file descriptor until the first fileno()
+    call, until then a blocking wait() is served by a :py:class:`threading.Condition`.
+    Events that are never selected then cost no fd and no syscalls.
     """
 
     _DATA = None
 
-    def __init__(self):
+    # set by eventfd.enable_instrumentation(), creates an instrumented instance of a class.
+    _new_instrumented = None
+
+    def __new__(cls, *args, **kwargs):
+        if BaseEventFD._new_instrumented is not None:
+            return BaseEventFD._new_instrumented(cls)
+        return super(BaseEventFD, cls).__new__(cls)
+
+    _closed = False
+    # bytes set_many() writes to the fd, None makes set_many() and clear_many() call set() and clear().
+    _BULK_DATA = None
+    # pulse() count, and whether the fd holds a pulse token nobody consumed yet.
+    _generation = 0
+    _pulse_pending = False
+
+    def __init__(self, lazy=False):
+        # only changed with _lock held, the unlocked reads are fast paths that
+        # are checked again under the lock, which holds without the GIL too.
         self._flag = False
+        self._lock = threading.Lock()
         self._read_fd = None
         self._write_fd = None
+        self._cond = None
+        if not lazy:
+            self._open()
 
-    def _read(self, len):
-        return os.read(self._read_fd, len)
+    def _open(self):
+        """Create the file descriptors."""
+        raise NotImplementedError
+
+    def _close(self):
+        """Close the file descriptors."""
+        raise NotImplementedError
+
+    def _read(self):
+        return os.read(self._read_fd, len(self._DATA))
 
     def _write(self, data):
         os.write(self._write_fd, data)
 
+    def _drain(self):
+        """Consume everything readable from the non-blocking fd.
+
+        eventfd resets its counter on a single read, backends that can hold
+        more than one token override this.
+        """
+        try:
+            self._read()
+        except OSError as e:
+            if e.errno not in _WOULD_BLOCK:
+                raise
+
+    def _check_open(self):
+        if self._closed:
+            raise ValueError("I/O operation on closed EventFD")
+
     def is_set(self):
         """Return true if and only if the internal flag is true."""
         return self._flag
@@ -47,8 +146,12 @@ class BaseEventFD(object):
 
         """
         if self._flag:
-            self._flag = False
-            assert self._read(len(self._DATA)) == self._DATA
+            with self._lock:
+                self._check_open()
+                if self._flag:
+                    self._flag = False
+                    if self._read_fd is not None:
+                        self._drain()
 
     def set(self):
         """Set the internal flag to true.
@@ -58,8 +161,22 @@ class BaseEventFD(object):
 
         """
         if not self._flag:
-            self._flag = True
-            self._write(self._DATA)
+            with self._lock:
+                self._check_open()
+                if not self._flag:
+                    # raise the flag first, a selector woken by the write must see it set.
+                    self._flag = True
+                    if self._pulse_pending:
+                        # the pulse token keeps the fd readable, it now stands for the flag.
+                        self._pulse_pending = False
+                    elif self._read_fd is not None:
+                        try:
+                            self._write(self._DATA)
+                        except BaseException:
+                            self._flag = False
+                            raise
+                    if self._cond is not None:
+                        self._cond.notify_all()
 
     def wait(self, timeout=None):
         """Block until the internal flag is true.
@@ -77,51 +194,374 @@ class BaseEventFD(object):
 
         """
         if not self._flag:
-            ret = select.select([self], [], [], timeout)
-            assert ret[0] in [[self], []]
+            deadline = None if timeout is None else monotonic() + timeout
+            while not self._flag:
+                self._check_open()
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - monotonic()
+                    if remaining <= 0:
+                        break
+                if self._read_fd is not None and not self._pulse_pending:
+                    # a wake up may be a pulse token acknowledged meanwhile, only the flag counts.
+                    _wait_readable(self, remaining)
+                else:
+                    # the fd holds a pulse token, set() and close() notify the condition too.
+                    self._wait_cond(lambda: self._flag or self._closed, remaining)
         return self._flag
 
+    def _wait_cond(self, predicate, timeout):
+        """Block on the condition until predicate() is true, return False on timeout."""
+        deadline = None if timeout is None else monotonic() + timeout
+        with self._lock:
+            # created on the first blocking wait, set() and pulse() notify it from then on.
+            if self._cond is None:
+                self._cond = threading.Condition(self._lock)
+            while not predicate():
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - monotonic()
+                    if remaining <= 0:
+                        return False
+                self._cond.wait(remaining)
+        return True
+
+    @property
+    def generation(self):
+        """The number of pulse() calls so far."""
+        return self._generation
+
+    def pulse(self):
+        """Wake the threads waiting now without leaving the flag set.
+
+        The generation is incremented and wait_for_generation() callers are
+        awakened. The fd is made readable so selectors wake up too, pulses
+        are merged into that single write until acknowledge() consumes the
+        token or set() takes it over. wait() ignores pulses.
+        """
+        with self._lock:
+            self._check_open()
+            self._generation += 1
+            if self._cond is not None:
+                self._cond.notify_all()
+            if not self._flag and not self._pulse_pending and self._read_fd is not None:
+                self._pulse_pending = True
+                try:
+                    self._write(self._DATA)
+                except BaseException:
+                    self._pulse_pending = False
+                    raise
+
+    def wait_for_generation(self, generation, timeout=None):
+        """Block until the generation is greater than generation or the timeout occurs.
+
+        Read the generation before checking the condition you wait for, then
+        a pulse() between the check and this call is not lost. Return True
+        unless the timeout occurred.
+        """
+        if self._generation > generation:
+            return True
+        return self._wait_cond(lambda: self._generation > generation, timeout)
+
+    def acknowledge(self):
+        """Consume the pulse token so the fd is not readable anymore, return the generation.
+
+        Select loops call it after waking on a pulse. With edge-triggered
+        epoll it must be called after every wake, pulses are merged until the
+        token is consumed so they produce no new edge before that.
+        """
+        if self._pulse_pending:
+            with self._lock:
+                if self._pulse_pending:
+                    self._pulse_pending = False
+                    self._drain()
+        return self._generation
+
+    def wait_async(self, timeout=None):
+        """Return a coroutine that waits for the internal flag in asyncio.
+
+        The coroutine has the same timeout and return value semantics as
+        wait(), but the fd is watched with the running loop add_reader so no
+        thread is blocked. set() can be called from any thread.
+
+        """
+        from eventfd._asyncio import wait_async
+        return wait_async(self, timeout)
+
     def fileno(self):
         """Return a file descriptor that can be selected.
 
         You should not use this directly pass the EventFD object instead.
         """
+        if self._read_fd is None:
+            self._open_lazy()
         return self._read_fd
 
+    def _open_lazy(self):
+        with self._lock:
+            self._check_open()
+            if self._read_fd is None:
+                self._open()
+                if self._flag:
+                    self._write(self._DATA)
+
+    def close(self):
+        """Close the file descriptors.
+
+        set(), clear(), wait(), pulse() and fileno() raise ValueError from now
+        on. Closing is optional, the file descriptors are closed when the
+        event is collected.
+        """
+        with self._lock:
+            self._closed = True
+            if self._cond is not None:
+                self._cond.notify_all()
+            if self._read_fd is not None:
+                self._close()
+                self._read_fd = self._write_fd = None
+
+    def __reduce__(self):
+        raise TypeError("{} can not be shared between processes, use SharedEventFD".format(
+            type(self).__name__))
+
     def __del__(self):
         """Closes the file descriptors"""
-        raise NotImplementedError
+        if getattr(self, "_read_fd", None) is not None:
+            self._close()
+
+
+# the shared flag byte, mmap items are 1-char strings on python 2 and ints on python 3.
+_SHM_SET = b"\x01"[0]
+_SHM_CLEAR = b"\x00"[0]
+
+
+class SharedEventFDMixIn(object):
+    """Mix-in class for events that are shared between processes.
+
+    The flag is not kept in the object, every call asks the fd itself, so
+    is_set() stays correct after another process calls set() or clear(). This
+    costs a poll syscall per is_set() call.
+
+    With shared_memory=True the flag is a byte in a memory mapped memfd
+    shared by all the processes, is_set() is a memory read without a syscall.
+    set() and clear() change the byte and the fd together under a
+    :py:func:`fcntl.lockf` lock of the memfd, so they stay consistent across
+    processes.
+
+    Shared events can be inherited on fork and passed to
+    :py:class:`multiprocessing.Process` or :py:class:`multiprocessing.Pool`
+    workers, the fds are duplicated with the multiprocessing reduction
+    machinery (SCM_RIGHTS fd passing where needed).
+    """
+
+    _BULK_DATA = None
+    # the memfd and its mapping when the flag is in shared memory.
+    _shm_fd = None
+    _shm = None
+
+    def __init__(self, shared_memory=False):
+        # the fd is the shared state, a shared event can not be lazy.
+        super(SharedEventFDMixIn, self).__init__()
+        if shared_memory:
+            if hasattr(os, "memfd_create"):
+                fd = os.memfd_create("eventfd-flag")
+            else:
+                import tempfile
+                with tempfile.TemporaryFile() as temp:
+                    fd = os.dup(temp.fileno())
+            os.ftruncate(fd, 1)
+            self._map_shared_flag(fd)
+
+    def _map_shared_flag(self, fd):
+        import mmap
+        self._shm_fd = fd
+        self._shm = mmap.mmap(fd, 1)
+
+    def _lock_shared(self):
+        import fcntl
+        self._lock.acquire()
+        try:
+            # lockf locks belong to the process, the threads are serialized by _lock.
+            fcntl.lockf(self._shm_fd, fcntl.LOCK_EX)
+        except BaseException:
+            self._lock.release()
+            raise
+
+    def _unlock_shared(self):
+        import fcntl
+        try:
+            fcntl.lockf(self._shm_fd, fcntl.LOCK_UN)
+        finally:
+            self._lock.release()
+
+    def pulse(self):
+        """Not supported, raise TypeError.
+
+        The fd is the flag of a shared event, a pulse token would make the
+        other processes see it set.
+        """
+        raise TypeError("{} does not support pulse(), the fd is the shared flag".format(
+            type(self).__name__))
+
+    def is_set(self):
+        """Return true if and only if the fd holds a token, or the shared flag is set."""
+        if self._shm is not None:
+            return self._shm[0] == _SHM_SET
+        return _wait_readable(self, 0)
+
+    def clear(self):
+        """Reset the internal flag to false."""
+        if self._shm is not None:
+            if self._shm[0] == _SHM_SET:
+                self._lock_shared()
+                try:
+                    if self._shm[0] == _SHM_SET:
+                        self._shm[0] = _SHM_CLEAR
+                        self._drain()
+                finally:
+                    self._unlock_shared()
+            return
+        with self._lock:
+            self._check_open()
+            self._flag = False
+            self._drain()
+
+    def set(self):
+        """Set the internal flag to true."""
+        if self._shm is not None:
+            if self._shm[0] != _SHM_SET:
+                self._lock_shared()
+                try:
+                    if self._shm[0] != _SHM_SET:
+                        # raise the flag first, a selector woken by the write must see it set.
+                        self._shm[0] = _SHM_SET
+                        try:
+                            self._write(self._DATA)
+                        except BaseException:
+                            self._shm[0] = _SHM_CLEAR
+                            raise
+                finally:
+                    self._unlock_shared()
+            return
+        with self._lock:
+            self._check_open()
+            if not _wait_readable(self, 0):
+                # another process can write between the check and the
+                # write, the extra token is drained by the next clear().
+                self._write(self._DATA)
+            self._flag = True
+
+    def wait(self, timeout=None):
+        """Block until the internal flag is true or the timeout occurs."""
+        return _wait_readable(self, timeout)
+
+    def _close(self):
+        super(SharedEventFDMixIn, self)._close()
+        if self._shm is not None:
+            self._shm.close()
+            os.close(self._shm_fd)
+            self._shm = self._shm_fd = None
+
+    def __reduce__(self):
+        from multiprocessing.reduction import DupFd
+        write_fd = None if self._write_fd == self._read_fd else DupFd(self._write_fd)
+        shm_fd = None if self._shm is None else DupFd(self._shm_fd)
+        cls = getattr(type(self), "_uninstrumented", type(self))
+        return _rebuild_shared_event, (cls, DupFd(self._read_fd), write_fd, shm_fd)
+
+
+def _rebuild_shared_event(cls, read_fd, write_fd, shm_fd=None):
+    event = cls.__new__(cls)
+    # the fds are given, initialize a lazy event and attach them.
+    BaseEventFD.__init__(event, lazy=True)
+    event._read_fd = read_fd.detach()
+    event._write_fd = event._read_fd if write_fd is None else write_fd.detach()
+    if shm_fd is not None:
+        event._map_shared_flag(shm_fd.detach())
+    return event
 
 if os.name != "nt":
 
     class PipeEventFD(BaseEventFD):
 
         _DATA = b"A"
+        _BULK_DATA = _DATA
 
-        def __init__(self):
-            super(PipeEventFD, self).__init__()
+        def _open(self):
             self._read_fd, self._write_fd = os.pipe()
+            _set_nonblocking(self._read_fd)
 
-        def __del__(self):
+        def _drain(self):
+            try:
+                while len(os.read(self._read_fd, 4096)) == 4096:
+                    pass
+            except OSError as e:
+                if e.errno not in _WOULD_BLOCK:
+                    raise
+
+        def _close(self):
             os.close(self._read_fd)
             os.close(self._write_fd)
 
     EventFD = PipeEventFD
+    BACKEND = "pipe"
 
     if HAVE_C_EVENTFD:
 
         class CEventFD(BaseEventFD):
 
             _DATA = b'\x00\x00\x00\x00\x00\x00\x00\x01'
+            _BULK_DATA = _DATA
 
-            def __init__(self):
-                super(CEventFD, self).__init__()
-                self._write_fd = self._read_fd = eventfd()
+            def _open(self):
+                self._write_fd = self._read_fd = eventfd(0, EFD_CLOEXEC | EFD_NONBLOCK)
 
-            def __del__(self):
+            def _close(self):
                 os.close(self._write_fd)
 
         EventFD = CEventFD
+        BACKEND = "c"
+
+        class NativeEventFD(_eventfd_c.EventFD):
+            """EventFD type implemented in C.
+
+            The flag, the fd and the lock are kept in C and set(), clear()
+            and wait() call write/read/poll directly with the GIL released,
+            so the hot path has no python level dispatch. It supports the
+            regular :class:`BaseEventFD` interface plus close(), but not the
+            python level extensions such as instrumentation or sharing
+            between processes.
+            """
+
+            __slots__ = ()
+
+            wait_async = BaseEventFD.__dict__["wait_async"]
+
+    if HAVE_OS_EVENTFD:
+
+        class OSEventFD(BaseEventFD):
+            """EventFD using :py:func:`os.eventfd`, no C extension is needed."""
+
+            _DATA = 1
+            _BULK_DATA = _COUNTER.pack(_DATA)
+
+            def _open(self):
+                self._write_fd = self._read_fd = os.eventfd(0, os.EFD_CLOEXEC | os.EFD_NONBLOCK)
+
+            def _read(self):
+                return os.eventfd_read(self._read_fd)
+
+            def _write(self, data):
+                os.eventfd_write(self._write_fd, data)
+
+            def _close(self):
+                os.close(self._write_fd)
+
+        EventFD = OSEventFD
+        BACKEND = "os"
+
+    class SharedEventFD(SharedEventFDMixIn, EventFD):
+        """EventFD that can be shared between processes, see :class:`SharedEventFDMixIn`."""
 
 else:  # windows
     import socket
@@ -130,26 +570,427 @@ else:  # windows
 
         _DATA = b'A'
 
-        def __init__(self):
-            super(SocketEventFD, self).__init__()
+        def _open(self):
             temp_fd = socket.socket()
             temp_fd.bind(("127.0.0.1", 0))
             temp_fd.listen(1)
             self._read_fd = socket.create_connection(temp_fd.getsockname())
+            self._read_fd.setblocking(False)
             self._write_fd, _ = temp_fd.accept()
             temp_fd.close()
 
-        def _read(self, len):
-            return self._read_fd.recv(len)
+        def _read(self):
+            return self._read_fd.recv(len(self._DATA))
 
         def _write(self, data):
             self._write_fd.send(data)
 
+        def _drain(self):
+            try:
+                while len(self._read_fd.recv(4096)) == 4096:
+                    pass
+            except OSError as e:
+                if e.errno not in _WOULD_BLOCK:
+                    raise
+
         def fileno(self):
+            if self._read_fd is None:
+                self._open_lazy()
             return self._read_fd.fileno()
 
-        def __del__(self):
+        def _close(self):
             self._read_fd.close()
             self._write_fd.close()
 
-    EventFD = SocketEventFD
\ No newline at end of file
+    EventFD = SocketEventFD
+    BACKEND = "socket"
+
+
+def _split_bulk(events, flag):
+    """Return the events whose flag is not flag and can be changed in bulk, sorted by id, and the other events."""
+    bulk = {}
+    other = []
+    for event in events:
+        if not HAVE_C_EVENTFD or getattr(event, "_BULK_DATA", None) is None:
+            other.append(event)
+        elif event._flag != flag:
+            bulk[id(event)] = event
+    # locks are taken in id order, concurrent bulk calls can not deadlock.
+    return [bulk[key] for key in sorted(bulk)], other
+
+
+def _raise_errno(err):
+    raise OSError(err, os.strerror(err))
+
+
+def set_many(events):
+    """Set every event in events.
+
+    Events that are already set are skipped. The fd writes of the others are
+    done by the C extension in a single GIL release instead of a set() call
+    per event. Events that need their own set(), such as shared, instrumented
+    and native events, or all of them when the C extension is not available,
+    are set one by one.
+    """
+    bulk, other = _split_bulk(events, True)
+    for event in other:
+        event.set()
+    if not bulk:
+        return
+    for event in bulk:
+        event._lock.acquire()
+    try:
+        for event in bulk:
+            event._check_open()
+        changed = [event for event in bulk if not event._flag]
+        writes = {}
+        for event in changed:
+            event._flag = True
+            if event._pulse_pending:
+                event._pulse_pending = False
+            elif event._read_fd is not None:
+                writes.setdefault(event._BULK_DATA, []).append(event)
+        error = 0
+        for data, targets in writes.items():
+            count, err = write_many([event._write_fd for event in targets], data)
+            if err:
+                for event in targets[count:]:
+                    event._flag = False
+                error = error or err
+        for event in changed:
+            if event._cond is not None:
+                event._cond.notify_all()
+        if error:
+            _raise_errno(error)
+    finally:
+        for event in bulk:
+            event._lock.release()
+
+
+def clear_many(events):
+    """Reset the flag of every event in events.
+
+    Events that are not set are skipped. The fds of the others are drained
+    by the C extension in a single GIL release, see set_many().
+    """
+    bulk, other = _split_bulk(events, False)
+    for event in other:
+        event.clear()
+    if not bulk:
+        return
+    for event in bulk:
+        event._lock.acquire()
+    try:
+        for event in bulk:
+            event._check_open()
+        fds = []
+        for event in bulk:
+            if event._flag:
+                event._flag = False
+                if event._read_fd is not None:
+                    fds.append(event._read_fd)
+        if fds:
+            _, err = drain_many(fds)
+            if err:
+                _raise_errno(err)
+    finally:
+        for event in bulk:
+            event._lock.release()
+
+
+class BaseSemaphoreFD(object):
+    """Class implementing counting semaphore objects that has a fd that can be selected.
+
+    This SemaphoreFD class implements the same functions as a regular Semaphore.
+    The file descriptor is readable while the counter is greater than zero, and
+    every unit released wakes exactly one acquire.
+    """
+
+    def __init__(self, value=1):
+        self._read_fd = None
+        self._write_fd = None
+        if value < 0:
+            raise ValueError("semaphore initial value must be >= 0")
+
+    def _read(self):
+        raise NotImplementedError
+
+    def _write(self, n):
+        raise NotImplementedError
+
+    def _try_acquire(self):
+        try:
+            self._read()
+        except OSError as e:
+            if e.errno not in _WOULD_BLOCK:
+                raise
+            return False
+        return True
+
+    def acquire(self, blocking=True, timeout=None):
+        """Acquire a semaphore, decrementing the internal counter by one.
+
+        When invoked with blocking set to true (the default) block until a unit
+        is available or until the optional timeout occurs. When invoked with
+        blocking set to false, do not block.
+
+        Return True if a unit was acquired and False otherwise.
+
+        """
+        if not blocking and timeout is not None:
+            raise ValueError("can't specify timeout for non-blocking acquire")
+        deadline = None if timeout is None else monotonic() + timeout
+        while not self._try_acquire():
+            if not blocking:
+                return False
+            remaining = None
+            if deadline is not None:
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    return False
+            # Other waiters might take the unit first, so retry after every wakeup.
+            _wait_readable(self, remaining)
+        return True
+
+    __enter__ = acquire
+
+    def release(self, n=1):
+        """Release a semaphore, incrementing the internal counter by n.
+
+        The n units are posted with a single write, waking up to n waiters.
+
+        """
+        if n < 1:
+            raise ValueError("n must be one or more")
+        self._write(n)
+
+    def __exit__(self, t, v, tb):
+        self.release()
+
+    def fileno(self):
+        """Return a file descriptor that is readable while the semaphore can be acquired."""
+        return self._read_fd
+
+    def __del__(self):
+        """Closes the file descriptors"""
+        raise NotImplementedError
+
+if os.name != "nt":
+
+    class PipeSemaphoreFD(BaseSemaphoreFD):
+        """SemaphoreFD using a pipe holding one byte per unit.
+
+        release() blocks once the pipe buffer (usually 64 KiB units) is full.
+        """
+
+        _UNIT = b"A"
+
+        def __init__(self, value=1):
+            super(PipeSemaphoreFD, self).__init__(value)
+            self._read_fd, self._write_fd = os.pipe()
+            _set_nonblocking(self._read_fd)
+            if value:
+                self._write_initial(value)
+
+        def _write_initial(self, value):
+            # nobody can acquire yet, a value above the pipe capacity would block forever.
+            import fcntl
+            flags = fcntl.fcntl(self._write_fd, fcntl.F_GETFL)
+            _set_nonblocking(self._write_fd)
+            try:
+                self._write(value)
+            except OSError as e:
+                os.close(self._read_fd)
+                os.close(self._write_fd)
+                self._read_fd = self._write_fd = None
+                if e.errno in _WOULD_BLOCK:
+                    raise ValueError("semaphore initial value {} exceeds the pipe capacity".format(value))
+                raise
+            fcntl.fcntl(self._write_fd, fcntl.F_SETFL, flags)
+
+        def _read(self):
+            return os.read(self._read_fd, 1)
+
+        def _write(self, n):
+            data = self._UNIT * n
+            while data:
+                data = data[os.write(self._write_fd, data):]
+
+        def __del__(self):
+            if self._read_fd is not None:
+                os.close(self._read_fd)
+                os.close(self._write_fd)
+
+    SemaphoreFD = PipeSemaphoreFD
+
+    if HAVE_C_EVENTFD:
+
+        class CSemaphoreFD(BaseSemaphoreFD):
+
+            def __init__(self, value=1):
+                super(CSemaphoreFD, self).__init__(value)
+                self._write_fd = self._read_fd = eventfd(
+                    value, EFD_CLOEXEC | EFD_NONBLOCK | EFD_SEMAPHORE)
+
+            def _read(self):
+                return os.read(self._read_fd, _COUNTER.size)
+
+            def _write(self, n):
+                os.write(self._write_fd, _COUNTER.pack(n))
+
+            def __del__(self):
+                if self._write_fd is not None:
+                    os.close(self._write_fd)
+
+        SemaphoreFD = CSemaphoreFD
+
+    if HAVE_OS_EVENTFD:
+
+        class OSSemaphoreFD(BaseSemaphoreFD):
+
+            def __init__(self, value=1):
+                super(OSSemaphoreFD, self).__init__(value)
+                self._write_fd = self._read_fd = os.eventfd(
+                    value, os.EFD_CLOEXEC | os.EFD_NONBLOCK | os.EFD_SEMAPHORE)
+
+            def _read(self):
+                return os.eventfd_read(self._read_fd)
+
+            def _write(self, n):
+                os.eventfd_write(self._write_fd, n)
+
+            def __del__(self):
+                if self._write_fd is not None:
+                    os.close(self._write_fd)
+
+        SemaphoreFD = OSSemaphoreFD
+
+
+class BaseCounterFD(object):
+    """Class implementing a counter that has a fd that can be selected.
+
+    Producers add to the counter with notify(n) and a consumer takes the
+    accumulated count with drain(), so a consumer that wakes up once can
+    handle a whole batch. The file descriptor is readable while the counter
+    is greater than zero.
+    """
+
+    def __init__(self):
+        self._read_fd = None
+        self._write_fd = None
+
+    def _read(self):
+        raise NotImplementedError
+
+    def _write(self, n):
+        raise NotImplementedError
+
+    def notify(self, n=1):
+        """Add n to the counter, waking the consumer."""
+        if n < 1:
+            raise ValueError("n must be one or more")
+        self._write(n)
+
+    def drain(self):
+        """Return the accumulated count and reset it to zero, without blocking.
+
+        Return 0 if nothing was notified since the last drain.
+        """
+        try:
+            return self._read()
+        except OSError as e:
+            if e.errno not in _WOULD_BLOCK:
+                raise
+            return 0
+
+    def wait(self, timeout=None):
+        """Block until the counter is greater than zero or the timeout occurs.
+
+        Return True if the counter is greater than zero.
+        """
+        return _wait_readable(self, timeout)
+
+    def fileno(self):
+        """Return a file descriptor that is readable while the counter is greater than zero."""
+        return self._read_fd
+
+    def __del__(self):
+        """Closes the file descriptors"""
+        raise NotImplementedError
+
+if os.name != "nt":
+
+    class PipeCounterFD(BaseCounterFD):
+        """CounterFD using a pipe holding one native uint64 per notify().
+
+        Every record is written atomically, drain() sums all the pending
+        records. notify() blocks once the pipe buffer (usually 8192 pending
+        notifies) is full.
+        """
+
+        _CHUNK = _COUNTER.size * 4096
+
+        def __init__(self):
+            super(PipeCounterFD, self).__init__()
+            self._read_fd, self._write_fd = os.pipe()
+            _set_nonblocking(self._read_fd)
+
+        def _read(self):
+            total = 0
+            while True:
+                try:
+                    data = os.read(self._read_fd, self._CHUNK)
+                except OSError as e:
+                    if e.errno not in _WOULD_BLOCK or not total:
+                        raise
+                    return total
+                total += sum(struct.unpack("={}Q".format(len(data) // _COUNTER.size), data))
+                if len(data) < self._CHUNK:
+                    return total
+
+        def _write(self, n):
+            os.write(self._write_fd, _COUNTER.pack(n))
+
+        def __del__(self):
+            os.close(self._read_fd)
+            os.close(self._write_fd)
+
+    CounterFD = PipeCounterFD
+
+    if HAVE_C_EVENTFD:
+
+        class CCounterFD(BaseCounterFD):
+
+            def __init__(self):
+                super(CCounterFD, self).__init__()
+                self._write_fd = self._read_fd = eventfd(0, EFD_CLOEXEC | EFD_NONBLOCK)
+
+            def _read(self):
+                return _COUNTER.unpack(os.read(self._read_fd, _COUNTER.size))[0]
+
+            def _write(self, n):
+                os.write(self._write_fd, _COUNTER.pack(n))
+
+            def __del__(self):
+                os.close(self._write_fd)
+
+        CounterFD = CCounterFD
+
+    if HAVE_OS_EVENTFD:
+
+        class OSCounterFD(BaseCounterFD):
+
+            def __init__(self):
+                super(OSCounterFD, self).__init__()
+                self._write_fd = self._read_fd = os.eventfd(0, os.EFD_CLOEXEC | os.EFD_NONBLOCK)
+
+            def _read(self):
+                return os.eventfd_read(self._read_fd)
+
+            def _write(self, n):
+                os.eventfd_write(self._write_fd, n)
+
+            def __del__(self):
+                os.close(self._write_fd)
+
+        CounterFD = OSCounterFD
@@ -0,0 +1,151 @@
+"""concurrent.futures integration: futures and completion sets that can be selected."""
+
+import collections
+import concurrent.futures
+import os
+import threading
+
+from eventfd._eventfd import EventFD
+
+
+__all__ = ["SelectableFuture", "SelectableExecutor", "CompletionSet"]
+
+
+def _set_done_event(future):
+    future._done_event.set()
+
+
+class SelectableFuture(concurrent.futures.Future):
+    """A :py:class:`concurrent.futures.Future` with a file descriptor that is readable once it is done.
+
+    The event is lazy, the fd is only created if fileno() is called, so a
+    future that is only waited with result() or wait() costs no fd.
+    """
+
+    def __init__(self):
+        super(SelectableFuture, self).__init__()
+        self._done_event = EventFD(lazy=True)
+        self.add_done_callback(_set_done_event)
+
+    def wait(self, timeout=None):
+        """Block until the future is done or the timeout occurs, return True if it is done."""
+        return self._done_event.wait(timeout)
+
+    def fileno(self):
+        """Return a file descriptor that is readable once the future is done."""
+        return self._done_event.fileno()
+
+
+def _run(future, fn, args, kwargs):
+    """Run fn(*args, **kwargs) in the wrapped executor and set the outcome on future."""
+    if not future.set_running_or_notify_cancel():
+        return
+    try:
+        result = fn(*args, **kwargs)
+    except BaseException as e:
+        future.set_exception(e)
+    else:
+        future.set_result(result)
+
+
+def _chain(inner, future):
+    """Cancel inner when future is cancelled, and future when inner is cancelled."""
+
+    def cancel_inner(f):
+        if f.cancelled():
+            inner.cancel()
+
+    def cancel_future(f):
+        if f.cancelled():
+            future.cancel()
+
+    future.add_done_callback(cancel_inner)
+    inner.add_done_callback(cancel_future)
+
+
+class SelectableExecutor(object):
+    """Wrap a thread based executor so submit() returns :class:`SelectableFuture` objects.
+
+    The call runs in the wrapped executor and sets the returned future, which
+    is running while the call runs: cancel() only succeeds before it started.
+    Cancelling the returned future cancels the wrapped one and the other way
+    round.
+    """
+
+    def __init__(self, executor):
+        self._executor = executor
+
+    def submit(self, fn, *args, **kwargs):
+        """Schedule fn(*args, **kwargs) and return a :class:`SelectableFuture`."""
+        future = SelectableFuture()
+        inner = self._executor.submit(_run, future, fn, args, kwargs)
+        _chain(inner, future)
+        return future
+
+    def shutdown(self, wait=True):
+        """Shut down the wrapped executor."""
+        self._executor.shutdown(wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+
+
+if os.name != "nt":
+    from eventfd._eventfd import CounterFD
+
+    class CompletionSet(object):
+        """Many futures sharing one counter fd, completed futures are collected in O(ready).
+
+        Every future that completes is appended to a ready queue and notifies
+        the counter, so the fd is readable while completed futures were not
+        collected. pop_completed() drains the counter with a single read and
+        returns exactly the futures that were counted, the pending futures are
+        never scanned. Any :py:class:`concurrent.futures.Future` can be added.
+        """
+
+        def __init__(self, futures=()):
+            self._counter = CounterFD()
+            self._ready = collections.deque()
+            self._lock = threading.Lock()
+            self._pending = 0
+            for future in futures:
+                self.add(future)
+
+        def _done(self, future):
+            # append before notify, every counted future is in the queue.
+            self._ready.append(future)
+            self._counter.notify()
+
+        def add(self, future):
+            """Add future to the set, a future that is already done is ready at once."""
+            with self._lock:
+                self._pending += 1
+            future.add_done_callback(self._done)
+
+        def pop_completed(self):
+            """Return the futures that completed since the last call, without blocking."""
+            count = self._counter.drain()
+            completed = [self._ready.popleft() for _ in range(count)]
+            with self._lock:
+                self._pending -= count
+            return completed
+
+        def wait(self, timeout=None):
+            """Block until a future completed or the timeout occurs, return the completed futures.
+
+            An empty list is returned on timeout.
+            """
+            if not self._counter.wait(timeout):
+                return []
+            return self.pop_completed()
+
+        def __len__(self):
+            """Return the number of futures that were added and not collected yet."""
+            return self._pending
+
+        def fileno(self):
+            """Return a file descriptor that is readable while completed futures wait to be collected."""
+            return self._counter.fileno()
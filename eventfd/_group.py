@@ -0,0 +1,112 @@
+"""Waiting on many events with one persistent selector."""
+
+import selectors
+
+from eventfd._eventfd import monotonic
+
+
+__all__ = ["EventGroup"]
+
+
+def _acknowledge(events):
+    """Consume the pulse tokens of the events that are readable but not set."""
+    for event in events:
+        if not event.is_set():
+            acknowledge = getattr(event, "acknowledge", None)
+            if acknowledge is not None:
+                acknowledge()
+
+
+class EventGroup(object):
+    """A set of events registered once in a persistent selector.
+
+    On linux the selector is epoll, so wait_any() costs O(ready events)
+    instead of O(registered events) and there is no FD_SETSIZE limit.
+    Events can be added and removed while other threads are blocked in
+    wait_any(); with epoll the change applies to the blocked call too.
+    """
+
+    def __init__(self, events=()):
+        self._selector = selectors.DefaultSelector()
+        for event in events:
+            self.add(event)
+
+    def add(self, event):
+        """Add event to the group, raise KeyError if it is already registered."""
+        self._selector.register(event, selectors.EVENT_READ, event)
+
+    def remove(self, event):
+        """Remove event from the group, raise KeyError if it is not registered."""
+        self._selector.unregister(event)
+
+    def __len__(self):
+        return len(self._selector.get_map())
+
+    def __contains__(self, event):
+        try:
+            self._selector.get_key(event)
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        return iter([key.data for key in list(self._selector.get_map().values())])
+
+    def wait_any(self, timeout=None):
+        """Block until at least one event is set or the timeout occurs.
+
+        Return the list of set events, which is empty if the timeout occurred.
+        Events readable because of a pulse() are not returned, their pulse is
+        acknowledged.
+        """
+        deadline = None if timeout is None else monotonic() + timeout
+        while True:
+            ready = [key.data for key, _ in self._selector.select(timeout)]
+            events = [event for event in ready if event.is_set()]
+            if events or not ready:
+                return events
+            _acknowledge(ready)
+            if deadline is not None:
+                timeout = deadline - monotonic()
+                if timeout <= 0:
+                    return []
+
+    def wait_all(self, timeout=None):
+        """Block until every event in the group has been set or the timeout occurs.
+
+        The events that are not set on entry are watched with a temporary
+        selector, each one is dropped from it as soon as it is seen set.
+        Pulses wake the call but do not count as set.
+        Events added or removed during the call are not taken into account.
+
+        Return True if all the events were set and False if the timeout occurred.
+        """
+        pending = [event for event in self if not event.is_set()]
+        if not pending:
+            return True
+        deadline = None if timeout is None else monotonic() + timeout
+        with selectors.DefaultSelector() as selector:
+            for event in pending:
+                selector.register(event, selectors.EVENT_READ)
+            while selector.get_map():
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - monotonic()
+                    if remaining <= 0:
+                        return False
+                ready = [key.fileobj for key, _ in selector.select(remaining)]
+                for event in ready:
+                    if event.is_set():
+                        selector.unregister(event)
+                _acknowledge(ready)
+        return True
+
+    def close(self):
+        """Close the selector, the events themselves are not closed."""
+        self._selector.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, t, v, tb):
+        self.close()
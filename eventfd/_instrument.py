@@ -0,0 +1,176 @@
+"""Opt-in instrumentation of events: counters and wake latency histograms.
+
+Instrumentation works by creating events as instances of an instrumented
+subclass, so events created while it is disabled run the regular code and
+pay nothing for it.
+"""
+
+import os
+import threading
+import time
+import weakref
+
+from eventfd._eventfd import BaseEventFD, monotonic
+
+
+__all__ = ["EventStats", "enable_instrumentation", "disable_instrumentation",
+           "instrumentation_enabled", "dump_stats"]
+
+# every live instrumented event
+_registry = weakref.WeakSet()
+
+# class -> instrumented subclass
+_classes = {}
+_classes_lock = threading.Lock()
+
+
+class EventStats(object):
+    """Counters of one instrumented event.
+
+    wake_latency is a histogram of the time from set() to wait() returning
+    in a thread that was blocked, keyed by the bucket upper bound in
+    microseconds (powers of two).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.set_calls = 0
+        self.redundant_sets = 0
+        self.sets_without_waiters = 0
+        self.clear_calls = 0
+        self.wait_calls = 0
+        self.wait_timeouts = 0
+        self.syscalls = 0
+        self.waiting = 0
+        self.last_set = None
+        self._last_set_monotonic = None
+        self.wake_latency = {}
+
+    def _record_wake(self):
+        if self._last_set_monotonic is None:
+            # set by another process
+            return
+        latency = monotonic() - self._last_set_monotonic
+        bucket = 1 << max(0, int(latency * 1e6)).bit_length()
+        with self._lock:
+            self.wake_latency[bucket] = self.wake_latency.get(bucket, 0) + 1
+
+    def as_dict(self):
+        """Return the counters as a dict of plain values."""
+        with self._lock:
+            return {
+                "set_calls": self.set_calls,
+                "redundant_sets": self.redundant_sets,
+                "sets_without_waiters": self.sets_without_waiters,
+                "clear_calls": self.clear_calls,
+                "wait_calls": self.wait_calls,
+                "wait_timeouts": self.wait_timeouts,
+                "syscalls": self.syscalls,
+                "waiting": self.waiting,
+                "last_set": self.last_set,
+                "wake_latency_us": dict(sorted(self.wake_latency.items())),
+            }
+
+
+class InstrumentedEventFDMixIn(object):
+    """Mix-in class counting the calls and syscalls of an event into self.stats."""
+
+    # bulk set_many() and clear_many() would bypass the counters.
+    _BULK_DATA = None
+
+    def set(self):
+        stats = self.stats
+        with stats._lock:
+            stats.set_calls += 1
+            if self._flag:
+                stats.redundant_sets += 1
+            elif not stats.waiting:
+                stats.sets_without_waiters += 1
+            stats.last_set = time.time()
+            stats._last_set_monotonic = monotonic()
+        super(InstrumentedEventFDMixIn, self).set()
+
+    def clear(self):
+        with self.stats._lock:
+            self.stats.clear_calls += 1
+        super(InstrumentedEventFDMixIn, self).clear()
+
+    def wait(self, timeout=None):
+        stats = self.stats
+        with stats._lock:
+            stats.wait_calls += 1
+            if self._flag:
+                blocked = False
+            else:
+                blocked = True
+                stats.waiting += 1
+                if self._read_fd is not None:
+                    stats.syscalls += 1
+        if not blocked:
+            return super(InstrumentedEventFDMixIn, self).wait(timeout)
+        try:
+            result = super(InstrumentedEventFDMixIn, self).wait(timeout)
+        finally:
+            with stats._lock:
+                stats.waiting -= 1
+        if result:
+            stats._record_wake()
+        else:
+            with stats._lock:
+                stats.wait_timeouts += 1
+        return result
+
+    def _write(self, data):
+        with self.stats._lock:
+            self.stats.syscalls += 1
+        super(InstrumentedEventFDMixIn, self)._write(data)
+
+    def _drain(self):
+        with self.stats._lock:
+            self.stats.syscalls += 1
+        super(InstrumentedEventFDMixIn, self)._drain()
+
+
+def _instrumented_class(cls):
+    if issubclass(cls, InstrumentedEventFDMixIn):
+        return cls
+    with _classes_lock:
+        instrumented = _classes.get(cls)
+        if instrumented is None:
+            instrumented = _classes[cls] = type(cls.__name__, (InstrumentedEventFDMixIn, cls),
+                                                {"_uninstrumented": cls, "__module__": cls.__module__})
+    return instrumented
+
+
+def _new_instrumented(cls):
+    event = object.__new__(_instrumented_class(cls))
+    event.stats = EventStats()
+    _registry.add(event)
+    return event
+
+
+def enable_instrumentation():
+    """Instrument every event created from now on."""
+    BaseEventFD._new_instrumented = staticmethod(_new_instrumented)
+
+
+def disable_instrumentation():
+    """Stop instrumenting new events, events already created keep their stats."""
+    BaseEventFD._new_instrumented = None
+
+
+def instrumentation_enabled():
+    """Return True if new events are instrumented."""
+    return BaseEventFD._new_instrumented is not None
+
+
+def dump_stats():
+    """Return a list with the stats of every live instrumented event."""
+    # lazy events that were never selected report no fileno, asking would create the fd.
+    return [dict(event.stats.as_dict(), id=id(event), type=type(event).__name__,
+                 fileno=event.fileno() if event._read_fd is not None else None)
+            for event in list(_registry)]
+
+
+if os.environ.get("EVENTFD_INSTRUMENT"):
+    enable_instrumentation()
@@ -0,0 +1,114 @@
+"""A pool of events for short-lived per-request events."""
+
+import collections
+
+from eventfd._eventfd import EventFD
+
+
+__all__ = ["EventFDPool", "PooledEventFD"]
+
+
+def _released(*args, **kwargs):
+    raise ValueError("PooledEventFD used after release")
+
+
+class PooledEventFD(object):
+    """An event leased from an :class:`EventFDPool`.
+
+    is_set(), set(), clear(), wait(), wait_async() and fileno() are the
+    methods of the leased event, bound when the lease is made so calls cost
+    no extra indirection. The event goes back to the pool on release() or
+    when leaving the with block and the handle methods then raise ValueError.
+    Every lease gets a new handle, so a released handle can not reach its
+    event after it was handed out again.
+    """
+
+    __slots__ = ("_pool", "_event", "is_set", "set", "clear", "wait", "wait_async", "fileno")
+
+    def __init__(self, pool, event):
+        self._pool = pool
+        self._event = event
+        self.is_set = event.is_set
+        self.set = event.set
+        self.clear = event.clear
+        self.wait = event.wait
+        self.wait_async = event.wait_async
+        self.fileno = event.fileno
+
+    def _detach(self):
+        event, self._event = self._event, None
+        if event is None:
+            raise ValueError("PooledEventFD released twice")
+        self.is_set = self.set = self.clear = self.wait = self.wait_async = self.fileno = _released
+        return event
+
+    def release(self):
+        """Return the event to the pool, the handle can not be used afterwards."""
+        self._pool._release(self._detach())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        # the block may have called release() already.
+        if self._event is not None:
+            self._pool._release(self._detach())
+
+
+class EventFDPool(object):
+    """A pool of cleared events, saving the fd creation and close of short-lived events.
+
+    acquire() returns a :class:`PooledEventFD` lease of a free event or of a
+    new one if the pool is empty. Released events are cleared, which only
+    touches the fd if the event was set or pulsed, and kept for the next
+    acquire(). At most max_size free events are kept, the events released to
+    a full pool are closed.
+    """
+
+    def __init__(self, max_size=64, event_class=EventFD):
+        if max_size < 0:
+            raise ValueError("max_size must be >= 0")
+        self.max_size = max_size
+        self._event_class = event_class
+        self._free = collections.deque()
+        self._closed = False
+
+    def acquire(self):
+        """Return a cleared event leased from the pool."""
+        if self._closed:
+            raise ValueError("acquire from a closed EventFDPool")
+        # deque pop and append are atomic, the free list needs no lock.
+        try:
+            event = self._free.pop()
+        except IndexError:
+            event = self._event_class()
+        return PooledEventFD(self, event)
+
+    def _release(self, event):
+        event.clear()
+        if getattr(event, "_pulse_pending", False):
+            # a pulse token would make the next lease readable while it is not set.
+            event.acknowledge()
+        if not self._closed and len(self._free) < self.max_size:
+            self._free.append(event)
+        else:
+            event.close()
+
+    def __len__(self):
+        """Return the number of free events."""
+        return len(self._free)
+
+    def close(self):
+        """Close the free events, events released later are closed too."""
+        self._closed = True
+        while self._free:
+            try:
+                self._free.pop().close()
+            except IndexError:
+                break
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
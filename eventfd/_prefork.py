@@ -0,0 +1,202 @@
+"""A prefork server: worker processes sharing one port with SO_REUSEPORT."""
+
+import multiprocessing
+import os
+import selectors
+import signal
+import socket
+import threading
+
+from eventfd._eventfd import EventFD, SharedEventFD, SemaphoreFD
+from eventfd._server import NonPollingHTTPServer
+
+
+__all__ = ["PreforkServer"]
+
+
+def _serve(server_class, server_address, handler_class, stop_event, ready):
+    # the master handles ctrl-c and tells the workers to stop.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    server = server_class(server_address, handler_class, bind_and_activate=False,
+                          shutdown_event=stop_event)
+    try:
+        server.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        server.server_bind()
+        server.server_activate()
+        ready.release()
+        server.serve_forever()
+        _drain_backlog(server)
+    finally:
+        server.server_close()
+
+
+def _drain_backlog(server):
+    """Handle the connections the kernel already queued for this worker.
+
+    Every listener of a SO_REUSEPORT group has its own accept queue, the
+    connections left in it are reset when the listener is closed.
+    """
+    server.socket.setblocking(False)
+    while True:
+        try:
+            request, client_address = server.get_request()
+        except OSError:
+            return
+        try:
+            server.finish_request(request, client_address)
+        except Exception:
+            server.handle_error(request, client_address)
+        finally:
+            server.shutdown_request(request)
+
+
+class PreforkServer(object):
+    """Serve requests from worker processes that all listen on the same address.
+
+    Every worker runs a server_class server (:class:`NonPollingHTTPServer` by
+    default) binding its own listener with SO_REUSEPORT, so the kernel spreads
+    the connections between the workers and every worker uses its own core.
+    The workers of a generation are forked with one :class:`SharedEventFD` as
+    their shutdown event: a single set() in the master stops all of them, each
+    worker finishes its in-flight and queued requests and exits. Workers that
+    exit are not replaced.
+    """
+
+    def __init__(self, server_address, RequestHandlerClass, workers=None,
+                 server_class=NonPollingHTTPServer):
+        self.RequestHandlerClass = RequestHandlerClass
+        self.workers = workers or os.cpu_count() or 1
+        self.server_class = server_class
+        # bound but not listening, reserves the port (even port 0) for every generation of workers.
+        self._socket = socket.socket(server_class.address_family, server_class.socket_type)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        try:
+            self._socket.bind(server_address)
+        except BaseException:
+            self._socket.close()
+            raise
+        self.server_address = self._socket.getsockname()
+        self._context = multiprocessing.get_context("fork")
+        self._lock = threading.Lock()
+        # the thread holding _lock, and a shutdown() requested from a signal handler interrupting it.
+        self._owner = None
+        self._shutdown_request = False
+        self._stop_event = None
+        self._processes = []
+        self._is_shut_down = EventFD()
+
+    def _spawn(self, stop_event):
+        """Fork a generation of workers and wait until all of them listen."""
+        ready = SemaphoreFD(0)
+        processes = [self._context.Process(
+            target=_serve, args=(self.server_class, self.server_address, self.RequestHandlerClass,
+                                 stop_event, ready)) for _ in range(self.workers)]
+        for process in processes:
+            process.daemon = True
+            process.start()
+        listening = 0
+        with selectors.DefaultSelector() as selector:
+            selector.register(ready, selectors.EVENT_READ)
+            for process in processes:
+                selector.register(process.sentinel, selectors.EVENT_READ, process)
+            while listening < len(processes):
+                for key, _ in selector.select():
+                    if key.fileobj is ready:
+                        while listening < len(processes) and ready.acquire(False):
+                            listening += 1
+                    else:
+                        stop_event.set()
+                        for process in processes:
+                            process.join()
+                        raise RuntimeError("worker exited with code {} during startup".format(
+                            key.data.exitcode))
+        return processes
+
+    def start(self):
+        """Start the workers, return once all of them listen."""
+        with self._lock:
+            self._owner = threading.get_ident()
+            try:
+                if self._stop_event is not None:
+                    raise RuntimeError("the server was already started")
+                self._shutdown_request = False
+                self._is_shut_down.clear()
+                stop_event = SharedEventFD()
+                self._processes = self._spawn(stop_event)
+                self._stop_event = stop_event
+                if self._shutdown_request:
+                    self._stop()
+            finally:
+                self._owner = None
+
+    def reload(self):
+        """Replace the workers without refusing connections.
+
+        The new workers are started first, then the old ones are stopped with
+        one set() and finish their requests.
+        """
+        with self._lock:
+            self._owner = threading.get_ident()
+            try:
+                if self._stop_event is None:
+                    raise RuntimeError("the server is not running")
+                stop_event = SharedEventFD()
+                processes = self._spawn(stop_event)
+                stop_event, self._stop_event = self._stop_event, stop_event
+                processes, self._processes = self._processes, processes
+                stop_event.set()
+                for process in processes:
+                    process.join()
+                stop_event.close()
+                if self._shutdown_request:
+                    self._stop()
+            finally:
+                self._owner = None
+
+    def shutdown(self):
+        """Stop all the workers with one set() and wait until they exited.
+
+        It may be called from another thread or from a signal handler. A signal
+        handler interrupting start() or reload() only flags the shutdown, the
+        interrupted call stops the workers once it has spawned them.
+        """
+        if self._owner == threading.get_ident():
+            self._shutdown_request = True
+            return
+        with self._lock:
+            self._stop()
+
+    def _stop(self):
+        if self._stop_event is not None:
+            self._stop_event.set()
+            for process in self._processes:
+                process.join()
+            self._stop_event.close()
+            self._stop_event = None
+            self._processes = []
+        self._is_shut_down.set()
+
+    def serve_forever(self):
+        """Start the workers and block until shutdown() is called.
+
+        shutdown() may be called from another thread or from a signal handler.
+        """
+        self.start()
+        self._is_shut_down.wait()
+
+    @property
+    def worker_pids(self):
+        """The pids of the current workers."""
+        return [process.pid for process in self._processes]
+
+    def server_close(self):
+        """Shut down the workers and release the port."""
+        self.shutdown()
+        self._socket.close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.server_close()
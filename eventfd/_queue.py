@@ -0,0 +1,101 @@
+"""A queue.Queue whose readiness can be selected."""
+
+import queue
+
+from eventfd._eventfd import EventFD, monotonic
+
+
+__all__ = ["FDQueue"]
+
+
+class FDQueue(queue.Queue):
+    """queue.Queue with a file descriptor that is readable exactly when the queue is not empty.
+
+    The fd is updated under the queue mutex on the empty -> not empty and
+    not empty -> empty transitions only, so a burst of puts costs a single
+    write and a burst of gets a single read.
+    """
+
+    def __init__(self, maxsize=0):
+        self._event = EventFD()
+        super(FDQueue, self).__init__(maxsize)
+
+    def _put(self, item):
+        if not self.queue:
+            self._event.set()
+        self.queue.append(item)
+
+    def _get(self):
+        item = self.queue.popleft()
+        if not self.queue:
+            self._event.clear()
+        return item
+
+    def _wait_not_full(self, block, endtime):
+        # called with the mutex held, mirrors queue.Queue.put.
+        if not block:
+            if self._qsize() >= self.maxsize:
+                raise queue.Full
+        elif endtime is None:
+            while self._qsize() >= self.maxsize:
+                self.not_full.wait()
+        else:
+            while self._qsize() >= self.maxsize:
+                remaining = endtime - monotonic()
+                if remaining <= 0.0:
+                    raise queue.Full
+                self.not_full.wait(remaining)
+
+    def put_many(self, items, block=True, timeout=None):
+        """Put all the items into the queue.
+
+        block and timeout have the same meaning as in put(), the timeout
+        applies to the whole call. If the queue is bounded the items are put
+        as room becomes available, and if Full is raised the items before the
+        failing one stay in the queue.
+
+        """
+        if block and timeout is not None and timeout < 0:
+            raise ValueError("'timeout' must be a non-negative number")
+        endtime = None if not block or timeout is None else monotonic() + timeout
+        with self.not_full:
+            for item in items:
+                if self.maxsize > 0:
+                    self._wait_not_full(block, endtime)
+                self._put(item)
+                self.unfinished_tasks += 1
+                self.not_empty.notify()
+
+    def get_many(self, max_items=None, block=True, timeout=None):
+        """Remove and return a list of up to max_items items from the queue.
+
+        Block like get() until at least one item is available, then return
+        every available item, or at most max_items of them.
+
+        """
+        if max_items is not None and max_items < 1:
+            raise ValueError("'max_items' must be a positive number")
+        with self.not_empty:
+            if not block:
+                if not self._qsize():
+                    raise queue.Empty
+            elif timeout is None:
+                while not self._qsize():
+                    self.not_empty.wait()
+            elif timeout < 0:
+                raise ValueError("'timeout' must be a non-negative number")
+            else:
+                endtime = monotonic() + timeout
+                while not self._qsize():
+                    remaining = endtime - monotonic()
+                    if remaining <= 0.0:
+                        raise queue.Empty
+                    self.not_empty.wait(remaining)
+            count = self._qsize() if max_items is None else min(max_items, self._qsize())
+            items = [self._get() for _ in range(count)]
+            self.not_full.notify(count)
+            return items
+
+    def fileno(self):
+        """Return a file descriptor that is readable while the queue is not empty."""
+        return self._event.fileno()
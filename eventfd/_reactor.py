@@ -0,0 +1,157 @@
+"""Running callbacks when events are set, from one dispatcher thread."""
+
+import selectors
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from eventfd._eventfd import EventFD
+from eventfd._group import _acknowledge
+
+
+__all__ = ["EventReactor"]
+
+
+class EventReactor(object):
+    """Run a callback when an event is set, without a thread blocked per event.
+
+    A single dispatcher thread watches every registered event with one
+    :py:mod:`selectors` selector (epoll on linux). The callbacks of the events
+    found set by one select are dispatched as a batch: run in the dispatcher
+    thread, or split between a pool of worker threads if workers is not 0.
+    fn(event) is called every time the event is found set, so the callback or
+    auto_clear=True must clear it. Pulses are acknowledged without calling
+    fn. The reactor is woken for registration
+    changes and shut down through its own :class:`EventFD`.
+    """
+
+    def __init__(self, workers=0):
+        self._selector = selectors.DefaultSelector()
+        # pulse() wakes the dispatcher after registration changes, set() stops it.
+        self._wakeup = EventFD()
+        self._selector.register(self._wakeup, selectors.EVENT_READ)
+        self._callbacks = {}
+        self._lock = threading.Lock()
+        self._workers = workers
+        self._pool = None
+        self._thread = None
+
+    def add_callback(self, event, fn, auto_clear=False):
+        """Call fn(event) when event is set, clearing it first if auto_clear is true.
+
+        Raise KeyError if event already has a callback.
+        """
+        with self._lock:
+            if event in self._callbacks:
+                raise KeyError("{!r} already has a callback".format(event))
+            callback = self._callbacks[event] = (fn, auto_clear)
+            self._selector.register(event, selectors.EVENT_READ, callback)
+        self._wakeup.pulse()
+
+    def remove_callback(self, event):
+        """Stop calling the callback of event, raise KeyError if it has none.
+
+        A callback that was already dispatched may still run once.
+        """
+        with self._lock:
+            del self._callbacks[event]
+            try:
+                self._selector.unregister(event)
+            except KeyError:  # unregistered while its callback runs in the pool
+                pass
+        self._wakeup.pulse()
+
+    def __len__(self):
+        return len(self._callbacks)
+
+    def __contains__(self, event):
+        return event in self._callbacks
+
+    def start(self):
+        """Start the dispatcher thread."""
+        if self._thread is not None:
+            raise RuntimeError("the reactor was already started")
+        if self._workers:
+            self._pool = ThreadPoolExecutor(self._workers)
+        self._thread = threading.Thread(target=self._run, name="EventReactor")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self):
+        selector = self._selector
+        while not self._wakeup.is_set():
+            batch = []
+            for key, _ in selector.select():
+                if key.fileobj is self._wakeup:
+                    self._wakeup.acknowledge()
+                    continue
+                if not key.fileobj.is_set():
+                    # readable from a pulse(), consume the token instead of dispatching.
+                    _acknowledge([key.fileobj])
+                    continue
+                fn, auto_clear = key.data
+                if auto_clear:
+                    key.fileobj.clear()
+                batch.append((key.fileobj, fn))
+            if not batch:
+                continue
+            if self._pool is None:
+                self._run_batch(batch)
+                continue
+            with self._lock:
+                # the events stay readable until their callbacks clear them,
+                # they are watched again once their callbacks ran.
+                for event, _ in batch:
+                    if event in self._callbacks:
+                        selector.unregister(event)
+            size = -(-len(batch) // self._workers)
+            for start in range(0, len(batch), size):
+                self._pool.submit(self._run_pool_batch, batch[start:start + size])
+
+    def _run_batch(self, batch):
+        for event, fn in batch:
+            try:
+                fn(event)
+            except Exception:
+                self.handle_error(event, fn)
+
+    def _run_pool_batch(self, batch):
+        self._run_batch(batch)
+        with self._lock:
+            for event, fn in batch:
+                callback = self._callbacks.get(event)
+                if callback is not None and not self._wakeup.is_set():
+                    try:
+                        self._selector.register(event, selectors.EVENT_READ, callback)
+                    except KeyError:  # removed and added again while the callback ran
+                        pass
+        self._wakeup.pulse()
+
+    def handle_error(self, event, fn):
+        """Handle an exception raised by fn(event).
+
+        The default action is to print the traceback and continue.
+        """
+        traceback.print_exc()
+
+    def shutdown(self, wait=True):
+        """Stop the dispatcher thread, and wait for it and the running callbacks if wait is true."""
+        self._wakeup.set()
+        if self._thread is not None and wait:
+            self._thread.join()
+        if self._pool is not None:
+            self._pool.shutdown(wait)
+
+    def close(self):
+        """Shut down the reactor and close its selector, the events are not closed."""
+        self.shutdown()
+        with self._lock:
+            self._selector.close()
+        self._wakeup.close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,121 @@
+"""socketserver servers that do not poll, using an EventFD to shutdown."""
+
+import selectors
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from socketserver import TCPServer
+
+from eventfd._eventfd import EventFD
+
+
+__all__ = ["NonPollingMixIn", "NonPollingHTTPServer"]
+
+
+class NonPollingMixIn(object):
+    """Mix-in class for socketserver servers that wait without polling.
+
+    serve_forever() registers the listening socket and a shutdown EventFD
+    once in a :py:mod:`selectors` selector (epoll on linux), so shutdown()
+    wakes it instantly instead of after poll_interval. Requests are handled
+    by a pool of max_workers threads. While every worker is busy the server
+    stops accepting and waits for a free worker, and shutdown() waits for the
+    in-flight requests to finish.
+
+    A shutdown_event keyword argument replaces the internal shutdown event,
+    e.g. a :class:`SharedEventFD` set by another process. The server never
+    clears an event it was given, so one event can stop many servers.
+    """
+
+    # Number of requests handled at the same time.
+    max_workers = 16
+
+    def __init__(self, *args, **kwargs):
+        shutdown_event = kwargs.pop("shutdown_event", None)
+        self.__is_shut_down = threading.Event()
+        # using an EventFD to signal the serve_forever to stop
+        self.__own_shutdown_event = shutdown_event is None
+        self.__shutdown_event = EventFD() if shutdown_event is None else shutdown_event
+        # set while a worker is free to take a new request
+        self.__worker_free = EventFD()
+        self.__worker_free.set()
+        self.__in_flight = 0
+        self.__lock = threading.Lock()
+        self.__pool = None
+        super(NonPollingMixIn, self).__init__(*args, **kwargs)
+
+    def serve_forever(self, poll_interval=None):
+        """Handle requests until shutdown(), poll_interval is ignored."""
+        self.__is_shut_down.clear()
+        if self.__own_shutdown_event:
+            self.__shutdown_event.clear()
+        self.__pool = ThreadPoolExecutor(self.max_workers)
+        try:
+            with selectors.DefaultSelector() as selector:
+                selector.register(self.__shutdown_event, selectors.EVENT_READ)
+                selector.register(self, selectors.EVENT_READ)
+                while True:
+                    ready = [key.fileobj for key, _ in selector.select()]
+
+                    if self.__shutdown_event in ready:
+                        break
+
+                    if self in ready:
+                        self._handle_request_noblock()
+                        if not self.__worker_free.is_set():
+                            # stop accepting until a worker is free.
+                            selector.unregister(self)
+                            selector.register(self.__worker_free, selectors.EVENT_READ)
+
+                    if self.__worker_free in ready:
+                        selector.unregister(self.__worker_free)
+                        selector.register(self, selectors.EVENT_READ)
+
+                    self.service_actions()
+        finally:
+            # drain the in-flight requests
+            self.__pool.shutdown(wait=True)
+            self.__pool = None
+            self.__is_shut_down.set()
+
+    def shutdown(self):
+        """Stop the serve_forever loop and wait for the in-flight requests.
+
+        Must be called from a different thread than serve_forever.
+        """
+        self.__shutdown_event.set()
+        self.__is_shut_down.wait()
+
+    def process_request(self, request, client_address):
+        """Hand the request to the worker pool.
+
+        Outside serve_forever(), e.g. from handle_request(), there is no pool
+        and the request is handled in the calling thread.
+        """
+        if self.__pool is None:
+            super(NonPollingMixIn, self).process_request(request, client_address)
+            return
+        with self.__lock:
+            self.__in_flight += 1
+            if self.__in_flight >= self.max_workers:
+                self.__worker_free.clear()
+        self.__pool.submit(self.process_request_thread, request, client_address)
+
+    def process_request_thread(self, request, client_address):
+        """Same as in BaseServer but in a worker thread.
+
+        In addition, exception handling is done here.
+
+        """
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            with self.__lock:
+                self.__in_flight -= 1
+                self.__worker_free.set()
+
+
+class NonPollingHTTPServer(NonPollingMixIn, TCPServer):
+    """TCPServer that does not poll, see :class:`NonPollingMixIn`."""
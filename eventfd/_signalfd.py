@@ -0,0 +1,138 @@
+import collections
+import os
+import signal
+import struct
+import threading
+
+from eventfd._eventfd import HAVE_C_EVENTFD, _WOULD_BLOCK, _wait_readable
+
+__all__ = ["SignalFD", "SignalInfo"]
+
+# struct signalfd_siginfo, padded to 128 bytes.
+_SIGINFO = struct.Struct("=IiiIIiIIIIiiQQQQH46x")
+
+SignalInfo = collections.namedtuple("SignalInfo", [
+    "ssi_signo", "ssi_errno", "ssi_code", "ssi_pid", "ssi_uid", "ssi_fd", "ssi_tid", "ssi_band",
+    "ssi_overrun", "ssi_trapno", "ssi_status", "ssi_int", "ssi_ptr", "ssi_utime", "ssi_stime",
+    "ssi_addr", "ssi_addr_lsb"])
+
+# records read by a single read() call.
+_BATCH = 64
+
+# pthread_sigmask is python 3.3+.
+if os.name != "nt" and HAVE_C_EVENTFD and hasattr(signal, "pthread_sigmask"):
+    from eventfd._eventfd_c import signalfd as _signalfd, SFD_CLOEXEC, SFD_NONBLOCK
+    HAVE_SIGNALFD = True
+else:
+    HAVE_SIGNALFD = False
+
+
+if HAVE_SIGNALFD:
+
+    class SignalFD(object):
+        """Receive signals through a file descriptor, implemented with linux signalfd.
+
+        The signals are blocked with :py:func:`signal.pthread_sigmask` so their
+        handlers do not run, they stay pending until read_signals() reads them
+        from the fd. The fd can be selected together with :class:`EventFD`
+        objects, so a select loop handles signals without a handler or a
+        :py:func:`signal.set_wakeup_fd` pipe. The signal mask is per thread:
+        create the SignalFD in the main thread before starting other threads,
+        they inherit the mask.
+        """
+
+        def __init__(self, signals):
+            self._signals = frozenset(signals)
+            self._links = {}
+            self._lock = threading.Lock()
+            previous = signal.pthread_sigmask(signal.SIG_BLOCK, self._signals)
+            # unblocked again on close(), unless they were blocked before.
+            self._blocked = self._signals - set(previous)
+            try:
+                self._fd = _signalfd(-1, self._signals, SFD_CLOEXEC | SFD_NONBLOCK)
+            except BaseException:
+                signal.pthread_sigmask(signal.SIG_UNBLOCK, self._blocked)
+                raise
+
+        @property
+        def signals(self):
+            """The signals received through the fd."""
+            return self._signals
+
+        def link(self, event, signals=None):
+            """Set event whenever read_signals() reads one of signals, all the signals of the fd by default."""
+            with self._lock:
+                for signum in self._signals if signals is None else signals:
+                    if signum not in self._signals:
+                        raise ValueError("signal {} is not received by this SignalFD".format(signum))
+                    self._links.setdefault(signum, []).append(event)
+
+        def unlink(self, event):
+            """Stop setting event."""
+            with self._lock:
+                for events in self._links.values():
+                    while event in events:
+                        events.remove(event)
+
+        def read_signals(self):
+            """Return the pending signals as a list of :class:`SignalInfo` records, without blocking.
+
+            The records are read in batches of 64 per read call. The events
+            linked to the signals read are set.
+            """
+            records = []
+            while True:
+                try:
+                    data = os.read(self.fileno(), _SIGINFO.size * _BATCH)
+                except OSError as e:
+                    if e.errno in _WOULD_BLOCK:
+                        break
+                    raise
+                records.extend(map(SignalInfo._make, _SIGINFO.iter_unpack(data)))
+                if len(data) < _SIGINFO.size * _BATCH:
+                    break
+            if records and self._links:
+                with self._lock:
+                    events = [event for signum in set(record.ssi_signo for record in records)
+                              for event in self._links.get(signum, ())]
+                for event in events:
+                    event.set()
+            return records
+
+        def wait(self, timeout=None):
+            """Block until a signal is pending or the timeout occurs, return True if one is pending.
+
+            The signals are not read, call read_signals() to consume them.
+            """
+            return _wait_readable(self, timeout)
+
+        def fileno(self):
+            """Return the file descriptor to be used in select/poll."""
+            if self._fd is None:
+                raise ValueError("I/O operation on closed SignalFD")
+            return self._fd
+
+        def close(self):
+            """Close the file descriptor and unblock the signals blocked by the constructor.
+
+            The mask of the calling thread is changed, call it from the thread
+            that created the SignalFD. Signals still pending are delivered to
+            their handlers.
+            """
+            fd, self._fd = self._fd, None
+            if fd is not None:
+                os.close(fd)
+                signal.pthread_sigmask(signal.SIG_UNBLOCK, self._blocked)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            self.close()
+
+        def __del__(self):
+            # the fd only, the mask belongs to the thread that created the SignalFD.
+            fd = getattr(self, "_fd", None)
+            if fd is not None:
+                self._fd = None
+                os.close(fd)
@@ -0,0 +1,324 @@
+"""Selectable counterparts of threading.Lock, threading.Condition and threading.Barrier."""
+
+import collections
+import threading
+
+from eventfd._eventfd import EventFD, SemaphoreFD, monotonic
+
+
+__all__ = ["LockFD", "ConditionFD", "BarrierFD"]
+
+
+class LockFD(object):
+    """A :py:class:`threading.Lock` with a file descriptor that is readable while it is unlocked.
+
+    The lock is a :class:`SemaphoreFD` with a single unit. A select loop can
+    wait for the lock together with sockets and then try acquire(False),
+    another thread may have taken the lock in between.
+    """
+
+    def __init__(self):
+        self._semaphore = SemaphoreFD(1)
+        self._locked = False
+        self._release_lock = threading.Lock()
+
+    def acquire(self, blocking=True, timeout=-1):
+        """Acquire the lock, with the arguments and return value of :py:meth:`threading.Lock.acquire`."""
+        if not blocking and timeout != -1:
+            raise ValueError("can't specify a timeout for a non-blocking call")
+        if timeout < 0 and timeout != -1:
+            raise ValueError("timeout value must be a non-negative number")
+        if self._semaphore.acquire(blocking, None if timeout == -1 else timeout):
+            self._locked = True
+            return True
+        return False
+
+    __enter__ = acquire
+
+    def release(self):
+        """Release the lock, raise RuntimeError if it is not locked."""
+        with self._release_lock:
+            if not self._locked:
+                raise RuntimeError("release unlocked lock")
+            self._locked = False
+            self._semaphore.release()
+
+    def __exit__(self, t, v, tb):
+        self.release()
+
+    def locked(self):
+        """Return True if the lock is acquired."""
+        return self._locked
+
+    def fileno(self):
+        """Return a file descriptor that is readable while the lock is unlocked."""
+        return self._semaphore.fileno()
+
+
+class ConditionFD(object):
+    """A :py:class:`threading.Condition` whose waiters can select on a file descriptor.
+
+    Every thread waits on its own lazy :class:`EventFD` and notify() sets the
+    events of the threads it wakes. wait() and wait_for() block like the
+    stdlib versions. A select loop waits in two phases instead: while holding
+    the lock it calls arm() to become a waiter and releases the lock, selects
+    on the condition together with its sockets and calls acknowledge() once
+    the fd is readable::
+
+        with cond:
+            while not predicate():
+                cond.arm()
+                ... release the lock, select([cond, sock]), reacquire ...
+                cond.acknowledge()
+
+    The fd of a thread stays the same, so the condition can stay registered
+    in a selector.
+    """
+
+    def __init__(self, lock=None):
+        self._lock = threading.RLock() if lock is None else lock
+        self.acquire = self._lock.acquire
+        self.release = self._lock.release
+        self._waiters = collections.deque()
+        self._local = threading.local()
+
+    def __enter__(self):
+        return self._lock.__enter__()
+
+    def __exit__(self, *args):
+        return self._lock.__exit__(*args)
+
+    def _release_save(self):
+        # an RLock held more than once is released completely while waiting.
+        if hasattr(self._lock, "_release_save"):
+            return self._lock._release_save()
+        self._lock.release()
+
+    def _acquire_restore(self, state):
+        if hasattr(self._lock, "_acquire_restore"):
+            self._lock._acquire_restore(state)
+        else:
+            self._lock.acquire()
+
+    def _is_owned(self):
+        if hasattr(self._lock, "_is_owned"):
+            return self._lock._is_owned()
+        # the lock does not know its owner, assume it is ours if it is taken.
+        if self._lock.acquire(False):
+            self._lock.release()
+            return False
+        return True
+
+    def _waiter(self):
+        waiter = getattr(self._local, "waiter", None)
+        if waiter is None:
+            waiter = self._local.waiter = EventFD(lazy=True)
+        return waiter
+
+    def arm(self):
+        """Register the calling thread as a waiter.
+
+        Must be called with the lock held, the next notify() that picks this
+        thread makes its fd readable.
+        """
+        if not self._is_owned():
+            raise RuntimeError("cannot wait on un-acquired lock")
+        waiter = self._waiter()
+        if waiter not in self._waiters:
+            self._waiters.append(waiter)
+
+    def fileno(self):
+        """Return the fd of the calling thread, readable once it was armed and notified."""
+        return self._waiter().fileno()
+
+    def acknowledge(self):
+        """Stop waiting, return True if the calling thread was notified."""
+        waiter = self._waiter()
+        notified = waiter.is_set()
+        if not notified:
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:  # notified between the check and the remove
+                notified = True
+        waiter.clear()
+        return notified
+
+    def wait(self, timeout=None):
+        """Wait until notified or until the timeout occurs, as :py:meth:`threading.Condition.wait`."""
+        if not self._is_owned():
+            raise RuntimeError("cannot wait on un-acquired lock")
+        waiter = self._waiter()
+        if waiter not in self._waiters:
+            self._waiters.append(waiter)
+        state = self._release_save()
+        try:
+            waiter.wait(timeout)
+        finally:
+            self._acquire_restore(state)
+            notified = self.acknowledge()
+        return notified
+
+    def wait_for(self, predicate, timeout=None):
+        """Wait until predicate() is true, as :py:meth:`threading.Condition.wait_for`."""
+        deadline = None if timeout is None else monotonic() + timeout
+        result = predicate()
+        while not result:
+            remaining = None
+            if deadline is not None:
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    break
+            self.wait(remaining)
+            result = predicate()
+        return result
+
+    def notify(self, n=1):
+        """Wake up to n waiting threads, the lock must be held."""
+        if not self._is_owned():
+            raise RuntimeError("cannot notify on un-acquired lock")
+        waiters = self._waiters
+        while waiters and n > 0:
+            try:
+                waiter = waiters.popleft()
+            except IndexError:
+                break
+            waiter.set()
+            n -= 1
+
+    def notify_all(self):
+        """Wake all the waiting threads, the lock must be held."""
+        self.notify(len(self._waiters))
+
+
+class BarrierFD(object):
+    """A :py:class:`threading.Barrier` that can be waited for in a select loop.
+
+    wait() blocks like the stdlib version. A select loop waits in two phases
+    instead: arrive() counts the calling thread in and returns, fileno() is
+    then readable once the barrier trips or breaks, and wait() returns the
+    index without blocking. Each generation is signalled through one of two
+    alternating :class:`EventFD` objects, set on the trip.
+    """
+
+    def __init__(self, parties, action=None, timeout=None):
+        if parties < 1:
+            raise ValueError("parties must be > 0")
+        self._parties = parties
+        self._action = action
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._events = (EventFD(), EventFD())
+        # result of the generations signalled by each event, "tripped" or "broken".
+        self._results = [None, None]
+        self._generation = 0
+        self._count = 0
+        self._broken = False
+        self._local = threading.local()
+
+    def arrive(self):
+        """Count the calling thread in without blocking, return its arrival index.
+
+        The last party to arrive runs the action and trips the barrier.
+        """
+        if getattr(self._local, "arrival", None) is not None:
+            raise RuntimeError("the thread already arrived at the barrier")
+        with self._lock:
+            if self._broken:
+                raise threading.BrokenBarrierError
+            index = self._count
+            self._count += 1
+            self._local.arrival = (index, self._generation)
+            if self._count == self._parties:
+                try:
+                    self._trip()
+                except BaseException:
+                    self._local.arrival = None
+                    raise
+        return index
+
+    def _trip(self):
+        # called with the lock held by the last party.
+        if self._action is not None:
+            try:
+                self._action()
+            except BaseException:
+                self._break()
+                raise
+        self._signal("tripped")
+
+    def _signal(self, result):
+        slot = self._generation % 2
+        self._results[slot] = result
+        self._events[slot].set()
+        self._generation += 1
+        self._count = 0
+        slot = self._generation % 2
+        self._results[slot] = None
+        self._events[slot].clear()
+
+    def _break(self):
+        self._broken = True
+        slot = self._generation % 2
+        self._results[slot] = "broken"
+        self._events[slot].set()
+
+    def wait(self, timeout=None):
+        """Wait until all the parties called wait() or arrive(), return the arrival index.
+
+        Raise :py:class:`threading.BrokenBarrierError` if the barrier is
+        broken, reset or the timeout occurs, a timeout breaks the barrier.
+        """
+        if timeout is None:
+            timeout = self._timeout
+        if getattr(self._local, "arrival", None) is None:
+            self.arrive()
+        index, generation = self._local.arrival
+        event = self._events[generation % 2]
+        try:
+            if not event.wait(timeout):
+                with self._lock:
+                    if not event.is_set():
+                        self._break()
+            with self._lock:
+                if self._results[generation % 2] != "tripped":
+                    raise threading.BrokenBarrierError
+        finally:
+            self._local.arrival = None
+        return index
+
+    def fileno(self):
+        """Return a file descriptor that is readable once the generation the thread arrived in is over."""
+        arrival = getattr(self._local, "arrival", None)
+        generation = self._generation if arrival is None else arrival[1]
+        return self._events[generation % 2].fileno()
+
+    def reset(self):
+        """Reset the barrier, the threads waiting now get BrokenBarrierError."""
+        with self._lock:
+            if self._count:
+                self._signal("broken")
+            else:
+                slot = self._generation % 2
+                self._results[slot] = None
+                self._events[slot].clear()
+            self._broken = False
+
+    def abort(self):
+        """Put the barrier in the broken state, waiting and future calls get BrokenBarrierError."""
+        with self._lock:
+            self._break()
+
+    @property
+    def parties(self):
+        """The number of threads required to trip the barrier."""
+        return self._parties
+
+    @property
+    def n_waiting(self):
+        """The number of threads that arrived in the current generation."""
+        return self._count
+
+    @property
+    def broken(self):
+        """True if the barrier is in the broken state."""
+        return self._broken
@@ -0,0 +1,113 @@
+import os
+import time
+
+from eventfd._eventfd import HAVE_C_EVENTFD, _COUNTER, _WOULD_BLOCK, _wait_readable
+
+__all__ = ["TimerFD"]
+
+# os.timerfd_* is available in python 3.13+ on linux and does not need the C extension.
+if os.name != "nt" and hasattr(os, "timerfd_create"):
+    HAVE_TIMERFD = True
+    _TFD_FLAGS = os.TFD_CLOEXEC | os.TFD_NONBLOCK
+    _TFD_TIMER_ABSTIME = os.TFD_TIMER_ABSTIME
+
+    def _timerfd_create():
+        return os.timerfd_create(time.CLOCK_MONOTONIC, flags=_TFD_FLAGS)
+
+    def _timerfd_settime(fd, flags, initial, interval):
+        return os.timerfd_settime(fd, flags=flags, initial=initial, interval=interval)
+
+    _timerfd_gettime = os.timerfd_gettime
+
+elif HAVE_C_EVENTFD and hasattr(time, "CLOCK_MONOTONIC"):  # python 3.3+
+    from eventfd._eventfd_c import timerfd_create, timerfd_settime as _timerfd_settime, \
+        timerfd_gettime as _timerfd_gettime, TFD_CLOEXEC, TFD_NONBLOCK, TFD_TIMER_ABSTIME as _TFD_TIMER_ABSTIME
+    HAVE_TIMERFD = True
+
+    def _timerfd_create():
+        return timerfd_create(time.CLOCK_MONOTONIC, TFD_CLOEXEC | TFD_NONBLOCK)
+
+else:
+    HAVE_TIMERFD = False
+
+
+if HAVE_TIMERFD:
+
+    class TimerFD(object):
+        """A timer with a file descriptor, implemented with linux timerfd.
+
+        The file descriptor is readable once the timer expired and can be
+        selected together with :class:`EventFD` objects, so select loops do not
+        have to compute their timeouts by hand. Times are measured on
+        CLOCK_MONOTONIC, the clock of :py:func:`time.monotonic`.
+        """
+
+        def __init__(self):
+            self._fd = _timerfd_create()
+
+        def arm(self, initial, interval=0, absolute=False):
+            """Expire after initial seconds, then every interval seconds if interval is not 0.
+
+            If absolute is true, initial is a :py:func:`time.monotonic` timestamp.
+            """
+            flags = _TFD_TIMER_ABSTIME if absolute else 0
+            # a zero expiration disarms the timer, expire as soon as possible instead.
+            _timerfd_settime(self.fileno(), flags, max(float(initial), 1e-9), float(interval))
+
+        def disarm(self):
+            """Stop the timer, expirations that were not read are kept."""
+            _timerfd_settime(self.fileno(), 0, 0.0, 0.0)
+
+        def remaining(self):
+            """Return the seconds until the next expiration, or None if the timer is disarmed."""
+            initial, interval = _timerfd_gettime(self.fileno())
+            if initial == 0 and interval == 0:
+                return None
+            return initial
+
+        @property
+        def interval(self):
+            """The period of the timer, 0 for a one-shot timer."""
+            return _timerfd_gettime(self.fileno())[1]
+
+        def read_expirations(self):
+            """Return the number of expirations since the last call and make the fd not readable.
+
+            A periodic timer that was not read for a while returns all the missed
+            ticks at once, 0 is returned if the timer did not expire.
+            """
+            try:
+                return _COUNTER.unpack(os.read(self.fileno(), _COUNTER.size))[0]
+            except OSError as e:
+                if e.errno in _WOULD_BLOCK:
+                    return 0
+                raise
+
+        def wait(self, timeout=None):
+            """Block until the timer expired or the timeout occurs, return True if it expired.
+
+            The expirations are not read, call read_expirations() to consume them.
+            """
+            return _wait_readable(self, timeout)
+
+        def fileno(self):
+            """Return the file descriptor to be used in select/poll."""
+            if self._fd is None:
+                raise ValueError("I/O operation on closed TimerFD")
+            return self._fd
+
+        def close(self):
+            """Close the file descriptor."""
+            fd, self._fd = self._fd, None
+            if fd is not None:
+                os.close(fd)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            self.close()
+
+        def __del__(self):
+            if getattr(self, "_fd", None) is not None:
+                self.close()
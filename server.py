@@ -1,53 +1,16 @@
-"""This is an example of python HTTP server without polling using the EventFD to shutdown the server"""
+"""This is an example of python HTTP server without polling using the EventFD to shutdown the server
+
+The server is eventfd.NonPollingHTTPServer, a TCPServer using the eventfd.NonPollingMixIn.
+The mixin waits on the listening socket and a shutdown EventFD with one selector,
+handles the requests in a thread pool, and its shutdown does not wait for a poll interval.
+"""
 
 import threading
-import select
-from socketserver import TCPServer, BaseRequestHandler
+from socketserver import BaseRequestHandler
 import socket
 import time
 
-from eventfd import EventFD
-
-
-class NonPollingHTTPServer(TCPServer):
-
-    def __init__(self, server_address, RequestHandlerClass, bind_and_activate=True):
-        self.server_address = server_address
-        self.RequestHandlerClass = RequestHandlerClass
-        self.__is_shut_down = threading.Event()
-        # using an EventFD to signal the server_forever to stop
-        self.__shutdown_event = EventFD()
-        self.socket = socket.socket(self.address_family,
-                                    self.socket_type)
-        if bind_and_activate:
-            try:
-                self.server_bind()
-                self.server_activate()
-            except:
-                self.server_close()
-                raise
-
-    # overriding the server_forever class to not poll.
-    def serve_forever(self):
-        self.__is_shut_down.clear()
-        self.__shutdown_event.clear()
-        try:
-            while True:
-                r, w, e = select.select([self.__shutdown_event, self], [], [])
-
-                if self.__shutdown_event in r:
-                    break
-
-                if self in r:
-                    self._handle_request_noblock()
-
-                self.service_actions()
-        finally:
-            self.__is_shut_down.set()
-
-    def shutdown(self):
-        self.__shutdown_event.set()
-        self.__is_shut_down.wait()
+from eventfd import NonPollingHTTPServer
 
 
 ###############################################
@@ -0,0 +1,105 @@
+import sys
+import threading
+import time
+import unittest
+
+from eventfd import EventFD
+
+if sys.version_info >= (3, 5):
+    import asyncio
+    from eventfd import AsyncEventFD
+    from eventfd import _asyncio
+
+
+@unittest.skipIf(sys.version_info < (3, 5), "asyncio support requires python 3.5")
+class TestWaitAsync(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.SelectorEventLoop()
+        self.event = EventFD()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def run_loop(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def set_later(self, delay):
+        def target():
+            time.sleep(delay)
+            self.event.set()
+        thread = threading.Thread(target=target)
+        thread.start()
+        self.addCleanup(thread.join)
+
+    def test_set_event_returns_immediately(self):
+        self.event.set()
+        self.assertEqual(self.run_loop(self.event.wait_async()), True)
+
+    def test_timeout(self):
+        start = time.time()
+        self.assertEqual(self.run_loop(self.event.wait_async(0.2)), False)
+        self.assertAlmostEqual(time.time() - start, 0.2, delta=0.05)
+        self.assertEqual(_asyncio._waiters, {})
+
+    def test_set_from_thread(self):
+        self.set_later(0.2)
+        start = time.time()
+        self.assertEqual(self.run_loop(self.event.wait_async(2)), True)
+        self.assertAlmostEqual(time.time() - start, 0.2, delta=0.05)
+        self.assertEqual(_asyncio._waiters, {})
+
+    # the coroutines are driven from here, the module must parse on python 2.
+
+    def test_pulse_is_ignored(self):
+        task = self.loop.create_task(self.event.wait_async(2))
+        self.run_loop(asyncio.sleep(0.05))
+        self.event.pulse()
+        self.run_loop(asyncio.sleep(0.05))
+        self.assertEqual(task.done(), False)
+        self.event.set()
+        self.assertEqual(self.run_loop(task), True)
+
+    def test_many_waiters(self):
+        tasks = [self.loop.create_task(self.event.wait_async(2)) for _ in range(50)]
+        self.set_later(0.1)
+        self.assertEqual(self.run_loop(asyncio.gather(*tasks)), [True] * 50)
+        self.assertEqual(_asyncio._waiters, {})
+
+    def test_cancel(self):
+        task = self.loop.create_task(self.event.wait_async())
+        self.run_loop(asyncio.sleep(0.05))
+        task.cancel()
+        self.assertRaises(asyncio.CancelledError, self.run_loop, task)
+        self.assertEqual(_asyncio._waiters, {})
+
+
+@unittest.skipIf(sys.version_info < (3, 5), "asyncio support requires python 3.5")
+class TestAsyncEventFD(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.SelectorEventLoop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_event_api(self):
+        event = AsyncEventFD()
+        self.assertEqual(event.is_set(), False)
+        event.set()
+        self.assertEqual(event.is_set(), True)
+        self.assertEqual(self.loop.run_until_complete(event.wait()), True)
+        event.clear()
+        self.assertEqual(event.is_set(), False)
+
+    def test_wraps_event(self):
+        inner = EventFD()
+        event = AsyncEventFD(inner)
+        self.assertIs(event.event, inner)
+        self.assertEqual(event.fileno(), inner.fileno())
+        threading.Timer(0.1, inner.set).start()
+        self.assertEqual(self.loop.run_until_complete(event.wait()), True)
+
+
+if __name__ == "__main__":
+    unittest.main()
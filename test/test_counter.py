@@ -0,0 +1,76 @@
+import os
+import select
+import threading
+import time
+import unittest
+
+from eventfd import _eventfd
+
+
+@unittest.skipIf(os.name == "nt", "CounterFD is not available on windows")
+class TestCounterFD(unittest.TestCase):
+
+    counter_class = getattr(_eventfd, "CounterFD", None)
+
+    def setUp(self):
+        self.counter = self.counter_class()
+
+    def test_drain_empty(self):
+        self.assertEqual(self.counter.drain(), 0)
+
+    def test_notify_accumulates(self):
+        self.counter.notify()
+        self.counter.notify(5)
+        self.counter.notify(2 ** 40)
+        self.assertEqual(self.counter.drain(), 6 + 2 ** 40)
+        self.assertEqual(self.counter.drain(), 0)
+
+    def test_notify_invalid(self):
+        self.assertRaises(ValueError, self.counter.notify, 0)
+
+    def test_select(self):
+        self.assertEqual(select.select([self.counter], [], [], 0)[0], [])
+        self.counter.notify(3)
+        self.assertEqual(select.select([self.counter], [], [], 0)[0], [self.counter])
+        self.counter.drain()
+        self.assertEqual(select.select([self.counter], [], [], 0)[0], [])
+
+    def test_wait(self):
+        start = time.time()
+        self.assertEqual(self.counter.wait(0.2), False)
+        self.assertAlmostEqual(time.time() - start, 0.2, delta=0.05)
+        threading.Timer(0.1, self.counter.notify, args=(4,)).start()
+        self.assertEqual(self.counter.wait(2), True)
+        self.assertEqual(self.counter.drain(), 4)
+
+    def test_many_producers(self):
+        def producer():
+            for _ in range(1000):
+                self.counter.notify()
+
+        threads = [threading.Thread(target=producer) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        total = 0
+        while total < 4000:
+            self.counter.wait(2)
+            total += self.counter.drain()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(total, 4000)
+
+
+@unittest.skipIf(os.name == "nt", "pipes can not be selected on windows")
+class TestPipeCounterFD(TestCounterFD):
+
+    counter_class = getattr(_eventfd, "PipeCounterFD", None)
+
+
+@unittest.skipUnless(_eventfd.HAVE_C_EVENTFD, "C extension is not available")
+class TestCCounterFD(TestCounterFD):
+
+    counter_class = getattr(_eventfd, "CCounterFD", None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,14 +2,21 @@ import unittest
 import threading
 import time
 import select
+import os
+import struct
+import sys
+import sysconfig
 
-from eventfd import EventFD
+from eventfd import EventFD, BACKEND, set_many, clear_many
+from eventfd import _eventfd
 
 
 class TestEventFD(unittest.TestCase):
 
+    event_class = EventFD
+
     def setUp(self):
-        self.event = EventFD()
+        self.event = self.event_class()
 
     def tearDown(self):
         del self.event
@@ -74,7 +81,7 @@ class TestEventFD(unittest.TestCase):
         self.assertEqual(threads_done, [True, True])
 
     def test_two_events(self):
-        event2 = EventFD()
+        event2 = self.event_class()
         threading.Thread(target=self.set_event).start()
 
         start = time.time()
@@ -120,6 +127,414 @@ class TestEventFD(unittest.TestCase):
         self.event.set()
         self.assertEqual(self.event.wait(timeout=1), True)
 
+    def test_clear_empty_fd_does_not_block(self):
+        # simulate a token consumed behind our back, clear() must not block.
+        self.event._flag = True
+        self.event.clear()
+        self.assertEqual(self.event.is_set(), False)
+        self.assertEqual(select.select([self.event], [], [], 0)[0], [])
+
+    def test_one_write_per_transition(self):
+        writes = []
+        write = self.event._write
+        self.event._write = lambda data: (writes.append(data), write(data))
+        for _ in range(3):
+            self.event.set()
+        self.event.clear()
+        self.event.set()
+        self.assertEqual(len(writes), 2)
+
+    def test_concurrent_set_clear(self):
+        def worker(n):
+            for i in range(2000):
+                if (i + n) % 2:
+                    self.event.set()
+                else:
+                    self.event.clear()
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        readable = select.select([self.event], [], [], 0)[0] == [self.event]
+        self.assertEqual(self.event.is_set(), readable)
+        self.event.clear()
+        self.assertEqual(select.select([self.event], [], [], 0)[0], [])
+
+    @unittest.skipIf(os.name == "nt", "fd numbers above FD_SETSIZE are posix only")
+    def test_wait_fd_above_fd_setsize(self):
+        import resource
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if soft < 1100 and (hard == resource.RLIM_INFINITY or hard >= 1100):
+            resource.setrlimit(resource.RLIMIT_NOFILE, (1100, hard))
+            self.addCleanup(resource.setrlimit, resource.RLIMIT_NOFILE, (soft, hard))
+        fds = []
+        try:
+            while not fds or fds[-1] < 1030:
+                fds.append(os.open(os.devnull, os.O_RDONLY))
+        except OSError:
+            self.skipTest("can not open enough file descriptors")
+        finally:
+            self.addCleanup(lambda: [os.close(fd) for fd in fds])
+        event = self.event_class()
+        self.assertGreater(event.fileno(), 1024)
+
+        start = time.time()
+        self.assertEqual(event.wait(0.2), False)
+        self.assertAlmostEqual(time.time() - start, 0.2, delta=0.05)
+        event.set()
+        self.assertEqual(event.wait(1), True)
+
+
+    def test_close(self):
+        self.event.set()
+        self.event.close()
+        self.assertRaises(ValueError, self.event.fileno)
+        self.assertRaises(ValueError, self.event.clear)
+        self.event.close()
+
+    def test_use_after_close(self):
+        self.event.close()
+        self.assertRaises(ValueError, self.event.set)
+        self.assertRaises(ValueError, self.event.wait, 0)
+
+
+@unittest.skipIf(os.name == "nt", "pipes can not be selected on windows")
+class TestPipeEventFD(TestEventFD):
+
+    event_class = getattr(_eventfd, "PipeEventFD", None)
+
+
+@unittest.skipUnless(_eventfd.HAVE_C_EVENTFD, "C extension is not available")
+class TestCEventFD(TestEventFD):
+
+    event_class = getattr(_eventfd, "CEventFD", None)
+
+    def test_flags(self):
+        # fcntl instead of os.get_blocking and os.get_inheritable, python 2 runs the C extension too.
+        import fcntl
+        self.assertTrue(fcntl.fcntl(self.event.fileno(), fcntl.F_GETFL) & os.O_NONBLOCK)
+        self.assertTrue(fcntl.fcntl(self.event.fileno(), fcntl.F_GETFD) & fcntl.FD_CLOEXEC)
+
+
+@unittest.skipUnless(_eventfd.HAVE_C_EVENTFD, "C extension is not available")
+class TestNativeEventFD(TestEventFD):
+
+    event_class = getattr(_eventfd, "NativeEventFD", None)
+
+    def test_clear_empty_fd_does_not_block(self):
+        # the flag can not be changed behind the C type back.
+        self.event.set()
+        os.read(self.event.fileno(), 8)
+        self.event.clear()
+        self.assertEqual(self.event.is_set(), False)
+
+    def test_one_write_per_transition(self):
+        self.event.set()
+        self.event.set()
+        self.assertEqual(struct.unpack("=Q", os.read(self.event.fileno(), 8)), (1,))
+
+    def test_close(self):
+        self.event.close()
+        self.assertRaises(ValueError, self.event.fileno)
+        self.assertRaises(ValueError, self.event.set)
+        self.event.close()
+
+    def test_wait_timeout_above_poll_range(self):
+        # more than INT_MAX milliseconds, waited in steps by the C code.
+        threading.Timer(0.2, self.event.set).start()
+        self.assertEqual(self.event.wait(1e12), True)
+        self.assertEqual(self.event.wait(float("inf")), True)
+
+    def test_no_dict(self):
+        self.assertRaises(AttributeError, setattr, self.event, "attribute", 1)
+
+    def test_close_while_changing(self):
+        stop = threading.Event()
+        errors = []
+
+        def worker():
+            while not stop.is_set():
+                try:
+                    self.event.set()
+                    self.event.clear()
+                except ValueError:
+                    return
+                except Exception as e:
+                    errors.append(e)
+                    return
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        self.event.close()
+        stop.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertRaises(ValueError, self.event.fileno)
+
+    @unittest.skipUnless(sysconfig.get_config_var("Py_GIL_DISABLED"), "not a free-threaded build")
+    def test_import_keeps_the_gil_disabled(self):
+        # the C extension declares it does not need the GIL.
+        self.assertEqual(sys._is_gil_enabled(), False)
+
+
+def LazyEventFD():
+    return EventFD(lazy=True)
+
+
+class TestLazyEventFD(TestEventFD):
+
+    event_class = staticmethod(LazyEventFD)
+
+    def test_one_write_per_transition(self):
+        self.event.fileno()
+        super(TestLazyEventFD, self).test_one_write_per_transition()
+
+    def test_no_writes_without_fd(self):
+        writes = []
+        self.event._write = writes.append
+        self.event.set()
+        self.event.clear()
+        self.event.set()
+        self.assertEqual(writes, [])
+
+    def test_no_fd_until_fileno(self):
+        self.event.set()
+        self.event.clear()
+        self.assertIsNone(self.event._read_fd)
+        self.event.fileno()
+        self.assertIsNotNone(self.event._read_fd)
+
+    def test_wait_without_fd(self):
+        threading.Thread(target=self.set_event).start()
+        self.assertEqual(self.event.wait(), True)
+        self.assertIsNone(self.event._read_fd)
+
+    def test_wait_timeout_without_fd(self):
+        start = time.time()
+        self.assertEqual(self.event.wait(0.2), False)
+        self.assertGreaterEqual(time.time() - start, 0.2)
+
+    def test_fileno_after_set_is_readable(self):
+        self.event.set()
+        self.assertEqual(select.select([self.event], [], [], 0)[0], [self.event])
+        self.event.clear()
+        self.assertEqual(select.select([self.event], [], [], 0)[0], [])
+
+    def test_wait_after_fileno(self):
+        self.event.fileno()
+        threading.Thread(target=self.set_event).start()
+        self.assertEqual(self.event.wait(), True)
+
+    def test_close_wakes_wait_without_fd(self):
+        threading.Timer(0.2, self.event.close).start()
+        self.assertRaises(ValueError, self.event.wait, 5)
+
+
+class TestPulse(unittest.TestCase):
+
+    event_class = EventFD
+
+    def setUp(self):
+        self.event = self.event_class()
+
+    def readable(self):
+        return select.select([self.event], [], [], 0)[0] == [self.event]
+
+    def test_pulse_does_not_set(self):
+        self.assertEqual(self.event.generation, 0)
+        self.event.pulse()
+        self.assertEqual(self.event.is_set(), False)
+        self.assertEqual(self.event.generation, 1)
+
+    def test_wait_for_generation(self):
+        generation = self.event.generation
+        threading.Timer(0.1, self.event.pulse).start()
+        self.assertEqual(self.event.wait_for_generation(generation, 5), True)
+        self.assertEqual(self.event.wait_for_generation(generation), True)
+        self.assertEqual(self.event.wait_for_generation(generation + 1, 0.1), False)
+
+    def test_pulse_before_wait_is_not_lost(self):
+        generation = self.event.generation
+        self.event.pulse()
+        self.assertEqual(self.event.wait_for_generation(generation, 0), True)
+
+    def test_pulse_wakes_selectors(self):
+        self.event.fileno()
+        self.event.pulse()
+        self.assertEqual(self.readable(), True)
+        self.assertEqual(self.event.acknowledge(), 1)
+        self.assertEqual(self.readable(), False)
+
+    def test_pulses_merge(self):
+        self.event.fileno()
+        writes = []
+        write = self.event._write
+        self.event._write = lambda data: (writes.append(data), write(data))
+        for _ in range(3):
+            self.event.pulse()
+        self.assertEqual(len(writes), 1)
+        self.event.acknowledge()
+        self.event.pulse()
+        self.assertEqual(len(writes), 2)
+        self.assertEqual(self.event.generation, 4)
+
+    def test_wait_ignores_pulse(self):
+        self.event.fileno()
+        self.event.pulse()
+        start = time.time()
+        self.assertEqual(self.event.wait(0.2), False)
+        self.assertGreaterEqual(time.time() - start, 0.2)
+        threading.Timer(0.1, self.event.set).start()
+        self.assertEqual(self.event.wait(5), True)
+
+    def test_wait_after_pulse_acknowledged(self):
+        # another thread acknowledges the pulse between the wake up and the check.
+        self.event.fileno()
+        polling = threading.Event()
+        wait_readable = _eventfd._wait_readable
+
+        def racing_wait_readable(obj, timeout):
+            polling.set()
+            result = wait_readable(obj, timeout)
+            self.event.acknowledge()
+            return result
+
+        self.addCleanup(setattr, _eventfd, "_wait_readable", wait_readable)
+        _eventfd._wait_readable = racing_wait_readable
+        results = []
+        waiter = threading.Thread(target=lambda: results.append((self.event.wait(), self.event.is_set())))
+        waiter.start()
+        self.assertEqual(polling.wait(5), True)
+        self.event.pulse()
+        waiter.join(0.2)
+        self.assertEqual(results, [])
+        self.event.set()
+        waiter.join(5)
+        self.assertEqual(results, [(True, True)])
+
+    def test_set_takes_over_pulse_token(self):
+        self.event.pulse()
+        self.event.set()
+        self.assertEqual(self.readable(), True)
+        self.event.clear()
+        self.assertEqual(self.readable(), False)
+        self.event.pulse()
+        self.assertEqual(self.readable(), True)
+
+    def test_pulse_after_close(self):
+        self.event.close()
+        self.assertRaises(ValueError, self.event.pulse)
+
+    def test_pulse_while_set(self):
+        self.event.set()
+        self.event.pulse()
+        self.event.clear()
+        self.assertEqual(self.readable(), False)
+        self.assertEqual(self.event.generation, 1)
+
+
+@unittest.skipIf(os.name == "nt", "pipes can not be selected on windows")
+class TestPipePulse(TestPulse):
+
+    event_class = getattr(_eventfd, "PipeEventFD", None)
+
+
+class TestLazyPulse(TestPulse):
+
+    event_class = staticmethod(LazyEventFD)
+
+    def test_no_fd(self):
+        generation = self.event.generation
+        threading.Timer(0.1, self.event.pulse).start()
+        self.assertEqual(self.event.wait_for_generation(generation, 5), True)
+        self.assertIsNone(self.event._read_fd)
+
+
+class TestSetMany(unittest.TestCase):
+
+    def make_events(self):
+        events = [EventFD() for _ in range(5)] + [EventFD(lazy=True)]
+        if os.name != "nt":
+            events.append(_eventfd.PipeEventFD())
+        if _eventfd.HAVE_C_EVENTFD:
+            events += [_eventfd.CEventFD(), _eventfd.NativeEventFD()]
+        return events
+
+    def readable(self, events):
+        return select.select(events, [], [], 0)[0]
+
+    def test_set_and_clear(self):
+        events = self.make_events()
+        set_many(events)
+        self.assertEqual([event.is_set() for event in events], [True] * len(events))
+        self.assertEqual(len(self.readable(events)), len(events))
+        clear_many(events)
+        self.assertEqual([event.is_set() for event in events], [False] * len(events))
+        self.assertEqual(self.readable(events), [])
+
+    def test_skip_events_in_target_state(self):
+        events = self.make_events()
+        events[0].set()
+        set_many(events + events)
+        clear_many(events)
+        self.assertEqual(self.readable(events), [])
+        events[1].set()
+        clear_many(events + events)
+        self.assertEqual(self.readable(events), [])
+
+    def test_wakes_waiters(self):
+        events = [EventFD(), EventFD(lazy=True)]
+        results = []
+        threads = [threading.Thread(target=lambda e=e: results.append(e.wait(5))) for e in events]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        set_many(events)
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [True, True])
+
+    def test_takes_over_pulse_token(self):
+        event = EventFD()
+        event.pulse()
+        set_many([event])
+        clear_many([event])
+        self.assertEqual(self.readable([event]), [])
+
+    def test_pure_python_fallback(self):
+        self.addCleanup(setattr, _eventfd, "HAVE_C_EVENTFD", _eventfd.HAVE_C_EVENTFD)
+        _eventfd.HAVE_C_EVENTFD = False
+        self.test_set_and_clear()
+
+    @unittest.skipUnless(_eventfd.HAVE_C_EVENTFD, "C extension is not available")
+    def test_write_error(self):
+        events = [_eventfd.PipeEventFD() for _ in range(3)]
+        read_fd, write_fd = os.pipe()
+        os.close(write_fd)
+        os.close(read_fd)
+        real_write_fd, events[1]._write_fd = events[1]._write_fd, write_fd
+        self.addCleanup(setattr, events[1], "_write_fd", real_write_fd)
+        self.assertRaises(OSError, set_many, events)
+        self.assertEqual(events[1].is_set(), False)
+
+
+@unittest.skipUnless(_eventfd.HAVE_OS_EVENTFD, "os.eventfd is not available")
+class TestOSEventFD(unittest.TestCase):
+
+    def test_is_default_backend(self):
+        self.assertEqual(BACKEND, "os")
+        self.assertIs(EventFD, _eventfd.OSEventFD)
+
+    def test_flags(self):
+        event = _eventfd.OSEventFD()
+        self.assertFalse(os.get_blocking(event.fileno()))
+        self.assertFalse(os.get_inheritable(event.fileno()))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,132 @@
+import os
+import select
+import sys
+import threading
+import time
+import unittest
+
+if sys.version_info >= (3, 5):
+    import concurrent.futures
+    from eventfd._futures import SelectableFuture, SelectableExecutor
+    from eventfd import _futures
+
+requires_futures = unittest.skipIf(sys.version_info < (3, 5), "concurrent.futures support requires python 3.5")
+
+
+@requires_futures
+class TestSelectableFuture(unittest.TestCase):
+
+    def test_fileno_readable_when_done(self):
+        future = SelectableFuture()
+        self.assertEqual(select.select([future], [], [], 0)[0], [])
+        future.set_result(1)
+        self.assertEqual(select.select([future], [], [], 0)[0], [future])
+
+    def test_wait(self):
+        future = SelectableFuture()
+        self.assertEqual(future.wait(0.1), False)
+        threading.Timer(0.1, future.set_result, (1,)).start()
+        self.assertEqual(future.wait(5), True)
+        self.assertEqual(future.result(), 1)
+
+    def test_cancel(self):
+        future = SelectableFuture()
+        future.cancel()
+        self.assertEqual(future.wait(0), True)
+
+    def test_no_fd_until_fileno(self):
+        future = SelectableFuture()
+        future.set_result(1)
+        self.assertIsNone(future._done_event._read_fd)
+
+
+@requires_futures
+class TestSelectableExecutor(unittest.TestCase):
+
+    def setUp(self):
+        self.executor = SelectableExecutor(concurrent.futures.ThreadPoolExecutor(2))
+        self.addCleanup(self.executor.shutdown)
+
+    def test_result(self):
+        future = self.executor.submit(lambda x: x * 2, 21)
+        self.assertIsInstance(future, SelectableFuture)
+        self.assertEqual(select.select([future], [], [], 5)[0], [future])
+        self.assertEqual(future.result(), 42)
+
+    def test_exception(self):
+        future = self.executor.submit(lambda: 1 / 0)
+        self.assertRaises(ZeroDivisionError, future.result, 5)
+
+    def test_cancel(self):
+        block = threading.Event()
+        self.addCleanup(block.set)
+        for _ in range(2):
+            self.executor.submit(block.wait)
+        queued = []
+        future = self.executor.submit(queued.append, 1)
+        self.assertEqual(future.cancel(), True)
+        block.set()
+        self.executor.shutdown()
+        self.assertEqual(queued, [])
+
+    def test_cancel_running(self):
+        started = threading.Event()
+        block = threading.Event()
+        self.addCleanup(block.set)
+
+        def run():
+            started.set()
+            block.wait(5)
+            return 42
+
+        future = self.executor.submit(run)
+        self.assertEqual(started.wait(5), True)
+        self.assertEqual(future.running(), True)
+        self.assertEqual(future.cancel(), False)
+        block.set()
+        self.assertEqual(future.result(5), 42)
+
+
+@requires_futures
+@unittest.skipIf(os.name == "nt", "CompletionSet is not available on windows")
+class TestCompletionSet(unittest.TestCase):
+
+    def setUp(self):
+        self.completion = _futures.CompletionSet()
+
+    def test_empty(self):
+        self.assertEqual(self.completion.pop_completed(), [])
+        self.assertEqual(self.completion.wait(0.1), [])
+        self.assertEqual(len(self.completion), 0)
+
+    def test_collect_completed_only(self):
+        futures = [concurrent.futures.Future() for _ in range(100)]
+        for future in futures:
+            self.completion.add(future)
+        self.assertEqual(select.select([self.completion], [], [], 0)[0], [])
+        futures[10].set_result(10)
+        futures[20].set_exception(ValueError())
+        self.assertEqual(select.select([self.completion], [], [], 0)[0], [self.completion])
+        self.assertEqual(self.completion.pop_completed(), [futures[10], futures[20]])
+        self.assertEqual(select.select([self.completion], [], [], 0)[0], [])
+        self.assertEqual(len(self.completion), 98)
+
+    def test_already_done(self):
+        future = concurrent.futures.Future()
+        future.set_result(1)
+        self.completion.add(future)
+        self.assertEqual(self.completion.wait(0), [future])
+
+    def test_wait_with_executor(self):
+        with concurrent.futures.ThreadPoolExecutor(4) as executor:
+            futures = set(executor.submit(time.sleep, 0.01) for _ in range(20))
+            completion = _futures.CompletionSet(futures)
+            done = set()
+            while len(done) < len(futures):
+                done.update(completion.wait(5))
+        self.assertEqual(done, futures)
+        self.assertEqual(len(completion), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
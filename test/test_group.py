@@ -0,0 +1,100 @@
+import sys
+import threading
+import time
+import unittest
+
+from eventfd import EventFD
+
+if sys.version_info >= (3, 5):
+    from eventfd import EventGroup
+
+
+@unittest.skipIf(sys.version_info < (3, 5), "EventGroup requires python 3.5")
+class TestEventGroup(unittest.TestCase):
+
+    def setUp(self):
+        self.events = [EventFD() for _ in range(5)]
+        self.group = EventGroup(self.events)
+
+    def tearDown(self):
+        self.group.close()
+
+    def test_membership(self):
+        self.assertEqual(len(self.group), 5)
+        self.assertIn(self.events[0], self.group)
+        self.assertEqual(set(self.group), set(self.events))
+        self.group.remove(self.events[0])
+        self.assertNotIn(self.events[0], self.group)
+        self.assertRaises(KeyError, self.group.remove, self.events[0])
+        self.assertRaises(KeyError, self.group.add, self.events[1])
+
+    def test_wait_any_timeout(self):
+        start = time.time()
+        self.assertEqual(self.group.wait_any(0.2), [])
+        self.assertAlmostEqual(time.time() - start, 0.2, delta=0.05)
+
+    def test_wait_any_returns_set_events(self):
+        self.events[1].set()
+        self.events[3].set()
+        self.assertEqual(set(self.group.wait_any(0)), {self.events[1], self.events[3]})
+        self.events[1].clear()
+        self.assertEqual(self.group.wait_any(0), [self.events[3]])
+
+    def test_wait_any_skips_pulses(self):
+        self.events[0].pulse()
+        self.assertEqual(self.group.wait_any(0), [])
+        self.events[1].set()
+        self.events[2].pulse()
+        self.assertEqual(self.group.wait_any(0), [self.events[1]])
+        self.events[1].clear()
+        threading.Timer(0.1, self.events[3].pulse).start()
+        threading.Timer(0.2, self.events[4].set).start()
+        self.assertEqual(self.group.wait_any(2), [self.events[4]])
+
+    def test_wait_all_ignores_pulses(self):
+        for event in self.events[:-1]:
+            event.set()
+        self.events[-1].pulse()
+        start = time.time()
+        self.assertEqual(self.group.wait_all(0.2), False)
+        self.assertGreaterEqual(time.time() - start, 0.19)
+        threading.Timer(0.1, self.events[-1].set).start()
+        self.assertEqual(self.group.wait_all(2), True)
+
+    def test_wait_any_wakes_on_set(self):
+        threading.Timer(0.1, self.events[2].set).start()
+        self.assertEqual(self.group.wait_any(2), [self.events[2]])
+
+    def test_add_while_waiting(self):
+        event = EventFD()
+
+        def add_and_set():
+            time.sleep(0.1)
+            self.group.add(event)
+            event.set()
+
+        threading.Thread(target=add_and_set).start()
+        self.assertEqual(self.group.wait_any(2), [event])
+
+    def test_wait_all(self):
+        self.assertEqual(self.group.wait_all(0.1), False)
+        self.events[0].set()
+
+        def set_all():
+            for event in self.events:
+                time.sleep(0.02)
+                event.set()
+
+        threading.Thread(target=set_all).start()
+        self.assertEqual(self.group.wait_all(2), True)
+
+    def test_wait_all_timeout(self):
+        for event in self.events[1:]:
+            event.set()
+        start = time.time()
+        self.assertEqual(self.group.wait_all(0.2), False)
+        self.assertAlmostEqual(time.time() - start, 0.2, delta=0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
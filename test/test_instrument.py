@@ -0,0 +1,85 @@
+import gc
+import sys
+import threading
+import time
+import unittest
+
+import eventfd
+from eventfd import EventFD
+from eventfd import _eventfd
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        eventfd.enable_instrumentation()
+        self.addCleanup(eventfd.disable_instrumentation)
+
+    def test_disabled_by_default(self):
+        eventfd.disable_instrumentation()
+        self.assertFalse(eventfd.instrumentation_enabled())
+        event = EventFD()
+        self.assertIs(type(event), EventFD)
+        self.assertFalse(hasattr(event, "stats"))
+
+    def test_counters(self):
+        event = EventFD()
+        self.assertIsInstance(event, EventFD)
+        event.set()
+        event.set()
+        event.wait()
+        event.clear()
+        event.clear()
+        self.assertEqual(event.wait(0.01), False)
+        stats = event.stats.as_dict()
+        self.assertEqual(stats["set_calls"], 2)
+        self.assertEqual(stats["redundant_sets"], 1)
+        self.assertEqual(stats["sets_without_waiters"], 1)
+        self.assertEqual(stats["clear_calls"], 2)
+        self.assertEqual(stats["wait_calls"], 2)
+        self.assertEqual(stats["wait_timeouts"], 1)
+        # one write, one drain and one poll
+        self.assertEqual(stats["syscalls"], 3)
+        self.assertAlmostEqual(stats["last_set"], time.time(), delta=1)
+
+    def test_wake_latency(self):
+        event = EventFD()
+        threading.Timer(0.05, event.set).start()
+        self.assertEqual(event.wait(2), True)
+        stats = event.stats.as_dict()
+        self.assertEqual(sum(stats["wake_latency_us"].values()), 1)
+        self.assertEqual(stats["sets_without_waiters"], 0)
+
+    def test_registry(self):
+        event = EventFD()
+        event.set()
+        stats = [s for s in eventfd.dump_stats() if s["id"] == id(event)]
+        self.assertEqual(len(stats), 1)
+        self.assertEqual(stats[0]["set_calls"], 1)
+        self.assertEqual(stats[0]["fileno"], event.fileno())
+        event_id = id(event)
+        del event, stats
+        gc.collect()
+        self.assertEqual([s for s in eventfd.dump_stats() if s["id"] == event_id], [])
+
+    def test_lazy_event(self):
+        event = EventFD(lazy=True)
+        event.set()
+        stats = [s for s in eventfd.dump_stats() if s["id"] == id(event)]
+        self.assertEqual(stats[0]["fileno"], None)
+        self.assertEqual(stats[0]["syscalls"], 0)
+        self.assertIsNone(event._read_fd)
+
+    @unittest.skipUnless(hasattr(_eventfd, "SharedEventFD"), "SharedEventFD is not available")
+    @unittest.skipIf(sys.version_info < (3, 4), "pickling shared events requires python 3.4")
+    def test_shared_event(self):
+        import pickle
+        event = _eventfd.SharedEventFD()
+        copy = pickle.loads(pickle.dumps(event))
+        copy.set()
+        self.assertEqual(event.is_set(), True)
+        self.assertEqual(copy.stats.set_calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import select
+import unittest
+
+from eventfd import EventFDPool
+from eventfd import _eventfd
+
+
+class TestEventFDPool(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = EventFDPool(max_size=2)
+        self.addCleanup(self.pool.close)
+
+    def test_acquire_cleared(self):
+        with self.pool.acquire() as event:
+            self.assertEqual(event.is_set(), False)
+            event.set()
+            self.assertEqual(event.wait(0), True)
+        with self.pool.acquire() as event:
+            self.assertEqual(event.is_set(), False)
+            self.assertEqual(select.select([event], [], [], 0)[0], [])
+
+    def test_reuse(self):
+        event = self.pool.acquire()
+        fd = event.fileno()
+        event.release()
+        self.assertEqual(len(self.pool), 1)
+        self.assertEqual(self.pool.acquire().fileno(), fd)
+        self.assertEqual(len(self.pool), 0)
+
+    def test_use_after_release(self):
+        event = self.pool.acquire()
+        event.release()
+        self.assertRaises(ValueError, event.set)
+        self.assertRaises(ValueError, event.fileno)
+        self.assertRaises(ValueError, event.release)
+
+    def test_release_in_with_block(self):
+        with self.pool.acquire() as event:
+            event.release()
+        self.assertEqual(len(self.pool), 1)
+
+    def test_stale_handle_after_reuse(self):
+        stale = self.pool.acquire()
+        stale.release()
+        current = self.pool.acquire()
+        self.assertRaises(ValueError, stale.set)
+        self.assertEqual(current.is_set(), False)
+
+    def test_pulse_does_not_leak_to_next_lease(self):
+        with self.pool.acquire() as event:
+            event._event.pulse()
+        with self.pool.acquire() as event:
+            self.assertEqual(select.select([event], [], [], 0)[0], [])
+            self.assertEqual(event.is_set(), False)
+
+    def test_eviction(self):
+        events = [self.pool.acquire() for _ in range(3)]
+        raw = [event._event for event in events]
+        for event in events:
+            event.release()
+        self.assertEqual(len(self.pool), 2)
+        self.assertRaises(ValueError, raw[2].fileno)
+
+    def test_close(self):
+        event = self.pool.acquire()
+        raw = event._event
+        self.pool.close()
+        self.assertRaises(ValueError, self.pool.acquire)
+        event.release()
+        self.assertEqual(len(self.pool), 0)
+        self.assertRaises(ValueError, raw.fileno)
+
+    def test_max_size_zero(self):
+        self.pool = EventFDPool(max_size=0)
+        self.pool.acquire().release()
+        self.assertEqual(len(self.pool), 0)
+
+    @unittest.skipUnless(_eventfd.HAVE_C_EVENTFD, "C extension is not available")
+    def test_native_events(self):
+        self.pool = EventFDPool(event_class=_eventfd.NativeEventFD)
+        with self.pool.acquire() as event:
+            event.set()
+        with self.pool.acquire() as event:
+            self.assertEqual(event.is_set(), False)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import os
+import signal
+import socket
+import threading
+import time
+import unittest
+
+import eventfd
+
+try:
+    from socketserver import BaseRequestHandler
+except ImportError:  # python 2
+    from SocketServer import BaseRequestHandler
+
+PreforkServer = getattr(eventfd, "PreforkServer", None)
+
+
+class PidHandler(BaseRequestHandler):
+
+    def handle(self):
+        self.request.recv(1024)
+        self.request.sendall(str(os.getpid()).encode())
+
+
+def request(address):
+    with socket.create_connection(address) as sock:
+        sock.sendall(b"pid")
+        return int(sock.recv(1024))
+
+
+@unittest.skipIf(PreforkServer is None, "PreforkServer is not available")
+class TestPreforkServer(unittest.TestCase):
+
+    def setUp(self):
+        self.server = PreforkServer(("localhost", 0), PidHandler, workers=2)
+        self.addCleanup(self.server.server_close)
+
+    def test_workers_serve_requests(self):
+        self.server.start()
+        pids = self.server.worker_pids
+        self.assertEqual(len(pids), 2)
+        self.assertNotIn(os.getpid(), pids)
+        served = set(request(self.server.server_address) for _ in range(50))
+        self.assertTrue(served <= set(pids))
+
+    def test_one_set_stops_all_workers(self):
+        self.server.start()
+        processes = list(self.server._processes)
+        start = time.time()
+        self.server.shutdown()
+        self.assertLess(time.time() - start, 1)
+        self.assertEqual([process.exitcode for process in processes], [0, 0])
+        self.assertRaises(OSError, request, self.server.server_address)
+
+    def test_reload_replaces_workers_without_errors(self):
+        self.server.start()
+        old = set(self.server.worker_pids)
+        errors = []
+        served = []
+        stop = threading.Event()
+
+        def client():
+            while not stop.is_set():
+                try:
+                    served.append(request(self.server.server_address))
+                except OSError as e:
+                    errors.append(e)
+
+        thread = threading.Thread(target=client)
+        thread.start()
+        time.sleep(0.1)
+        self.server.reload()
+        time.sleep(0.1)
+        stop.set()
+        thread.join()
+        new = set(self.server.worker_pids)
+        self.assertEqual(errors, [])
+        self.assertFalse(old & new)
+        self.assertTrue(set(served) & new)
+
+    def test_serve_forever_until_shutdown(self):
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.start()
+        while not self.server.worker_pids:
+            time.sleep(0.01)
+        self.server.shutdown()
+        thread.join(1)
+        self.assertFalse(thread.is_alive())
+
+    def interrupt_spawn(self):
+        """Make the next spawn receive a signal whose handler calls shutdown()."""
+        previous = signal.signal(signal.SIGUSR1, lambda *args: self.server.shutdown())
+        self.addCleanup(signal.signal, signal.SIGUSR1, previous)
+        spawn = self.server._spawn
+
+        def interrupted(stop_event):
+            os.kill(os.getpid(), signal.SIGUSR1)
+            return spawn(stop_event)
+
+        self.server._spawn = interrupted
+
+    def test_shutdown_from_signal_handler_during_start(self):
+        self.interrupt_spawn()
+        self.server.start()
+        self.assertEqual(self.server.worker_pids, [])
+        self.assertTrue(self.server._is_shut_down.is_set())
+        self.assertRaises(OSError, request, self.server.server_address)
+
+    def test_shutdown_from_signal_handler_during_reload(self):
+        self.server.start()
+        self.interrupt_spawn()
+        self.server.reload()
+        self.assertEqual(self.server.worker_pids, [])
+        self.assertTrue(self.server._is_shut_down.is_set())
+
+    def test_start_twice(self):
+        self.server.start()
+        self.assertRaises(RuntimeError, self.server.start)
+
+    def test_worker_failing_to_start(self):
+        class FailingServer(eventfd.NonPollingHTTPServer):
+
+            def server_activate(self):
+                raise OSError("can not listen")
+
+        server = PreforkServer(("localhost", 0), PidHandler, workers=2, server_class=FailingServer)
+        self.addCleanup(server.server_close)
+        self.assertRaises(RuntimeError, server.start)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import select
+import sys
+import threading
+import time
+import unittest
+
+if sys.version_info >= (3, 5):
+    import queue
+    from eventfd import FDQueue
+
+
+@unittest.skipIf(sys.version_info < (3, 5), "FDQueue requires python 3.5")
+class TestFDQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.queue = FDQueue()
+
+    def readable(self):
+        return select.select([self.queue], [], [], 0)[0] == [self.queue]
+
+    def test_readable_when_not_empty(self):
+        self.assertFalse(self.readable())
+        self.queue.put(1)
+        self.assertTrue(self.readable())
+        self.queue.put_nowait(2)
+        self.assertEqual(self.queue.qsize(), 2)
+        self.assertEqual(self.queue.get(), 1)
+        self.assertTrue(self.readable())
+        self.assertEqual(self.queue.get_nowait(), 2)
+        self.assertFalse(self.readable())
+        self.assertRaises(queue.Empty, self.queue.get_nowait)
+
+    def test_one_write_per_burst(self):
+        writes = []
+        event = self.queue._event
+        write = event._write
+        event._write = lambda data: (writes.append(data), write(data))
+        self.queue.put_many(range(100))
+        for i in range(10):
+            self.queue.put(i)
+        self.assertEqual(len(writes), 1)
+
+    def test_get_many(self):
+        self.queue.put_many(range(10))
+        self.assertEqual(self.queue.get_many(4), [0, 1, 2, 3])
+        self.assertTrue(self.readable())
+        self.assertEqual(self.queue.get_many(), list(range(4, 10)))
+        self.assertFalse(self.readable())
+        self.assertRaises(queue.Empty, self.queue.get_many, block=False)
+        self.assertRaises(ValueError, self.queue.get_many, 0)
+
+    def test_get_many_blocks(self):
+        threading.Timer(0.1, self.queue.put_many, args=([1, 2],)).start()
+        self.assertEqual(self.queue.get_many(timeout=2), [1, 2])
+        start = time.time()
+        self.assertRaises(queue.Empty, self.queue.get_many, timeout=0.2)
+        self.assertAlmostEqual(time.time() - start, 0.2, delta=0.05)
+
+    def test_put_many_bounded(self):
+        bounded = FDQueue(maxsize=2)
+        self.assertRaises(queue.Full, bounded.put_many, [1, 2, 3], block=False)
+        self.assertEqual(bounded.get_many(), [1, 2])
+
+        def consume():
+            time.sleep(0.1)
+            bounded.get_many()
+
+        threading.Thread(target=consume).start()
+        bounded.put_many([3, 4, 5], timeout=2)
+        self.assertEqual(bounded.qsize(), 1)
+
+    def test_task_done(self):
+        self.queue.put_many([1, 2])
+        self.queue.get_many()
+        self.queue.task_done()
+        self.queue.task_done()
+        self.queue.join()
+
+    def test_producers_and_selecting_consumer(self):
+        def producer():
+            for i in range(500):
+                self.queue.put(i)
+
+        threads = [threading.Thread(target=producer) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        received = []
+        while len(received) < 2000:
+            if select.select([self.queue], [], [], 2)[0]:
+                received.extend(self.queue.get_many(block=False))
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(received), 2000)
+        self.assertFalse(self.readable())
+
+
+if __name__ == "__main__":
+    unittest.main()
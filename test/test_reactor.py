@@ -0,0 +1,133 @@
+import sys
+import threading
+import time
+import unittest
+
+from eventfd import EventFD
+
+if sys.version_info >= (3, 5):
+    from eventfd import EventReactor
+
+
+@unittest.skipIf(sys.version_info < (3, 5), "EventReactor requires python 3.5")
+class TestEventReactor(unittest.TestCase):
+
+    workers = 0
+
+    def setUp(self):
+        self.reactor = EventReactor(self.workers)
+        self.reactor.start()
+        self.addCleanup(self.reactor.close)
+
+    def test_callback(self):
+        event = EventFD()
+        called = threading.Event()
+        self.reactor.add_callback(event, lambda e: (e.clear(), called.set()))
+        event.set()
+        self.assertEqual(called.wait(5), True)
+
+    def test_auto_clear(self):
+        event = EventFD()
+        calls = []
+        done = threading.Event()
+        self.reactor.add_callback(event, lambda e: (calls.append(e.is_set()), done.set()), auto_clear=True)
+        for _ in range(3):
+            done.clear()
+            event.set()
+            self.assertEqual(done.wait(5), True)
+        self.assertEqual(calls, [False] * 3)
+
+    def test_pulse_is_not_dispatched(self):
+        event = EventFD()
+        calls = []
+        done = threading.Event()
+        self.reactor.add_callback(event, lambda e: (calls.append(e.is_set()), done.set()), auto_clear=True)
+        event.pulse()
+        time.sleep(0.2)
+        self.assertEqual(calls, [])
+        self.assertEqual(event._pulse_pending, False)
+        event.set()
+        self.assertEqual(done.wait(5), True)
+        time.sleep(0.1)
+        self.assertEqual(calls, [False])
+
+    def test_many_events(self):
+        events = [EventFD() for _ in range(100)]
+        fired = []
+        lock = threading.Lock()
+        all_fired = threading.Event()
+
+        def callback(event):
+            with lock:
+                fired.append(event)
+                if len(fired) == len(events):
+                    all_fired.set()
+
+        for event in events:
+            self.reactor.add_callback(event, callback, auto_clear=True)
+        for event in events:
+            event.set()
+        self.assertEqual(all_fired.wait(5), True)
+        self.assertEqual(set(fired), set(events))
+
+    def test_remove_callback(self):
+        event = EventFD()
+        calls = []
+        self.reactor.add_callback(event, calls.append, auto_clear=True)
+        self.assertIn(event, self.reactor)
+        self.reactor.remove_callback(event)
+        self.assertNotIn(event, self.reactor)
+        event.set()
+        time.sleep(0.1)
+        self.assertEqual(calls, [])
+        self.assertRaises(KeyError, self.reactor.remove_callback, event)
+
+    def test_add_twice(self):
+        event = EventFD()
+        self.reactor.add_callback(event, id)
+        self.assertRaises(KeyError, self.reactor.add_callback, event, id)
+        self.assertEqual(len(self.reactor), 1)
+
+    def test_error_does_not_stop_the_reactor(self):
+        errors = []
+        self.reactor.handle_error = lambda event, fn: errors.append(event)
+        bad, good = EventFD(), EventFD()
+        called = threading.Event()
+        self.reactor.add_callback(bad, lambda e: 1 / 0, auto_clear=True)
+        self.reactor.add_callback(good, lambda e: called.set(), auto_clear=True)
+        bad.set()
+        time.sleep(0.05)
+        good.set()
+        self.assertEqual(called.wait(5), True)
+        self.assertEqual(errors, [bad])
+
+    def test_shutdown(self):
+        start = time.time()
+        self.reactor.shutdown()
+        self.assertLess(time.time() - start, 1)
+        self.assertEqual(self.reactor._thread.is_alive(), False)
+
+
+class TestEventReactorPool(TestEventReactor):
+
+    workers = 4
+
+    def test_no_duplicate_dispatch(self):
+        event = EventFD()
+        calls = []
+        release = threading.Event()
+
+        def slow(e):
+            calls.append(1)
+            release.wait(5)
+            e.clear()
+
+        self.reactor.add_callback(event, slow)
+        event.set()
+        time.sleep(0.2)
+        self.assertEqual(calls, [1])
+        release.set()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import select
+import threading
+import time
+import unittest
+
+from eventfd import _eventfd
+
+
+@unittest.skipIf(os.name == "nt", "SemaphoreFD is not available on windows")
+class TestSemaphoreFD(unittest.TestCase):
+
+    semaphore_class = getattr(_eventfd, "SemaphoreFD", None)
+
+    def test_initial_value(self):
+        sem = self.semaphore_class(2)
+        self.assertTrue(sem.acquire(False))
+        self.assertTrue(sem.acquire(False))
+        self.assertFalse(sem.acquire(False))
+
+    def test_default_value(self):
+        sem = self.semaphore_class()
+        self.assertTrue(sem.acquire(False))
+        self.assertFalse(sem.acquire(False))
+
+    def test_negative_value(self):
+        self.assertRaises(ValueError, self.semaphore_class, -1)
+
+    def test_release_n(self):
+        sem = self.semaphore_class(0)
+        sem.release(3)
+        for _ in range(3):
+            self.assertTrue(sem.acquire(False))
+        self.assertFalse(sem.acquire(False))
+        self.assertRaises(ValueError, sem.release, 0)
+
+    def test_acquire_timeout(self):
+        sem = self.semaphore_class(0)
+        start = time.time()
+        self.assertFalse(sem.acquire(timeout=0.2))
+        self.assertAlmostEqual(time.time() - start, 0.2, delta=0.05)
+        self.assertRaises(ValueError, sem.acquire, False, 1)
+
+    def test_select(self):
+        sem = self.semaphore_class(0)
+        self.assertEqual(select.select([sem], [], [], 0)[0], [])
+        sem.release()
+        self.assertEqual(select.select([sem], [], [], 0)[0], [sem])
+        sem.acquire()
+        self.assertEqual(select.select([sem], [], [], 0)[0], [])
+
+    def test_context_manager(self):
+        sem = self.semaphore_class(1)
+        with sem:
+            self.assertFalse(sem.acquire(False))
+        self.assertTrue(sem.acquire(False))
+
+    def test_one_unit_per_waiter(self):
+        sem = self.semaphore_class(0)
+        acquired = []
+
+        def worker():
+            if sem.acquire(timeout=1):
+                acquired.append(1)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        sem.release(2)
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(acquired), 2)
+
+
+@unittest.skipIf(os.name == "nt", "pipes can not be selected on windows")
+class TestPipeSemaphoreFD(TestSemaphoreFD):
+
+    semaphore_class = getattr(_eventfd, "PipeSemaphoreFD", None)
+
+    def test_value_above_pipe_capacity(self):
+        self.assertRaises(ValueError, self.semaphore_class, 16 * 1024 * 1024)
+
+    def test_release_still_blocks_when_full(self):
+        import fcntl
+        semaphore = self.semaphore_class(1)
+        self.assertEqual(fcntl.fcntl(semaphore._write_fd, fcntl.F_GETFL) & os.O_NONBLOCK, 0)
+
+
+@unittest.skipUnless(_eventfd.HAVE_C_EVENTFD, "C extension is not available")
+class TestCSemaphoreFD(TestSemaphoreFD):
+
+    semaphore_class = getattr(_eventfd, "CSemaphoreFD", None)
+
+
+if __name__ == "__main__":
+    unittest.main()
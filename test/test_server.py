@@ -0,0 +1,131 @@
+import socket
+import sys
+import threading
+import time
+import unittest
+
+from eventfd import EventFD
+
+try:
+    from socketserver import BaseRequestHandler
+except ImportError:  # python 2
+    from SocketServer import BaseRequestHandler
+
+if sys.version_info >= (3, 5):
+    from eventfd import NonPollingHTTPServer
+
+
+class EchoHandler(BaseRequestHandler):
+
+    delay = 0
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def handle(self):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.max_active = max(cls.max_active, cls.active)
+        try:
+            data = self.request.recv(1024)
+            time.sleep(self.delay)
+            self.request.sendall(data.upper())
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+
+@unittest.skipIf(sys.version_info < (3, 5), "NonPollingHTTPServer requires python 3.5")
+class TestNonPollingHTTPServer(unittest.TestCase):
+
+    def start_server(self, handler, max_workers=4):
+        server = NonPollingHTTPServer(("localhost", 0), handler)
+        server.max_workers = max_workers
+        self.addCleanup(server.server_close)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        self.addCleanup(thread.join)
+        return server
+
+    def request(self, server, message, results=None):
+        with socket.create_connection(server.server_address) as sock:
+            sock.sendall(message)
+            response = sock.recv(1024)
+        if results is not None:
+            results.append(response)
+        return response
+
+    def test_requests_and_instant_shutdown(self):
+        server = self.start_server(EchoHandler)
+        for i in range(3):
+            self.assertEqual(self.request(server, b"hello"), b"HELLO")
+        start = time.time()
+        server.shutdown()
+        self.assertAlmostEqual(time.time() - start, 0, delta=0.05)
+
+    def test_bounded_workers(self):
+        class SlowHandler(EchoHandler):
+            delay = 0.1
+            active = max_active = 0
+
+        server = self.start_server(SlowHandler, max_workers=2)
+        results = []
+        clients = [threading.Thread(target=self.request, args=(server, b"x", results)) for _ in range(6)]
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.join()
+        server.shutdown()
+        self.assertEqual(results, [b"X"] * 6)
+        self.assertEqual(SlowHandler.max_active, 2)
+
+    def test_shutdown_drains_in_flight(self):
+        class SlowHandler(EchoHandler):
+            delay = 0.3
+            active = max_active = 0
+
+        server = self.start_server(SlowHandler)
+        results = []
+        client = threading.Thread(target=self.request, args=(server, b"x", results))
+        client.start()
+        while not SlowHandler.active:
+            time.sleep(0.01)
+        server.shutdown()
+        self.assertEqual(SlowHandler.active, 0)
+        client.join()
+        self.assertEqual(results, [b"X"])
+
+    def test_handle_request(self):
+        server = NonPollingHTTPServer(("localhost", 0), EchoHandler)
+        self.addCleanup(server.server_close)
+        results = []
+        client = threading.Thread(target=self.request, args=(server, b"hello", results))
+        client.start()
+        server.handle_request()
+        client.join()
+        self.assertEqual(results, [b"HELLO"])
+
+    def test_shared_shutdown_event(self):
+        shutdown_event = EventFD()
+        servers = []
+        threads = []
+        for _ in range(2):
+            server = NonPollingHTTPServer(("localhost", 0), EchoHandler, shutdown_event=shutdown_event)
+            self.addCleanup(server.server_close)
+            thread = threading.Thread(target=server.serve_forever)
+            thread.start()
+            servers.append(server)
+            threads.append(thread)
+        for server in servers:
+            self.assertEqual(self.request(server, b"hello"), b"HELLO")
+        shutdown_event.set()
+        for thread in threads:
+            thread.join(1)
+            self.assertFalse(thread.is_alive())
+        # the event belongs to the caller, the servers do not clear it.
+        self.assertEqual(shutdown_event.is_set(), True)
+
+
+if __name__ == "__main__":
+    unittest.main()
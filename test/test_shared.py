@@ -0,0 +1,156 @@
+import multiprocessing
+import os
+import pickle
+import select
+import sys
+import unittest
+
+from eventfd import EventFD
+from eventfd import _eventfd
+
+
+def set_event(event):
+    event.set()
+
+
+def wait_and_clear(event):
+    result = event.wait(5)
+    event.clear()
+    return result
+
+
+def is_set(event):
+    return event.is_set()
+
+
+if os.name != "nt":
+
+    class SharedPipeEventFD(_eventfd.SharedEventFDMixIn, _eventfd.PipeEventFD):
+        pass
+
+# multiprocessing contexts and fd reduction.
+requires_contexts = unittest.skipIf(sys.version_info < (3, 4), "sharing with processes requires python 3.4")
+
+
+@unittest.skipIf(os.name == "nt", "SharedEventFD is not available on windows")
+class TestSharedEventFD(unittest.TestCase):
+
+    event_class = getattr(_eventfd, "SharedEventFD", None)
+
+    def setUp(self):
+        self.event = self.event_class()
+
+    def test_event_api(self):
+        self.assertEqual(self.event.is_set(), False)
+        self.event.set()
+        self.event.set()
+        self.assertEqual(self.event.is_set(), True)
+        self.assertEqual(self.event.wait(0), True)
+        self.event.clear()
+        self.assertEqual(self.event.is_set(), False)
+        self.assertEqual(self.event.wait(0.1), False)
+
+    def test_use_after_close(self):
+        self.event.close()
+        self.assertRaises(ValueError, self.event.set)
+        self.assertRaises(ValueError, self.event.clear)
+        self.assertRaises(ValueError, self.event.wait, 0)
+
+    def test_pulse_not_supported(self):
+        self.assertRaises(TypeError, self.event.pulse)
+        self.assertEqual(self.event.is_set(), False)
+
+    def test_is_set_asks_the_fd(self):
+        # a write from somewhere else, e.g. another process.
+        self.event._write(self.event._DATA)
+        self.assertEqual(self.event.is_set(), True)
+        self.event.clear()
+        self.assertEqual(select.select([self.event], [], [], 0)[0], [])
+
+    def run_process(self, method, target):
+        ctx = multiprocessing.get_context(method)
+        process = ctx.Process(target=target, args=(self.event,))
+        process.start()
+        process.join(10)
+        self.assertEqual(process.exitcode, 0)
+
+    @requires_contexts
+    def test_fork(self):
+        self.run_process("fork", set_event)
+        self.assertEqual(self.event.is_set(), True)
+
+    @requires_contexts
+    def test_spawn(self):
+        self.run_process("spawn", set_event)
+        self.assertEqual(self.event.is_set(), True)
+        self.event.clear()
+        self.assertEqual(self.event.is_set(), False)
+
+    @requires_contexts
+    def test_pool(self):
+        with multiprocessing.get_context("spawn").Pool(2) as pool:
+            self.assertEqual(pool.apply(is_set, (self.event,)), False)
+            pool.apply(set_event, (self.event,))
+            self.assertEqual(self.event.is_set(), True)
+            self.assertEqual(pool.apply(wait_and_clear, (self.event,)), True)
+        self.assertEqual(self.event.is_set(), False)
+
+
+@unittest.skipIf(os.name == "nt", "pipes can not be selected on windows")
+class TestSharedPipeEventFD(TestSharedEventFD):
+
+    event_class = globals().get("SharedPipeEventFD")
+
+
+def SharedMemoryEventFD():
+    return _eventfd.SharedEventFD(shared_memory=True)
+
+
+@unittest.skipIf(os.name == "nt", "SharedEventFD is not available on windows")
+class TestSharedMemoryEventFD(TestSharedEventFD):
+
+    event_class = staticmethod(SharedMemoryEventFD)
+
+    def test_is_set_asks_the_fd(self):
+        # the shared flag is the state, the fd follows it.
+        self.event.set()
+        self.assertEqual(select.select([self.event], [], [], 0)[0], [self.event])
+        self.event.clear()
+        self.assertEqual(select.select([self.event], [], [], 0)[0], [])
+
+    def test_is_set_without_syscall(self):
+        self.event.set()
+        self.event._read_fd, read_fd = -1, self.event._read_fd
+        try:
+            self.assertEqual(self.event.is_set(), True)
+        finally:
+            self.event._read_fd = read_fd
+
+    @requires_contexts
+    def test_clear_in_child(self):
+        self.event.set()
+        self.run_process("spawn", wait_and_clear)
+        self.assertEqual(self.event.is_set(), False)
+        self.assertEqual(select.select([self.event], [], [], 0)[0], [])
+
+    @requires_contexts
+    def test_pickle_shares_the_flag(self):
+        copy = pickle.loads(pickle.dumps(self.event))
+        copy.set()
+        self.assertEqual(self.event.is_set(), True)
+        self.event.clear()
+        self.assertEqual(copy.is_set(), False)
+
+    def test_close(self):
+        self.event.close()
+        self.assertIsNone(self.event._shm)
+
+
+class TestNotShared(unittest.TestCase):
+
+    def test_pickle_fails(self):
+        self.assertRaises(TypeError, pickle.dumps, EventFD())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import select
+import signal
+import threading
+import time
+import unittest
+
+from eventfd import EventFD
+from eventfd import _signalfd
+
+
+def send(signum):
+    # directed at this thread, other threads do not have the signal blocked.
+    signal.pthread_kill(threading.get_ident(), signum)
+
+
+@unittest.skipUnless(_signalfd.HAVE_SIGNALFD, "signalfd is not available")
+class TestSignalFD(unittest.TestCase):
+
+    def setUp(self):
+        self.handled = []
+        for signum in (signal.SIGUSR1, signal.SIGUSR2):
+            previous = signal.signal(signum, lambda signum, frame: self.handled.append(signum))
+            self.addCleanup(signal.signal, signum, previous)
+        self.signal_fd = _signalfd.SignalFD([signal.SIGUSR1])
+        self.addCleanup(self.signal_fd.close)
+
+    def test_signal_makes_fd_readable(self):
+        self.assertEqual(select.select([self.signal_fd], [], [], 0)[0], [])
+        send(signal.SIGUSR1)
+        self.assertEqual(select.select([self.signal_fd], [], [], 0)[0], [self.signal_fd])
+        self.assertEqual(self.handled, [])
+
+    def test_read_signals(self):
+        self.assertEqual(self.signal_fd.read_signals(), [])
+        send(signal.SIGUSR1)
+        records = self.signal_fd.read_signals()
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0].ssi_signo, signal.SIGUSR1)
+        self.assertEqual(records[0].ssi_pid, os.getpid())
+        self.assertEqual(records[0].ssi_uid, os.getuid())
+        self.assertEqual(self.signal_fd.wait(0), False)
+
+    def test_read_many_in_batches(self):
+        self.signal_fd.close()
+        self.signal_fd = _signalfd.SignalFD([signal.SIGRTMIN])
+        for _ in range(100):
+            send(signal.SIGRTMIN)
+        records = self.signal_fd.read_signals()
+        self.assertEqual([record.ssi_signo for record in records], [signal.SIGRTMIN] * 100)
+
+    def test_other_signals_are_not_blocked(self):
+        send(signal.SIGUSR2)
+        self.assertEqual(self.handled, [signal.SIGUSR2])
+        self.assertEqual(self.signal_fd.read_signals(), [])
+
+    def test_wait(self):
+        start = time.time()
+        self.assertEqual(self.signal_fd.wait(0.1), False)
+        self.assertGreaterEqual(time.time() - start, 0.09)
+        send(signal.SIGUSR1)
+        self.assertEqual(self.signal_fd.wait(1), True)
+
+    def test_linked_events(self):
+        event = EventFD()
+        other = EventFD()
+        self.signal_fd.link(event)
+        self.signal_fd.link(other, [signal.SIGUSR1])
+        send(signal.SIGUSR1)
+        self.assertEqual(event.is_set(), False)
+        self.signal_fd.read_signals()
+        self.assertEqual(event.is_set(), True)
+        self.assertEqual(other.is_set(), True)
+        event.clear()
+        other.clear()
+        self.signal_fd.unlink(event)
+        send(signal.SIGUSR1)
+        self.signal_fd.read_signals()
+        self.assertEqual(event.is_set(), False)
+        self.assertEqual(other.is_set(), True)
+
+    def test_link_unknown_signal(self):
+        self.assertRaises(ValueError, self.signal_fd.link, EventFD(), [signal.SIGUSR2])
+
+    def test_close_unblocks(self):
+        send(signal.SIGUSR1)
+        self.signal_fd.close()
+        self.assertEqual(self.handled, [signal.SIGUSR1])
+        self.assertRaises(ValueError, self.signal_fd.fileno)
+        self.assertNotIn(signal.SIGUSR1, signal.pthread_sigmask(signal.SIG_BLOCK, []))
+        self.signal_fd.close()
+
+    def test_keeps_signals_blocked_before(self):
+        signal.pthread_sigmask(signal.SIG_BLOCK, [signal.SIGUSR2])
+        self.addCleanup(signal.pthread_sigmask, signal.SIG_UNBLOCK, [signal.SIGUSR2])
+        signal_fd = _signalfd.SignalFD([signal.SIGUSR1, signal.SIGUSR2])
+        signal_fd.close()
+        self.assertIn(signal.SIGUSR2, signal.pthread_sigmask(signal.SIG_BLOCK, []))
+
+    def test_invalid_signal(self):
+        self.assertRaises(ValueError, _signalfd.SignalFD, [0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,229 @@
+import os
+import select
+import sys
+import threading
+import time
+import unittest
+
+
+def readable(obj):
+    return select.select([obj], [], [], 0)[0] == [obj]
+
+
+@unittest.skipIf(sys.version_info < (3, 5), "the selectable primitives require python 3.5")
+@unittest.skipIf(os.name == "nt", "the selectable primitives are not available on windows")
+class TestLockFD(unittest.TestCase):
+
+    def setUp(self):
+        from eventfd import LockFD
+        self.lock = LockFD()
+
+    def test_acquire_release(self):
+        self.assertEqual(readable(self.lock), True)
+        self.assertEqual(self.lock.acquire(), True)
+        self.assertEqual(self.lock.locked(), True)
+        self.assertEqual(readable(self.lock), False)
+        self.assertEqual(self.lock.acquire(False), False)
+        self.lock.release()
+        self.assertEqual(self.lock.locked(), False)
+        self.assertEqual(readable(self.lock), True)
+
+    def test_timeout(self):
+        self.lock.acquire()
+        start = time.time()
+        self.assertEqual(self.lock.acquire(timeout=0.2), False)
+        self.assertGreaterEqual(time.time() - start, 0.2)
+        self.assertRaises(ValueError, self.lock.acquire, False, 1)
+        self.assertRaises(ValueError, self.lock.acquire, True, -2)
+
+    def test_release_unlocked(self):
+        self.assertRaises(RuntimeError, self.lock.release)
+
+    def test_context_manager(self):
+        with self.lock:
+            self.assertEqual(self.lock.locked(), True)
+        self.assertEqual(self.lock.locked(), False)
+
+    def test_release_from_thread(self):
+        self.lock.acquire()
+        threading.Timer(0.1, self.lock.release).start()
+        self.assertEqual(self.lock.acquire(timeout=5), True)
+
+
+@unittest.skipIf(sys.version_info < (3, 5), "the selectable primitives require python 3.5")
+@unittest.skipIf(os.name == "nt", "the selectable primitives are not available on windows")
+class TestConditionFD(unittest.TestCase):
+
+    def setUp(self):
+        from eventfd import ConditionFD
+        self.cond = ConditionFD()
+
+    def notify_later(self, n=1, delay=0.1):
+        def target():
+            time.sleep(delay)
+            with self.cond:
+                self.cond.notify(n)
+        thread = threading.Thread(target=target)
+        thread.start()
+        self.addCleanup(thread.join)
+
+    def test_wait_notify(self):
+        self.notify_later()
+        with self.cond:
+            self.assertEqual(self.cond.wait(5), True)
+
+    def test_wait_timeout(self):
+        with self.cond:
+            self.assertEqual(self.cond.wait(0.1), False)
+            self.assertEqual(len(self.cond._waiters), 0)
+
+    def test_notify_n(self):
+        woken = []
+
+        def waiter():
+            with self.cond:
+                woken.append(self.cond.wait(1))
+
+        threads = [threading.Thread(target=waiter) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        with self.cond:
+            self.cond.notify(2)
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(woken), [False, True, True])
+
+    def test_notify_all(self):
+        woken = []
+
+        def waiter():
+            with self.cond:
+                woken.append(self.cond.wait(5))
+
+        threads = [threading.Thread(target=waiter) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        with self.cond:
+            self.cond.notify_all()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(woken, [True] * 3)
+
+    def test_wait_for(self):
+        state = []
+
+        def target():
+            time.sleep(0.1)
+            with self.cond:
+                state.append(1)
+                self.cond.notify()
+        threading.Thread(target=target).start()
+        with self.cond:
+            self.assertEqual(self.cond.wait_for(lambda: state, 5), [1])
+            self.assertEqual(self.cond.wait_for(lambda: False, 0.1), False)
+
+    def test_un_acquired(self):
+        self.assertRaises(RuntimeError, self.cond.wait)
+        self.assertRaises(RuntimeError, self.cond.notify)
+        self.assertRaises(RuntimeError, self.cond.arm)
+
+    def test_select_two_phase(self):
+        with self.cond:
+            self.cond.arm()
+        self.assertEqual(readable(self.cond), False)
+        self.notify_later()
+        self.assertEqual(select.select([self.cond], [], [], 5)[0], [self.cond])
+        with self.cond:
+            self.assertEqual(self.cond.acknowledge(), True)
+        self.assertEqual(readable(self.cond), False)
+
+    def test_acknowledge_without_notify(self):
+        with self.cond:
+            self.cond.arm()
+            self.assertEqual(self.cond.acknowledge(), False)
+            self.cond.notify()
+        self.assertEqual(readable(self.cond), False)
+
+    def test_lock_fd(self):
+        from eventfd import ConditionFD, LockFD
+        self.cond = ConditionFD(LockFD())
+        self.test_wait_notify()
+        self.assertRaises(RuntimeError, self.cond.notify)
+
+
+@unittest.skipIf(sys.version_info < (3, 5), "the selectable primitives require python 3.5")
+@unittest.skipIf(os.name == "nt", "the selectable primitives are not available on windows")
+class TestBarrierFD(unittest.TestCase):
+
+    def run_parties(self, barrier, n, target=None):
+        results = []
+
+        def party():
+            try:
+                results.append((target or barrier.wait)())
+            except threading.BrokenBarrierError:
+                results.append("broken")
+
+        threads = [threading.Thread(target=party) for _ in range(n)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_wait(self):
+        from eventfd import BarrierFD
+        barrier = BarrierFD(3)
+        for _ in range(3):
+            self.assertEqual(sorted(self.run_parties(barrier, 3)), [0, 1, 2])
+        self.assertEqual(barrier.n_waiting, 0)
+        self.assertEqual(barrier.broken, False)
+
+    def test_action(self):
+        from eventfd import BarrierFD
+        calls = []
+        barrier = BarrierFD(2, action=lambda: calls.append(1))
+        self.run_parties(barrier, 2)
+        self.assertEqual(calls, [1])
+
+    def test_timeout_breaks(self):
+        from eventfd import BarrierFD
+        barrier = BarrierFD(2)
+        self.assertRaises(threading.BrokenBarrierError, barrier.wait, 0.1)
+        self.assertEqual(barrier.broken, True)
+        self.assertRaises(threading.BrokenBarrierError, barrier.wait)
+
+    def test_abort_and_reset(self):
+        from eventfd import BarrierFD
+        barrier = BarrierFD(3)
+        threading.Timer(0.1, barrier.abort).start()
+        self.assertEqual(self.run_parties(barrier, 2), ["broken", "broken"])
+        barrier.reset()
+        self.assertEqual(barrier.broken, False)
+        self.assertEqual(sorted(self.run_parties(barrier, 3)), [0, 1, 2])
+
+    def test_reset_breaks_waiters(self):
+        from eventfd import BarrierFD
+        barrier = BarrierFD(3)
+        threading.Timer(0.1, barrier.reset).start()
+        self.assertEqual(self.run_parties(barrier, 2), ["broken", "broken"])
+        self.assertEqual(barrier.broken, False)
+
+    def test_select_two_phase(self):
+        from eventfd import BarrierFD
+        barrier = BarrierFD(2)
+        self.assertEqual(barrier.arrive(), 0)
+        self.assertRaises(RuntimeError, barrier.arrive)
+        self.assertEqual(readable(barrier), False)
+        thread = threading.Thread(target=barrier.wait)
+        thread.start()
+        self.assertEqual(select.select([barrier], [], [], 5)[0], [barrier])
+        self.assertEqual(barrier.wait(), 0)
+        thread.join()
+        self.assertEqual(readable(barrier), False)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import select
+import time
+import unittest
+
+from eventfd import EventFD
+from eventfd import _timerfd
+
+
+@unittest.skipUnless(_timerfd.HAVE_TIMERFD, "timerfd is not available")
+class TestTimerFD(unittest.TestCase):
+
+    def setUp(self):
+        self.timer = _timerfd.TimerFD()
+        self.addCleanup(self.timer.close)
+
+    def test_start_disarmed(self):
+        self.assertIsNone(self.timer.remaining())
+        self.assertEqual(self.timer.read_expirations(), 0)
+        self.assertEqual(self.timer.wait(0), False)
+
+    def test_one_shot(self):
+        start = time.monotonic()
+        self.timer.arm(0.1)
+        self.assertEqual(self.timer.wait(1), True)
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+        self.assertEqual(self.timer.read_expirations(), 1)
+        self.assertEqual(self.timer.wait(0.2), False)
+        self.assertIsNone(self.timer.remaining())
+
+    def test_zero_expires_now(self):
+        self.timer.arm(0)
+        self.assertEqual(self.timer.wait(1), True)
+
+    def test_absolute(self):
+        deadline = time.monotonic() + 0.1
+        self.timer.arm(deadline, absolute=True)
+        self.assertEqual(self.timer.wait(1), True)
+        self.assertGreaterEqual(time.monotonic(), deadline)
+        self.assertEqual(self.timer.read_expirations(), 1)
+
+    def test_absolute_in_the_past(self):
+        self.timer.arm(time.monotonic() - 10, absolute=True)
+        self.assertEqual(self.timer.wait(1), True)
+
+    def test_periodic_missed_ticks(self):
+        self.timer.arm(0.01, 0.01)
+        self.assertAlmostEqual(self.timer.interval, 0.01)
+        time.sleep(0.2)
+        self.assertGreaterEqual(self.timer.read_expirations(), 10)
+        self.assertLessEqual(self.timer.remaining(), 0.01)
+
+    def test_disarm(self):
+        self.timer.arm(0.1)
+        self.assertGreater(self.timer.remaining(), 0)
+        self.timer.disarm()
+        self.assertIsNone(self.timer.remaining())
+        self.assertEqual(self.timer.wait(0.2), False)
+
+    def test_select_with_event(self):
+        event = EventFD()
+        self.timer.arm(0.05)
+        self.assertEqual(select.select([event, self.timer], [], [], 1)[0], [self.timer])
+        self.timer.read_expirations()
+        event.set()
+        self.assertEqual(select.select([event, self.timer], [], [], 1)[0], [event])
+
+    def test_close(self):
+        self.timer.close()
+        self.assertRaises(ValueError, self.timer.fileno)
+        self.assertRaises(ValueError, self.timer.arm, 1)
+        self.timer.close()
+
+    def test_context_manager(self):
+        with _timerfd.TimerFD() as timer:
+            timer.arm(1)
+        self.assertRaises(ValueError, timer.fileno)
+
+
+if __name__ == "__main__":
+    unittest.main()